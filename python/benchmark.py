@@ -0,0 +1,128 @@
+"""
+Benchmarks for the data processing pipeline
+"""
+import argparse
+import logging
+import time
+import tracemalloc
+from copy import deepcopy
+from pathlib import Path
+
+from data_parsing.abilities import Ability
+from data_parsing.constants import DataTypes, SchemaFiles, SpecialWarbands
+from data_parsing.data_loading import WarbandDataLoader
+from data_parsing.data_processing import WarbandDataProcessor
+from data_parsing.factions import Factions
+from data_parsing.fighters import Fighters
+from data_parsing.models import PROJECT_DATA
+from data_parsing.schema_registry import SchemaRegistry
+
+
+def benchmark_memory(src: Path) -> None:
+    """Report the memory used per fighter when loading the full dataset into model objects."""
+    tracemalloc.start()
+
+    data = WarbandDataLoader(src).load_all_data()
+    raw_bytes, _ = tracemalloc.get_traced_memory()
+
+    fighters = Fighters(data[DataTypes.FIGHTERS])
+    total_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    fighter_count = len(fighters.fighters)
+    weapon_count = sum(len(f.weapons) for f in fighters.fighters)
+    model_bytes = total_bytes - raw_bytes
+
+    print(f'fighters loaded:        {fighter_count}')
+    unique_weapons = len({id(w) for f in fighters.fighters for w in f.weapons})
+    print(f'weapon profiles:        {weapon_count} ({unique_weapons} unique)')
+    print(f'raw data per fighter:   {raw_bytes / fighter_count:,.0f} bytes')
+    print(f'models per fighter:     {model_bytes / fighter_count:,.0f} bytes')
+    print(f'total per fighter:      {total_bytes / fighter_count:,.0f} bytes')
+    print(f'peak:                   {peak_bytes / 1024 / 1024:,.1f} MiB')
+
+
+def scale_dataset(data: dict, scale: int) -> dict:
+    """Replicate every warband ``scale`` times under new names, keeping warband sizes realistic."""
+    if scale == 1:
+        return data
+    scaled = {k: [] for k in data}
+    for copy in range(scale):
+        suffix = f' {copy}' if copy else ''
+        for datatype in (DataTypes.FIGHTERS, DataTypes.ABILITIES, DataTypes.FACTIONS):
+            for entity in data[datatype]:
+                if datatype == DataTypes.ABILITIES and entity['warband'] == SpecialWarbands.UNIVERSAL and copy:
+                    continue
+                entity = deepcopy(entity)
+                if entity['warband'] != SpecialWarbands.UNIVERSAL:
+                    entity['warband'] = f"{entity['warband']}{suffix}"
+                scaled[datatype].append(entity)
+    return scaled
+
+
+def benchmark_assignment(src: Path, scale: int) -> None:
+    """Time faction and ability assignment, optionally on a dataset replicated ``scale`` times."""
+    data = scale_dataset(WarbandDataLoader(src).load_all_data(), scale)
+    fighters = Fighters(data[DataTypes.FIGHTERS])
+    abilities = [Ability(x) for x in data[DataTypes.ABILITIES]]
+    factions = Factions(data[DataTypes.FACTIONS])
+    processor = WarbandDataProcessor(fighters, abilities, factions)
+
+    print(f'fighters: {len(fighters.fighters)}, abilities: {len(abilities)}, factions: {len(factions.factions)}')
+    for step in (processor.assign_factions, processor.assign_abilities):
+        start = time.perf_counter()
+        step()
+        print(f'{step.__name__:<20} {time.perf_counter() - start:.3f} seconds')
+
+
+def benchmark_schemas(src: Path) -> None:
+    """Time the generated validators against jsonschema on every entity in the data."""
+    data = WarbandDataLoader(src).load_all_data()
+    registry = SchemaRegistry(codegen_cache=None)
+    schemas = {
+        DataTypes.FIGHTERS: SchemaFiles.FIGHTER,
+        DataTypes.ABILITIES: SchemaFiles.ABILITY,
+        DataTypes.FACTIONS: SchemaFiles.FACTION,
+    }
+    for datatype, schema in schemas.items():
+        entities = data[datatype]
+        for name, is_valid in (('jsonschema', registry.validator(schema).is_valid),
+                               ('generated', registry.generated(schema))):
+            start = time.perf_counter()
+            for entity in entities:
+                is_valid(entity)
+            print(f'{datatype:<10} {name:<11} {len(entities):>5} in {time.perf_counter() - start:.4f} seconds')
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.WARNING,
+        format='%(levelname)s - %(name)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "benchmark",
+        choices=['memory', 'assignment', 'schemas'],
+        help="benchmark to run"
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=PROJECT_DATA,
+        help="path to project data folder"
+    )
+    parser.add_argument(
+        "--scale",
+        type=int,
+        default=1,
+        help="replicate the dataset this many times (assignment benchmark only)"
+    )
+    args = parser.parse_args()
+
+    if args.benchmark == 'memory':
+        benchmark_memory(args.data)
+    elif args.benchmark == 'assignment':
+        benchmark_assignment(args.data, args.scale)
+    elif args.benchmark == 'schemas':
+        benchmark_schemas(args.data)
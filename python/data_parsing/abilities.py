@@ -1,27 +1,34 @@
-import json
+import sys
 from pathlib import Path
 from typing import List, Dict, Optional, Union
 
-import jsonschema
-
-from .models import PROJECT_ROOT, write_data_json
+from . import schema_registry
+from .models import PROJECT_ROOT, content_fingerprint, write_data_json
 
 ABILITY_SCHEMA = PROJECT_ROOT / 'schemas' / 'ability_schema.json'
 ABILITIES_SCHEMA = PROJECT_ROOT / 'schemas' / 'aggregate_ability_schema.json'
 
 
 class Ability:
+    FIELDS = ('_id', 'name', 'warband', 'cost', 'description', 'runemarks')
+    __slots__ = FIELDS + ('fingerprint',)
+
     def __init__(self, ability_dict: dict):
         self._id: str = ability_dict['_id']
         self.name: str = ability_dict['name']
-        self.warband: str = ability_dict['warband']
-        self.cost: str = ability_dict['cost']
+        self.warband: str = sys.intern(ability_dict['warband'])
+        self.cost: str = sys.intern(ability_dict['cost'])
         self.description: str = ability_dict['description']
-        self.runemarks: List[str] = ability_dict['runemarks']
+        self.runemarks: List[str] = [sys.intern(x) for x in ability_dict['runemarks']]
+        # Fingerprint of the source content, for change detection and cache keys
+        self.fingerprint: str = content_fingerprint(ability_dict)
 
     def __repr__(self):
         return self.name
 
+    def as_dict(self) -> Dict[str, Union[str, List[str]]]:
+        return {k: getattr(self, k) for k in self.FIELDS}
+
     def tts_format(self) -> Dict[str, str]:
         # tts = {self.name: {'cost': self.cost.capitalize(), 'description': self.description}}
         tts = {'_id': self._id}
@@ -53,12 +60,11 @@ class Abilities:
             dst: Path = Path(PROJECT_ROOT, 'data', 'abilities.json'),
             schema: Optional[Path] = Path(PROJECT_ROOT, 'data', 'schemas', 'aggregate_ability_schema.json')
     ):
-        sorted_data = sorted([x.__dict__ for x in self.abilities], key=lambda d: d['warband'])
+        sorted_data = sorted([x.as_dict() for x in self.abilities], key=lambda d: d['warband'])
 
         if schema:
             print(f'Validating ability data against {schema}')
-            ability_schema = json.loads(schema.read_text())
-            jsonschema.validate(sorted_data, ability_schema)
+            schema_registry.validate(sorted_data, schema)
 
         print(f'Writing {len(sorted_data)} abilities to {dst}...')
         write_data_json(dst=dst, data=sorted_data)
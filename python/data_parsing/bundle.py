@@ -0,0 +1,247 @@
+"""
+Packed single-file bundle of the Warcry source data.
+
+Packs the JSON files under ``data/`` and ``localisation/`` into one file so a
+cold start opens one file instead of hundreds. Layout::
+
+    header  | MAGIC, format version, index offset, index length
+    entries | file contents, each zlib-compressed when that makes it smaller
+    index   | JSON list of entries: key, offset, length, size, compressed, sha256, mtime, file size
+
+Entries are read individually by seeking to their offset, so a single warband
+can be loaded without reading the rest of the bundle. The index records the
+modification time and size of every source file, so a stale bundle is detected
+with a directory walk and rebuilt.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from dataclasses import asdict, dataclass
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from .models import PROJECT_DATA, PROJECT_ROOT, LOCALISATION_DATA
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'WCBUNDLE'
+BUNDLE_VERSION = 1
+HEADER = struct.Struct('<8sHQQ')
+BUNDLE_DIR = PROJECT_ROOT / '.cache' / 'bundles'
+DATA_ROOT = 'data'
+LOCALISATION_ROOT = 'localisation'
+
+
+class BundleError(Exception):
+    """Raised when a bundle cannot be read or does not contain a requested file."""
+    pass
+
+
+@dataclass
+class BundleEntry:
+    """Location and fingerprint of one packed file."""
+    key: str
+    offset: int
+    length: int
+    size: int
+    compressed: bool
+    sha256: str
+    mtime_ns: int
+    file_size: int
+
+
+def default_roots(src: Path = PROJECT_DATA) -> Dict[str, Path]:
+    return {DATA_ROOT: src, LOCALISATION_ROOT: LOCALISATION_DATA}
+
+
+def bundle_path(src: Path = PROJECT_DATA, bundle_dir: Path = BUNDLE_DIR) -> Path:
+    """Bundle file for a data folder."""
+    key = hashlib.sha256(str(src.resolve()).encode('utf-8')).hexdigest()[:16]
+    return bundle_dir / f'{src.name}-{key}.wcb'
+
+
+def iter_source_files(root: Path) -> Iterator[os.DirEntry]:
+    """JSON files under ``root`` in ``Path.rglob`` order: each folder's files, then its subfolders."""
+    try:
+        with os.scandir(root) as it:
+            entries = list(it)
+    except FileNotFoundError:
+        return
+    subfolders = []
+    for entry in entries:
+        if entry.is_dir():
+            subfolders.append(entry)
+        elif entry.name.endswith('.json'):
+            yield entry
+    for entry in subfolders:
+        yield from iter_source_files(Path(entry.path))
+
+
+def scan_roots(roots: Dict[str, Path]) -> List[Tuple[str, Path, int, int]]:
+    """(key, path, mtime_ns, size) for every source file, keys being ``<root>/<relative path>``."""
+    found = []
+    for name, root in roots.items():
+        for entry in iter_source_files(root):
+            stat = entry.stat()
+            relative = Path(os.path.relpath(entry.path, root)).as_posix()
+            found.append((f'{name}/{relative}', Path(entry.path), stat.st_mtime_ns, stat.st_size))
+    return found
+
+
+class DataBundle:
+    """Random-access reader for a bundle file, rebuilding it when its sources change.
+
+    Checking the sources stats every packed file, so ``ensure_current`` only does it
+    once; call ``expire`` when the files may have changed since, e.g. on ``refresh``.
+
+    Args:
+        path: Bundle file
+        roots: Root name -> source folder packed under that name
+    """
+
+    def __init__(self, path: Path, roots: Dict[str, Path]):
+        self.path = path
+        self.roots = roots
+        self._entries: Optional[Dict[str, BundleEntry]] = None
+        self._handle: Optional[BinaryIO] = None
+        self._lock = threading.Lock()
+        self._checked = False
+
+    def __enter__(self) -> 'DataBundle':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._handle:
+                self._handle.close()
+            self._handle = None
+            self._entries = None
+
+    @classmethod
+    def build(cls, path: Path, roots: Dict[str, Path], compress_level: int = 6) -> 'DataBundle':
+        """Pack every JSON file under ``roots`` into ``path``, replacing it atomically."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+        entries = []
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, BUNDLE_VERSION, 0, 0))
+            for key, file, mtime_ns, file_size in scan_roots(roots):
+                raw = file.read_bytes()
+                packed = zlib.compress(raw, compress_level)
+                compressed = len(packed) < len(raw)
+                payload = packed if compressed else raw
+                entries.append(BundleEntry(
+                    key=key, offset=f.tell(), length=len(payload), size=len(raw), compressed=compressed,
+                    sha256=hashlib.sha256(raw).hexdigest(), mtime_ns=mtime_ns, file_size=file_size
+                ))
+                f.write(payload)
+
+            index = json.dumps([asdict(e) for e in entries], separators=(',', ':')).encode('utf-8')
+            index_offset = f.tell()
+            f.write(index)
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, BUNDLE_VERSION, index_offset, len(index)))
+        os.replace(tmp, path)
+        logger.info(f"Packed {len(entries)} files into {path} ({path.stat().st_size} bytes)")
+        return cls(path, roots)
+
+    def _open(self) -> Tuple[BinaryIO, Dict[str, BundleEntry]]:
+        with self._lock:
+            if self._handle is None:
+                if not self.path.is_file():
+                    raise BundleError(f'No bundle at {self.path}')
+                handle = open(self.path, 'rb')
+                try:
+                    magic, version, index_offset, index_length = HEADER.unpack(handle.read(HEADER.size))
+                    if magic != MAGIC or version != BUNDLE_VERSION:
+                        raise BundleError(f'{self.path} is not a version {BUNDLE_VERSION} bundle')
+                    handle.seek(index_offset)
+                    index = json.loads(handle.read(index_length).decode('utf-8'))
+                except (struct.error, ValueError) as e:
+                    handle.close()
+                    raise BundleError(f'Could not read bundle {self.path}: {e}') from e
+                except BundleError:
+                    handle.close()
+                    raise
+                self._handle = handle
+                self._entries = {e['key']: BundleEntry(**e) for e in index}
+            return self._handle, self._entries
+
+    @property
+    def entries(self) -> Dict[str, BundleEntry]:
+        return self._open()[1]
+
+    def read(self, key: str) -> bytes:
+        """Content of one packed file, e.g. ``read('data/chaos/beasts_of_chaos/beasts_of_chaos_fighters.json')``."""
+        handle, entries = self._open()
+        entry = entries.get(key)
+        if entry is None:
+            raise BundleError(f'{key} is not in bundle {self.path}')
+        with self._lock:
+            handle.seek(entry.offset)
+            payload = handle.read(entry.length)
+        return zlib.decompress(payload) if entry.compressed else payload
+
+    def read_path(self, file: Path) -> Optional[bytes]:
+        """Content of a packed source file given its path on disk, or None if it is not in the bundle."""
+        key = self.key_for(file)
+        return self.read(key) if key in self.entries else None
+
+    def key_for(self, file: Path) -> Optional[str]:
+        for name, root in self.roots.items():
+            relative = Path(os.path.relpath(file, root))
+            if not relative.parts or relative.parts[0] != '..':
+                return f'{name}/{relative.as_posix()}'
+        return None
+
+    def files(self, root: str) -> List[str]:
+        """Relative paths of the files packed under a root, in source order."""
+        prefix = f'{root}/'
+        return [key[len(prefix):] for key in self.entries if key.startswith(prefix)]
+
+    def partition_files(self, partition: str, root: str = DATA_ROOT) -> List[str]:
+        """Relative paths of the files in one folder, e.g. ``partition_files('chaos/beasts_of_chaos')``."""
+        return [f for f in self.files(root) if PurePosixPath(f).parent.as_posix() == partition]
+
+    def is_current(self) -> bool:
+        """True if the bundle exists and every source file is unchanged by modification time and size."""
+        try:
+            entries = self.entries
+        except BundleError:
+            return False
+        sources = scan_roots(self.roots)
+        if len(sources) != len(entries):
+            return False
+        for key, _, mtime_ns, file_size in sources:
+            entry = entries.get(key)
+            if entry is None or entry.mtime_ns != mtime_ns or entry.file_size != file_size:
+                return False
+        return True
+
+    def ensure_current(self) -> 'DataBundle':
+        """Rebuild the bundle if it is missing or its sources have changed, unless already checked."""
+        if self._checked:
+            return self
+        if not self.is_current():
+            logger.info(f"Bundle {self.path} is missing or stale, rebuilding")
+            self.close()
+            DataBundle.build(self.path, self.roots)
+        self._checked = True
+        return self
+
+    def expire(self) -> None:
+        """Make the next ``ensure_current`` check the source files again."""
+        self._checked = False
+
+
+def open_bundle(src: Path = PROJECT_DATA, path: Optional[Path] = None) -> DataBundle:
+    """Open the bundle for a data folder, building or rebuilding it if needed."""
+    return DataBundle(path or bundle_path(src), default_roots(src)).ensure_current()
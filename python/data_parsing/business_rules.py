@@ -6,7 +6,10 @@ making it configurable and extensible.
 """
 
 from abc import ABC, abstractmethod
-from typing import Protocol, List
+from dataclasses import dataclass
+from typing import Protocol, List, Union
+
+import numpy as np
 
 from .abilities import Ability
 from .fighters import Fighter
@@ -114,28 +117,85 @@ class TTSExportRules:
         return TTSAbilityExclusionRule()
 
 
+def is_number(value) -> bool:
+    """True for JSON numbers; bools are ints in Python but not numbers in the data."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+@dataclass(frozen=True)
+class RangeRule:
+    """Declarative constraint that a numeric field lies within ``[minimum, maximum]``.
+
+    Missing values count as 0 and non-numeric values always violate the rule.
+    """
+    field: str
+    minimum: float
+    maximum: float
+
+    def allows(self, value) -> bool:
+        return is_number(value) and self.minimum <= value <= self.maximum
+
+    def violations(self, column: np.ndarray) -> np.ndarray:
+        """Boolean mask of the rows of a float column that break the rule; NaN always does."""
+        return ~((column >= self.minimum) & (column <= self.maximum))
+
+    def message(self, value) -> str:
+        return f"Invalid {self.field} value: {value} (must be {self.minimum}-{self.maximum})"
+
+
+@dataclass(frozen=True)
+class RequiredRule:
+    """Declarative constraint that a field is present and not empty."""
+    field: str
+
+    def allows(self, value) -> bool:
+        return bool(value)
+
+    def violations(self, column: np.ndarray) -> np.ndarray:
+        """Boolean mask of the rows of a presence column that break the rule."""
+        return ~column
+
+    def message(self, value) -> str:
+        return f"Missing required field: {self.field}"
+
+
+ColumnRule = Union[RangeRule, RequiredRule]
+
+
 class ValidationRules:
     """Business rules for data validation."""
-    
+
+    POINTS = RangeRule('points', 0, 2000)
+    MOVEMENT = RangeRule('movement', 1, 50)
+    TOUGHNESS = RangeRule('toughness', 1, 20)
+    WOUNDS = RangeRule('wounds', 1, 300)
+    FIGHTER_REQUIRED_FIELDS = ('_id', 'name', 'warband', 'grand_alliance', 'weapons', 'runemarks')
+
+    @classmethod
+    def fighter_rules(cls) -> List[ColumnRule]:
+        """Rules every fighter is checked against, in reporting order."""
+        return [cls.POINTS, cls.MOVEMENT, cls.TOUGHNESS, cls.WOUNDS,
+                *(RequiredRule(f) for f in cls.FIGHTER_REQUIRED_FIELDS)]
+
     @staticmethod
     def is_valid_points_value(points: int) -> bool:
         """Check if points value is within valid range."""
-        return 0 <= points <= 2000
-    
+        return ValidationRules.POINTS.allows(points)
+
     @staticmethod
     def is_valid_movement(movement: int) -> bool:
         """Check if movement value is realistic."""
-        return 1 <= movement <= 50
-    
+        return ValidationRules.MOVEMENT.allows(movement)
+
     @staticmethod
     def is_valid_toughness(toughness: int) -> bool:
         """Check if toughness value is within valid range."""
-        return 1 <= toughness <= 20
-    
+        return ValidationRules.TOUGHNESS.allows(toughness)
+
     @staticmethod
     def is_valid_wounds(wounds: int) -> bool:
         """Check if wounds value is within valid range."""
-        return 1 <= wounds <= 300
+        return ValidationRules.WOUNDS.allows(wounds)
 
 
 class ConfigurableRuleEngine:
@@ -48,6 +48,7 @@ class SchemaFiles:
     FIGHTER = PROJECT_ROOT / 'schemas' / 'fighter_schema.json'
     FIGHTERS_AGGREGATE = PROJECT_ROOT / 'schemas' / 'aggregate_fighter_schema.json'
     WARBAND = PROJECT_ROOT / 'schemas' / 'warband_schema.json'
+    WARBANDS_AGGREGATE = PROJECT_ROOT / 'schemas' / 'aggregate_warband_schema.json'
 
 
 class SpecialWarbands:
@@ -76,6 +77,22 @@ class DataTypes:
     FACTIONS = "factions"
 
 
+class SourceKeys:
+    """Key order of entities in the source data files; other keys follow in their original order."""
+    FIGHTER = ('_id', 'name', 'warband', 'subfaction', 'grand_alliance', 'movement', 'toughness', 'wounds',
+               'weapons', 'runemarks', 'points')
+    WEAPON = ('attacks', 'dmg_crit', 'dmg_hit', 'max_range', 'min_range', 'runemark', 'strength')
+    ABILITY = ('_id', 'name', 'warband', 'monster', 'cost', 'description', 'runemarks')
+    FACTION = ('grand_alliance', 'warband', 'bladeborn', 'heroes_all', 'subfactions', 'singleton')
+    SUBFACTION = ('runemark', 'bladeborn', 'heroes_all', 'singleton')
+
+
+class IdPatterns:
+    """Patterns of entity IDs."""
+    # Entities with a missing or placeholder _id are given a generated one on load
+    PLACEHOLDER = r'^PLACEHOLDER.*|^XXXXXX.*'
+
+
 class FileExtensions:
     """File extensions."""
     JSON = ".json"
@@ -95,6 +112,8 @@ class OutputFiles:
     FIGHTERS_LEGACY_JSON = "fighters_legacy.json"
     FIGHTERS_HTML = "fighters.html"
     FIGHTERS_CSV = "fighters.csv"
+    FIGHTERS_XLSX = "fighters.xlsx"
+    FIGHTERS_MD = "fighters.md"
 
 
 # Convenience collections
@@ -5,11 +5,15 @@ Handles loading fighters, abilities and factions from JSON files.
 """
 
 import logging
-from pathlib import Path
-from typing import Dict, List, Any
+import os
+from dataclasses import dataclass
+from pathlib import Path, PurePath
+from typing import Dict, List, Any, Optional, Iterable, Iterator
 
-from .constants import FileTypes, FolderNames, DataTypes
-from .models import load_json_file, PROJECT_DATA
+from .bundle import DATA_ROOT, DataBundle
+from .constants import FileTypes, FolderNames, DataTypes, SpecialWarbands
+from .models import load_json_file, load_json_bytes, sanitise_filename, PROJECT_DATA
+from .partitions import Partition, PartitionedData, file_hash, partition_key
 
 logger = logging.getLogger(__name__)
 
@@ -19,64 +23,225 @@ class FileProcessingError(Exception):
     pass
 
 
+DATA_TYPE_SUFFIXES = {
+    DataTypes.FIGHTERS: FileTypes.FIGHTERS.value,
+    DataTypes.ABILITIES: FileTypes.ABILITIES.value,
+    DataTypes.FACTIONS: FileTypes.FACTION.value,
+}
+
+
+@dataclass
+class DataFilter:
+    """Structured filters applied while scanning the ``data/<grand_alliance>/<warband>/`` layout.
+
+    Directories that cannot match are pruned before any file in them is opened.
+
+    Args:
+        grand_alliances: Grand alliance folder names to load, e.g. ``['order']``
+        warbands: Warband names or folder names to load, e.g. ``['Kruleboyz']``
+        data_types: Entity types to load, from ``DataTypes``
+        include_universal: Whether universal abilities are loaded regardless of the other filters
+    """
+    grand_alliances: Optional[Iterable[str]] = None
+    warbands: Optional[Iterable[str]] = None
+    data_types: Optional[Iterable[str]] = None
+    include_universal: bool = True
+
+    def __post_init__(self):
+        if self.grand_alliances is not None:
+            self.grand_alliances = frozenset(ga.lower() for ga in self.grand_alliances)
+        if self.warbands is not None:
+            self.warbands = frozenset(sanitise_filename(w) for w in self.warbands)
+        if self.data_types is not None:
+            self.data_types = frozenset(self.data_types)
+            unknown = self.data_types - DATA_TYPE_SUFFIXES.keys()
+            if unknown:
+                raise ValueError(f'Unknown data types: {sorted(unknown)}')
+
+    def cache_key(self) -> str:
+        """Stable text form of the filter, for use in cache keys."""
+        def part(values):
+            return '*' if values is None else ','.join(sorted(values))
+        return f'ga={part(self.grand_alliances)};wb={part(self.warbands)};dt={part(self.data_types)};u={self.include_universal}'
+
+    def allows_grand_alliance(self, folder_name: str) -> bool:
+        """Check a top-level folder of the data directory."""
+        folder_name = folder_name.lower()
+        if folder_name == SpecialWarbands.UNIVERSAL:
+            return self.include_universal
+        return self.grand_alliances is None or folder_name in self.grand_alliances
+
+    def allows_warband(self, folder_name: str) -> bool:
+        """Check a warband folder inside a grand alliance folder."""
+        return self.warbands is None or folder_name.lower() in self.warbands
+
+    def allows_file(self, file_name: str) -> bool:
+        """Check a data file name against the requested data types."""
+        if self.data_types is None:
+            return True
+        return any(file_name.endswith(DATA_TYPE_SUFFIXES[t]) for t in self.data_types)
+
+
 class WarbandDataLoader:
-    """Handles loading of warband data from JSON files."""
+    """Handles loading of warband data from JSON files.
+
+    Args:
+        src: Data folder
+        filter_string: Glob that data file paths relative to ``src`` must match
+        data_filter: Structured filters applied while scanning
+        bundle: Packed bundle of ``src`` to read from instead of the individual files,
+            rebuilt automatically when the files change
+    """
     
-    def __init__(self, src: Path = PROJECT_DATA, filter_string: str = '*.json'):
+    def __init__(self, src: Path = PROJECT_DATA, filter_string: str = '*.json', data_filter: Optional[DataFilter] = None,
+                 bundle: Optional[DataBundle] = None):
         self.src = src
         self.filter_str = filter_string
+        self.data_filter = data_filter or DataFilter()
+        self.bundle = bundle
         
         if not src.is_dir():
             raise TypeError(f'src must be a dir: {src}')
+        if bundle and Path(bundle.roots[DATA_ROOT]).resolve() != src.resolve():
+            raise ValueError(f'Bundle {bundle.path} packs {bundle.roots[DATA_ROOT]}, not {src}')
+
+    def iter_data_files(self) -> Iterator[Path]:
+        """Yield data files matching ``filter_string`` and ``data_filter``.
+
+        Walks the tree in the same order as ``Path.rglob``, but skips grand alliance and
+        warband folders excluded by the filter without listing their contents.
+        """
+        if self.bundle:
+            yield from self._iter_bundle_files()
+            return
+
+        def scan(folder: Path, depth: int) -> Iterator[Path]:
+            with os.scandir(folder) as it:
+                entries = list(it)
+            subfolders = []
+            for entry in entries:
+                if entry.is_dir():
+                    subfolders.append(entry)
+                elif PurePath(os.path.relpath(entry.path, self.src)).match(self.filter_str) \
+                        and self.data_filter.allows_file(entry.name):
+                    yield Path(entry.path)
+            for entry in subfolders:
+                if depth == 0 and not self.data_filter.allows_grand_alliance(entry.name):
+                    logger.debug(f"Pruned grand alliance folder: {entry.path}")
+                    continue
+                if depth == 1 and not self.data_filter.allows_warband(entry.name):
+                    logger.debug(f"Pruned warband folder: {entry.path}")
+                    continue
+                yield from scan(Path(entry.path), depth + 1)
+
+        yield from scan(self.src, 0)
     
-    def load_all_data(self) -> Dict[str, List[Any]]:
-        """Load all warband data from the source directory.
-        
+    def _iter_bundle_files(self) -> Iterator[Path]:
+        """``iter_data_files`` over the bundle index, in the order the files were packed."""
+        for relative in self.bundle.ensure_current().files(DATA_ROOT):
+            parts = relative.split('/')
+            if len(parts) > 1 and not self.data_filter.allows_grand_alliance(parts[0]):
+                continue
+            if len(parts) > 2 and not self.data_filter.allows_warband(parts[1]):
+                continue
+            if PurePath(relative).match(self.filter_str) and self.data_filter.allows_file(parts[-1]):
+                yield self.src / relative
+
+    def read_bytes(self, file: Path) -> bytes:
+        """Raw content of a source file, from the bundle when there is one."""
+        if self.bundle:
+            raw = self.bundle.read_path(file)
+            if raw is not None:
+                return raw
+        return file.read_bytes()
+
+    def relative_path(self, file: Path) -> str:
+        """Path of a data file relative to ``src``, in posix form."""
+        return Path(os.path.relpath(file, self.src)).as_posix()
+
+    def scan_sources(self) -> Dict[str, Dict[str, str]]:
+        """Hash the current data files without parsing them.
+
         Returns:
-            Dictionary containing fighters, abilities and factions lists
+            Partition key -> {relative file path: sha256}
+        """
+        sources: Dict[str, Dict[str, str]] = {}
+        for file in self.iter_data_files():
+            if file.parent.name.lower() == FolderNames.SCHEMAS:
+                continue
+            relative = self.relative_path(file)
+            if self.bundle:
+                # The bundle index already holds the hash of every packed file
+                digest = self.bundle.entries[f'{DATA_ROOT}/{relative}'].sha256
+            else:
+                digest = file_hash(file.read_bytes())
+            sources.setdefault(partition_key(relative), {})[relative] = digest
+        return sources
+
+    def load_partitions(self, files: Optional[Iterable[Path]] = None) -> Dict[str, Partition]:
+        """Load data files into per-folder partitions, in load order.
+
+        Args:
+            files: Files to load, defaults to every file from ``iter_data_files``
         """
-        data = {
-            DataTypes.FIGHTERS: [],
-            DataTypes.ABILITIES: [], 
-            DataTypes.FACTIONS: []
-        }
+        partitions: Dict[str, Partition] = {}
         processed_files = 0
         
-        for file in self.src.rglob(self.filter_str):
-            if not file.is_file():
-                logger.debug(f"Skipping non-file: {file}")
-                continue
-                
+        for file in self.iter_data_files() if files is None else files:
             if file.parent.name.lower() == FolderNames.SCHEMAS:
                 logger.debug(f"Skipping schema file: {file}")
                 continue
+
+            relative = self.relative_path(file)
+            key = partition_key(relative)
+            partition = partitions.get(key) or partitions.setdefault(key, Partition(key=key))
                 
             try:
                 if file.name.endswith(FileTypes.FIGHTERS.value):
-                    content = load_json_file(file)
-                    data[DataTypes.FIGHTERS].extend(content)
-                    processed_files += 1
+                    raw = self.read_bytes(file)
+                    content = load_json_bytes(raw, file)
+                    partition.data[DataTypes.FIGHTERS].extend(content)
                     logger.info(f"Loaded {len(content)} fighters from {file}")
                     
                 elif file.name.endswith(FileTypes.ABILITIES.value):
-                    content = load_json_file(file)
-                    data[DataTypes.ABILITIES].extend(content)
-                    processed_files += 1
+                    raw = self.read_bytes(file)
+                    content = load_json_bytes(raw, file)
+                    partition.data[DataTypes.ABILITIES].extend(content)
                     logger.info(f"Loaded {len(content)} abilities from {file}")
                     
                 elif file.name.endswith(FileTypes.FACTION.value):
-                    content = load_json_file(file)
-                    data[DataTypes.FACTIONS].append(content)
-                    processed_files += 1
+                    raw = self.read_bytes(file)
+                    content = load_json_bytes(raw, file)
+                    partition.data[DataTypes.FACTIONS].append(content)
                     logger.info(f"Loaded faction data from {file}")
+
+                else:
+                    continue
+
+                partition.files[relative] = file_hash(raw)
+                processed_files += 1
                     
             except Exception as e:
                 logger.error(f"Failed to process file {file}: {e}")
                 raise FileProcessingError(f"Error processing {file}: {e}") from e
         
         logger.info(f"Successfully processed {processed_files} data files")
+        return {key: p for key, p in partitions.items() if p.files}
+
+    def load_partitioned_data(self) -> PartitionedData:
+        """Load all warband data, keeping track of the folder each entity came from."""
+        loaded = PartitionedData.from_partitions(self.load_partitions())
+        data = loaded.data
         logger.info(f"Total loaded: {len(data[DataTypes.FIGHTERS])} fighters, {len(data[DataTypes.ABILITIES])} abilities, {len(data[DataTypes.FACTIONS])} factions")
-        return data
+        return loaded
+
+    def load_all_data(self) -> Dict[str, List[Any]]:
+        """Load all warband data from the source directory.
+        
+        Returns:
+            Dictionary containing fighters, abilities and factions lists
+        """
+        return self.load_partitioned_data().data
     
     def load_fighters(self) -> List[Dict[str, Any]]:
         """Load only fighter data."""
@@ -103,6 +268,10 @@ class WarbandDataLoader:
             List of localized ability data
         """
         try:
+            if self.bundle:
+                raw = self.bundle.read_path(patch_file)
+                if raw is not None:
+                    return load_json_bytes(raw, patch_file)
             return load_json_file(patch_file)
         except Exception as e:
             logger.error(f"Failed to load localization file {patch_file}: {e}")
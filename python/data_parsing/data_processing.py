@@ -8,16 +8,54 @@ import logging
 import re
 import uuid
 from collections import defaultdict
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+
+import numpy as np
 
 from .abilities import Ability
-from .constants import SpecialWarbands, DataTypes
+from .constants import SpecialWarbands, DataTypes, IdPatterns
 from .factions import Factions
 from .fighters import Fighters
 
 logger = logging.getLogger(__name__)
 
 
+class RunemarkBitsets:
+    """Encodes sets of runemarks as integer bitmasks.
+
+    Each distinct runemark is given a bit the first time it is seen, so a set of runemarks
+    becomes a single int and ``A`` is a subset of ``B`` exactly when ``A & ~B == 0``.
+    """
+
+    WORD_BITS = 64
+
+    def __init__(self):
+        self.bits: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    def mask(self, runemarks: Iterable[str]) -> int:
+        """Return the bitmask for a set of runemarks, allocating bits for unseen runemarks."""
+        mask = 0
+        for runemark in runemarks:
+            bit = self.bits.get(runemark)
+            if bit is None:
+                bit = self.bits[runemark] = len(self.bits)
+            mask |= 1 << bit
+        return mask
+
+    def to_array(self, masks: List[int]) -> np.ndarray:
+        """Pack masks into a ``(len(masks), words)`` uint64 array for vectorised subset tests."""
+        words = max(1, -(-len(self.bits) // self.WORD_BITS))
+        word_mask = (1 << self.WORD_BITS) - 1
+        packed = np.zeros((len(masks), words), dtype=np.uint64)
+        for w in range(words):
+            shift = w * self.WORD_BITS
+            packed[:, w] = [(m >> shift) & word_mask for m in masks]
+        return packed
+
+
 class WarbandDataProcessor:
     """Handles processing and assignment operations on warband data."""
     
@@ -26,13 +64,14 @@ class WarbandDataProcessor:
         self.abilities = abilities
         self.factions = factions
     
-    def assign_ids(self, data: Dict[str, List[Dict[str, Any]]]) -> None:
+    @staticmethod
+    def assign_ids(data: Dict[str, List[Dict[str, Any]]]) -> None:
         """Assign unique IDs to entities that don't have them.
         
         Args:
             data: Dictionary containing fighters, abilities and factions data
         """
-        placeholder_pattern = re.compile(r'^PLACEHOLDER.*|^XXXXXX.*', flags=re.IGNORECASE)
+        placeholder_pattern = re.compile(IdPatterns.PLACEHOLDER, flags=re.IGNORECASE)
 
         for data_type, entities in data.items():
             for entity in entities:
@@ -45,58 +84,74 @@ class WarbandDataProcessor:
     def assign_abilities(self) -> None:
         """Assign abilities to fighters based on warband and runemarks.
         
-        Optimized implementation uses lookup tables to reduce complexity
-        from O(n*m) to O(n+m) where n=abilities, m=fighters.
+        Fighters are grouped by warband and subfaction so each ability is only checked
+        against its own warband. Runemarks are encoded once as bitmasks, so the subset
+        check is a single integer operation, and universal abilities are checked against
+        every fighter at once with NumPy.
         """
         logger.info("Starting ability assignment")
         assignments_made = 0
         
-        # Build lookup tables first - O(m) where m = fighters
+        fighters = self.fighters.fighters
+        bitsets = RunemarkBitsets()
+        fighter_masks = [bitsets.mask(fighter.runemarks) for fighter in fighters]
+        ability_masks = [bitsets.mask(ability.runemarks) for ability in self.abilities]
+
+        # Build lookup tables of fighter indices first - O(m) where m = fighters
         fighters_by_warband = defaultdict(list)
         fighters_by_subfaction = defaultdict(list)
         
-        for fighter in self.fighters.fighters:
-            fighters_by_warband[fighter.warband].append(fighter)
+        for i, fighter in enumerate(fighters):
+            fighters_by_warband[fighter.warband].append(i)
             subfaction = fighter.subfaction_runemark()
             if subfaction:
-                fighters_by_subfaction[subfaction].append(fighter)
+                fighters_by_subfaction[subfaction].append(i)
+        
+        fighter_array = None
         
         # Assign abilities - O(n * f) where f = fighters per warband (much smaller than total)
-        for ability in self.abilities:
-            target_fighters = []
-            
+        for ability, ability_mask in zip(self.abilities, ability_masks):
             if ability.warband == SpecialWarbands.UNIVERSAL:
-                target_fighters = self.fighters.fighters
+                if fighter_array is None:
+                    fighter_array = bitsets.to_array(fighter_masks)
+                ability_array = bitsets.to_array([ability_mask])
+                matches = np.flatnonzero(((ability_array & ~fighter_array) == 0).all(axis=1))
             else:
                 # Get fighters from both warband and subfaction lookups
-                target_fighters.extend(fighters_by_warband.get(ability.warband, []))
-                target_fighters.extend(fighters_by_subfaction.get(ability.warband, []))
+                candidates = [
+                    *fighters_by_warband.get(ability.warband, []),
+                    *fighters_by_subfaction.get(ability.warband, [])
+                ]
+                matches = [i for i in candidates if ability_mask & ~fighter_masks[i] == 0]
             
-            for fighter in target_fighters:
-                if set(ability.runemarks).issubset(set(fighter.runemarks)):
-                    fighter.abilities.append(ability)
-                    assignments_made += 1
+            for i in matches:
+                fighters[i].abilities.append(ability)
+            assignments_made += len(matches)
         
         logger.info(f"Completed ability assignment: {assignments_made} assignments made")
 
     def assign_factions(self) -> None:
-        """Assign factions and subfactions to fighters."""
+        """Assign factions and subfactions to fighters.
+        
+        Uses the warband and subfaction indexes on Factions, so each fighter costs a
+        dict lookup per runemark rather than a scan over every faction.
+        """
         logger.info("Starting faction assignment")
         assignments_made = 0
         
         for fighter in self.fighters.fighters:
-            for faction in self.factions.factions:
-                if fighter.warband == faction.warband:
-                    fighter.faction = faction
-                    assignments_made += 1
-                    
-                    # Assign subfactions
-                    for subfaction in faction.subfactions:
-                        runemarks_to_check = [*fighter.runemarks, fighter.as_dict().get('subfaction')]
-                        if any(runemark for runemark in runemarks_to_check 
-                              if runemark and runemark == subfaction.runemark):
-                            fighter.subfaction = subfaction
-                            break
+            faction = self.factions.get_faction(fighter.warband)
+            if not faction:
+                continue
+            fighter.faction = faction
+            assignments_made += 1
+
+            # Assign subfactions, read straight from the source profile rather than a copy
+            subfactions = self.factions.subfactions_by_runemark[faction.warband]
+            for runemark in [*fighter.runemarks, fighter._raw_data.get('subfaction')]:
+                if runemark and runemark in subfactions:
+                    fighter.subfaction = subfactions[runemark]
+                    break
         
         logger.info(f"Completed faction assignment: {assignments_made} assignments made")
 
@@ -1,55 +1,115 @@
 """
 HTML and other format export functionality for Warcry data.
+
+Every tabular format is written from the same flattened fighters DataFrame
+(``fighters.fighters_frame``). Pass the frame instead of the fighter dicts to
+reuse one across formats, as ``WarbandDataPipeline`` does.
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+import pandas as pd
 
-from ..fighters import FighterJSONDataPayload
+from ..constants import OutputFiles
+from ..fighters import fighters_frame
 
 logger = logging.getLogger(__name__)
 
+# Output file and writer of each tabular format
+TABULAR_WRITERS: Dict[str, Tuple[str, Callable[[pd.DataFrame, Path], Any]]] = {
+    'html': (OutputFiles.FIGHTERS_HTML, lambda frame, dst: frame.to_html(dst)),
+    'csv': (OutputFiles.FIGHTERS_CSV, lambda frame, dst: frame.to_csv(dst)),
+    'xlsx': (OutputFiles.FIGHTERS_XLSX, lambda frame, dst: frame.to_excel(dst, engine='xlsxwriter')),
+    'markdown': (OutputFiles.FIGHTERS_MD, lambda frame, dst: frame.to_markdown(dst)),
+}
+
+Fighters = Union[List[Dict[str, Any]], pd.DataFrame]
+
+
+def as_frame(fighters: Fighters) -> pd.DataFrame:
+    return fighters if isinstance(fighters, pd.DataFrame) else fighters_frame(fighters)
+
 
 class HTMLExporter:
     """Handles HTML, CSV, XLSX and Markdown export operations."""
-    
-    def export_fighters_html(self, fighters_data: List[Dict[str, Any]], dst_root: Path) -> None:
+
+    def export_fighters_table(self, fighters: Fighters, dst_root: Path, table_format: str) -> Path:
+        """Export fighters to one tabular format.
+
+        Args:
+            fighters: List of fighter dictionaries, or their flattened DataFrame
+            dst_root: Root destination directory
+            table_format: One of ``TABULAR_WRITERS``
+
+        Returns:
+            The file written
+        """
+        frame = as_frame(fighters)
+        file_name, write = TABULAR_WRITERS[table_format]
+        out_file = Path(dst_root, file_name)
+        logger.info(f"Exporting {len(frame)} fighters to {table_format.upper()} format")
+        print(f'writing {out_file.absolute()}')
+        write(frame, out_file)
+        return out_file
+
+    def export_fighters_tables(self, fighters: Fighters, dst_root: Path,
+                               table_formats: Iterable[str] = tuple(TABULAR_WRITERS), max_workers: int = 1) -> List[Path]:
+        """Export fighters to several tabular formats from one DataFrame.
+
+        The frame is only read by the writers, so with ``max_workers`` above 1 the
+        formats are written concurrently on a thread pool.
+
+        Args:
+            fighters: List of fighter dictionaries, or their flattened DataFrame
+            dst_root: Root destination directory
+            table_formats: Formats to write, see ``TABULAR_WRITERS``
+            max_workers: Formats written at the same time
+
+        Returns:
+            The files written, in the order of ``table_formats``
+        """
+        frame = as_frame(fighters)
+        table_formats = list(table_formats)
+        if max_workers <= 1 or len(table_formats) <= 1:
+            return [self.export_fighters_table(frame, dst_root, f) for f in table_formats]
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(lambda f: self.export_fighters_table(frame, dst_root, f), table_formats))
+
+    def export_fighters_html(self, fighters: Fighters, dst_root: Path) -> None:
         """Export fighters to HTML format.
-        
+
         Args:
-            fighters_data: List of fighter dictionaries
+            fighters: List of fighter dictionaries, or their flattened DataFrame
             dst_root: Root destination directory
         """
-        logger.info(f"Exporting {len(fighters_data)} fighters to HTML format")
-        FighterJSONDataPayload(preloaded_data=fighters_data).write_html(dst_root=dst_root)
-        
-    def export_fighters_csv(self, fighters_data: List[Dict[str, Any]], dst_root: Path) -> None:
+        self.export_fighters_table(fighters, dst_root, 'html')
+
+    def export_fighters_csv(self, fighters: Fighters, dst_root: Path) -> None:
         """Export fighters to CSV format.
-        
+
         Args:
-            fighters_data: List of fighter dictionaries
+            fighters: List of fighter dictionaries, or their flattened DataFrame
             dst_root: Root destination directory
         """
-        logger.info(f"Exporting {len(fighters_data)} fighters to CSV format")
-        FighterJSONDataPayload(preloaded_data=fighters_data).write_csv(dst_root=dst_root)
-        
-    def export_fighters_xlsx(self, fighters_data: List[Dict[str, Any]], dst_root: Path) -> None:
+        self.export_fighters_table(fighters, dst_root, 'csv')
+
+    def export_fighters_xlsx(self, fighters: Fighters, dst_root: Path) -> None:
         """Export fighters to XLSX format.
-        
+
         Args:
-            fighters_data: List of fighter dictionaries
+            fighters: List of fighter dictionaries, or their flattened DataFrame
             dst_root: Root destination directory
         """
-        logger.info(f"Exporting {len(fighters_data)} fighters to XLSX format")
-        FighterJSONDataPayload(preloaded_data=fighters_data).write_xlsx(dst_root=dst_root)
-        
-    def export_fighters_markdown_table(self, fighters_data: List[Dict[str, Any]], dst_root: Path) -> None:
+        self.export_fighters_table(fighters, dst_root, 'xlsx')
+
+    def export_fighters_markdown_table(self, fighters: Fighters, dst_root: Path) -> None:
         """Export fighters to Markdown table format.
-        
+
         Args:
-            fighters_data: List of fighter dictionaries
+            fighters: List of fighter dictionaries, or their flattened DataFrame
             dst_root: Root destination directory
         """
-        logger.info(f"Exporting {len(fighters_data)} fighters to Markdown table format")
-        FighterJSONDataPayload(preloaded_data=fighters_data).write_markdown_table(dst_root=dst_root)
+        self.export_fighters_table(fighters, dst_root, 'markdown')
@@ -1,14 +1,17 @@
+import sys
 from pathlib import Path
-from typing import Set, List
+from typing import Set, List, Dict, Optional
 
-from .models import PROJECT_ROOT, PROJECT_DATA, sanitise_filename, write_data_json
+from .models import PROJECT_ROOT, PROJECT_DATA, content_fingerprint, sanitise_filename, write_data_json
 
 FACTION_SCHEMA = PROJECT_ROOT / 'schemas' / 'faction_schema.json'
 
 
 class SubFaction:
+    __slots__ = ('runemark', 'bladeborn', 'heroes_all', 'singleton')
+
     def __init__(self, runemark: str, bladeborn: bool = False, heroes_all: bool = False, singleton: bool = False):
-        self.runemark = runemark
+        self.runemark = sys.intern(runemark)
         self.bladeborn = bladeborn
         self.heroes_all = heroes_all
         self.singleton = singleton
@@ -16,14 +19,21 @@ class SubFaction:
     def __repr__(self):
         return self.runemark
 
+    def as_dict(self):
+        return {k: getattr(self, k) for k in self.__slots__}
+
 class Faction:
-    def __init__(self, grand_alliance: str, warband: str, bladeborn: bool = False, heroes_all: bool = False, singleton: bool = False):
-        self.grand_alliance = grand_alliance
-        self.warband = warband
+    __slots__ = ('grand_alliance', 'warband', 'bladeborn', 'heroes_all', 'singleton', 'subfactions', 'fingerprint')
+
+    def __init__(self, grand_alliance: str, warband: str, bladeborn: bool = False, heroes_all: bool = False, singleton: bool = False,
+                 fingerprint: Optional[str] = None):
+        self.grand_alliance = sys.intern(grand_alliance)
+        self.warband = sys.intern(warband)
         self.bladeborn = bladeborn
         self.heroes_all = heroes_all
         self.singleton = singleton
         self.subfactions: Set[SubFaction] = set()
+        self.fingerprint = fingerprint
 
     def __repr__(self):
         return self.warband
@@ -35,7 +45,7 @@ class Faction:
             'bladeborn': self.bladeborn,
             'heroes_all': self.heroes_all,
             'singleton': self.singleton,
-            'subfactions': [s.__dict__ for s in self.subfactions]
+            'subfactions': [s.as_dict() for s in self.subfactions]
         }
         return json_serialisable
 
@@ -51,13 +61,17 @@ class Factions:
     def __init__(self, data: List[dict]):
         self.factions: List[Faction] = []
         self.bladeborn_runemarks: Set[str] = set()
+        # Lookup indexes: warband -> Faction and warband -> subfaction runemark -> SubFaction
+        self.by_warband: Dict[str, Faction] = {}
+        self.subfactions_by_runemark: Dict[str, Dict[str, SubFaction]] = {}
         for f in data:
             new_faction = Faction(
                     grand_alliance=f['grand_alliance'],
                     warband=f['warband'],
                     bladeborn=f['bladeborn'],
                     heroes_all=f['heroes_all'],
-                    singleton=f.get('singleton', False)
+                    singleton=f.get('singleton', False),
+                    fingerprint=content_fingerprint(f)
                 )
             if new_faction.bladeborn:
                 self.bladeborn_runemarks.add(new_faction.warband)
@@ -72,3 +86,11 @@ class Factions:
                     self.bladeborn_runemarks.add(new_subfaction.runemark)
                 new_faction.subfactions.add(new_subfaction)
             self.factions.append(new_faction)
+            self.by_warband[new_faction.warband] = new_faction
+            self.subfactions_by_runemark[new_faction.warband] = {s.runemark: s for s in new_faction.subfactions}
+
+    def get_faction(self, warband: str) -> Optional[Faction]:
+        return self.by_warband.get(warband)
+
+    def get_subfaction(self, warband: str, runemark: str) -> Optional[SubFaction]:
+        return self.subfactions_by_runemark.get(warband, {}).get(runemark)
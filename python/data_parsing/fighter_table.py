@@ -0,0 +1,253 @@
+"""
+Columnar fighter table for Warcry data analytics.
+
+Stores fighters as a struct of NumPy arrays so that filtering and aggregation
+run over whole columns instead of lists of dicts or Fighter objects.
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .fighters import Fighters, WEAPON_KEYS
+
+logger = logging.getLogger(__name__)
+
+STAT_COLUMNS = ('movement', 'toughness', 'wounds', 'points')
+WEAPON_STAT_COLUMNS = tuple(k for k in WEAPON_KEYS if k != 'runemark')
+CATEGORICAL_COLUMNS = ('warband', 'grand_alliance', 'subfaction')
+
+Selection = Union[np.ndarray, Sequence[int]]
+
+
+def _encode(values: Sequence[str]) -> Tuple[np.ndarray, List[str]]:
+    """Encode strings as integer codes into a sorted list of categories."""
+    categories = sorted(set(values))
+    lookup = {c: i for i, c in enumerate(categories)}
+    codes = np.fromiter((lookup[v] for v in values), dtype=np.int32, count=len(values))
+    return codes, categories
+
+
+def _ragged_take(offsets: np.ndarray, rows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Select rows from a ragged column.
+
+    Args:
+        offsets: Offsets array of the ragged column, one longer than the number of rows
+        rows: Integer indices of the rows to keep
+
+    Returns:
+        Tuple of (indices into the flat values array, offsets array for the selected rows)
+    """
+    lengths = offsets[1:][rows] - offsets[:-1][rows]
+    new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    flat_index = np.repeat(offsets[:-1][rows] - new_offsets[:-1], lengths) + np.arange(new_offsets[-1])
+    return flat_index, new_offsets
+
+
+class FighterTable:
+    """Struct-of-arrays representation of a set of fighters.
+
+    Scalar stats are NumPy integer columns. Warband, grand alliance and subfaction are
+    categorical codes into shared category lists. Runemarks and weapons are ragged
+    columns: a flat values array plus an offsets array, where the values for row ``i``
+    live in ``values[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(
+        self,
+        ids: np.ndarray,
+        names: np.ndarray,
+        stats: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+        runemark_codes: np.ndarray,
+        runemark_offsets: np.ndarray,
+        runemark_categories: List[str],
+        weapon_stats: Dict[str, np.ndarray],
+        weapon_runemark_codes: np.ndarray,
+        weapon_runemark_categories: List[str],
+        weapon_offsets: np.ndarray,
+    ):
+        self.ids = ids
+        self.names = names
+        self.stats = stats
+        self.codes = codes
+        self.categories = categories
+        self.runemark_codes = runemark_codes
+        self.runemark_offsets = runemark_offsets
+        self.runemark_categories = runemark_categories
+        self.weapon_stats = weapon_stats
+        self.weapon_runemark_codes = weapon_runemark_codes
+        self.weapon_runemark_categories = weapon_runemark_categories
+        self.weapon_offsets = weapon_offsets
+
+        # Owning row of every flat runemark entry, used to build runemark masks
+        self._runemark_rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(runemark_offsets))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self):
+        return f'FighterTable(fighters={len(self)}, weapons={len(self.weapon_runemark_codes)})'
+
+    @classmethod
+    def from_fighters(cls, fighters: Fighters) -> 'FighterTable':
+        """Build a table from a Fighters collection.
+
+        Subfaction codes reflect ``Fighter.subfaction`` so the table should be built after
+        faction assignment. Fighters without a subfaction are encoded as the empty string.
+        """
+        rows = fighters.fighters
+        n = len(rows)
+
+        ids = np.array([f._id for f in rows], dtype=object)
+        names = np.array([f.name for f in rows], dtype=object)
+        stats = {
+            col: np.fromiter((getattr(f, col) for f in rows), dtype=np.int32, count=n)
+            for col in STAT_COLUMNS
+        }
+
+        codes = {}
+        categories = {}
+        codes['warband'], categories['warband'] = _encode([f.warband for f in rows])
+        codes['grand_alliance'], categories['grand_alliance'] = _encode([f.grand_alliance for f in rows])
+        codes['subfaction'], categories['subfaction'] = _encode([f.subfaction_runemark() or '' for f in rows])
+
+        runemark_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(f.runemarks) for f in rows], out=runemark_offsets[1:])
+        runemark_codes, runemark_categories = _encode([r for f in rows for r in f.runemarks])
+
+        weapons = [w for f in rows for w in f.weapons]
+        weapon_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum([len(f.weapons) for f in rows], out=weapon_offsets[1:])
+        weapon_stats = {
+            col: np.fromiter((getattr(w, col) for w in weapons), dtype=np.int32, count=len(weapons))
+            for col in WEAPON_STAT_COLUMNS
+        }
+        weapon_runemark_codes, weapon_runemark_categories = _encode([w.runemark for w in weapons])
+
+        table = cls(
+            ids=ids,
+            names=names,
+            stats=stats,
+            codes=codes,
+            categories=categories,
+            runemark_codes=runemark_codes,
+            runemark_offsets=runemark_offsets,
+            runemark_categories=runemark_categories,
+            weapon_stats=weapon_stats,
+            weapon_runemark_codes=weapon_runemark_codes,
+            weapon_runemark_categories=weapon_runemark_categories,
+            weapon_offsets=weapon_offsets,
+        )
+        logger.info(f"Built {table!r}")
+        return table
+
+    # Masks
+    def category_mask(self, column: str, *values: str) -> np.ndarray:
+        """Boolean mask of rows whose categorical ``column`` is any of ``values``."""
+        lookup = self.categories[column]
+        wanted = [lookup.index(v) for v in values if v in lookup]
+        return np.isin(self.codes[column], wanted)
+
+    def range_mask(self, column: str, low: Optional[int] = None, high: Optional[int] = None) -> np.ndarray:
+        """Boolean mask of rows whose stat ``column`` is within ``[low, high]``."""
+        values = self.stats[column]
+        mask = np.ones(len(self), dtype=bool)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def runemark_mask(self, *runemarks: str) -> np.ndarray:
+        """Boolean mask of rows that carry every one of ``runemarks``."""
+        mask = np.ones(len(self), dtype=bool)
+        for runemark in runemarks:
+            if runemark not in self.runemark_categories:
+                return np.zeros(len(self), dtype=bool)
+            code = self.runemark_categories.index(runemark)
+            has_runemark = np.zeros(len(self), dtype=bool)
+            has_runemark[self._runemark_rows[self.runemark_codes == code]] = True
+            mask &= has_runemark
+        return mask
+
+    def where(
+        self,
+        warband: Optional[str] = None,
+        grand_alliance: Optional[str] = None,
+        runemarks: Sequence[str] = (),
+        min_points: Optional[int] = None,
+        max_points: Optional[int] = None,
+    ) -> np.ndarray:
+        """Combine the common filters into a single boolean mask."""
+        mask = self.range_mask('points', min_points, max_points)
+        if warband is not None:
+            mask &= self.category_mask('warband', warband)
+        if grand_alliance is not None:
+            mask &= self.category_mask('grand_alliance', grand_alliance)
+        if runemarks:
+            mask &= self.runemark_mask(*runemarks)
+        return mask
+
+    # Selection
+    def take(self, selection: Selection) -> 'FighterTable':
+        """Return a new table containing only the selected rows.
+
+        Args:
+            selection: Boolean mask or integer row indices
+        """
+        rows = np.asarray(selection)
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+
+        runemark_index, runemark_offsets = _ragged_take(self.runemark_offsets, rows)
+        weapon_index, weapon_offsets = _ragged_take(self.weapon_offsets, rows)
+
+        return FighterTable(
+            ids=self.ids[rows],
+            names=self.names[rows],
+            stats={k: v[rows] for k, v in self.stats.items()},
+            codes={k: v[rows] for k, v in self.codes.items()},
+            categories=self.categories,
+            runemark_codes=self.runemark_codes[runemark_index],
+            runemark_offsets=runemark_offsets,
+            runemark_categories=self.runemark_categories,
+            weapon_stats={k: v[weapon_index] for k, v in self.weapon_stats.items()},
+            weapon_runemark_codes=self.weapon_runemark_codes[weapon_index],
+            weapon_runemark_categories=self.weapon_runemark_categories,
+            weapon_offsets=weapon_offsets,
+        )
+
+    def runemarks(self, row: int) -> List[str]:
+        """Decode the runemarks of a single row."""
+        start, end = self.runemark_offsets[row], self.runemark_offsets[row + 1]
+        return [self.runemark_categories[c] for c in self.runemark_codes[start:end]]
+
+    # DataFrame conversion
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return one row per fighter, backed by the table's arrays without copying.
+
+        Categorical columns are built from the existing codes. Ragged columns are
+        not included, see ``weapons_to_dataframe``.
+        """
+        columns = {'_id': self.ids, 'name': self.names}
+        for col in CATEGORICAL_COLUMNS:
+            columns[col] = pd.Categorical.from_codes(self.codes[col], categories=self.categories[col])
+        columns.update(self.stats)
+        return pd.DataFrame(columns, copy=False)
+
+    def weapons_to_dataframe(self) -> pd.DataFrame:
+        """Return one row per weapon with the owning fighter's row index in ``fighter``."""
+        fighter_rows = np.repeat(np.arange(len(self), dtype=np.int64), np.diff(self.weapon_offsets))
+        columns = {
+            'fighter': fighter_rows,
+            'runemark': pd.Categorical.from_codes(
+                self.weapon_runemark_codes, categories=self.weapon_runemark_categories
+            ),
+        }
+        columns.update(self.weapon_stats)
+        return pd.DataFrame(columns, copy=False)
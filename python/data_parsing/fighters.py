@@ -1,19 +1,25 @@
+import functools
 import json
+import sys
 from copy import deepcopy
 from dataclasses import dataclass
 from itertools import combinations_with_replacement
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 
-import jsonschema
 import pandas as pd
 
+from . import schema_registry
 from .abilities import Ability
 from .factions import Faction, SubFaction
-from .models import JSONDataPayload, PROJECT_ROOT, write_data_json
+from .models import JSONDataPayload, PROJECT_ROOT, content_fingerprint, write_data_json
 
 FIGHTER_SCHEMA = PROJECT_ROOT / 'schemas' / 'fighter_schema.json'
 FIGHTERS_SCHEMA = PROJECT_ROOT / 'schemas' / 'aggregate_fighter_schema.json'
+WEAPON_KEYS = ('attacks', 'dmg_crit', 'dmg_hit', 'max_range', 'min_range', 'runemark', 'strength')
+# Most distinct weapon profiles shared at once; the least recently used are dropped beyond this,
+# so memory stays bounded however many warbands a process models
+WEAPON_PROFILE_CACHE_SIZE = 2048
 
 def sort_fighters(data_to_sort: List[Dict]) -> List[Dict]:
     for f in data_to_sort:
@@ -31,39 +37,74 @@ def sort_fighters(data_to_sort: List[Dict]) -> List[Dict]:
     return sorted_data
 
 
+def fighters_frame(fighters: List[Dict]) -> pd.DataFrame:
+    """One row per fighter, with the weapons flattened into ``weapon_<n>_<key>`` columns.
+
+    The fighter dicts are not modified or copied; rows are built from their values directly.
+    """
+    rows = []
+    for fighter in fighters:
+        row = {k: v for k, v in fighter.items() if k != 'weapons'}
+        for i, w in enumerate(fighter['weapons']):
+            for k, v in w.items():
+                row[f'weapon_{i + 1}_{k}'] = v
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
 class Weapon:
+    __slots__ = (
+        'attacks',
+        'dmg_crit',
+        'dmg_hit',
+        'max_range',
+        'min_range',
+        'runemark',
+        'strength',
+        'avg_dmg_vs_lower',
+        'avg_dmg_vs_same',
+        'avg_dmg_vs_higher',
+    )
+
     def __init__(self, w_dict: dict):
-        self._raw_data: Dict = w_dict
         self.attacks: int = w_dict['attacks']
         self.dmg_crit: int = w_dict['dmg_crit']
         self.dmg_hit: int = w_dict['dmg_hit']
         self.max_range: int = w_dict['max_range']
         self.min_range: int = w_dict['min_range']
-        self.runemark: str = w_dict['runemark']
+        self.runemark: str = sys.intern(w_dict['runemark'])
         self.strength: int = w_dict['strength']
-        self._dmg_rolls: List[Tuple[int, ...]] = self.damage_rolls()
         self.avg_dmg_vs_lower: float
         self.avg_dmg_vs_same: float
         self.avg_dmg_vs_higher: float
         self.avg_dmg_vs_lower, self.avg_dmg_vs_same, self.avg_dmg_vs_higher = self.avg_dmgs()
 
+    @classmethod
+    def from_dict(cls, w_dict: dict) -> 'Weapon':
+        """Return the shared Weapon for this profile, creating it on first use.
+
+        Weapons are treated as immutable, so fighters with identical weapon profiles share one instance.
+        """
+        return shared_weapon(tuple(w_dict[k] for k in WEAPON_KEYS))
+
     def __repr__(self):
         return f'{self.runemark.capitalize()}  -  {self.attacks}/{self.strength}/{self.dmg_hit}/{self.dmg_crit}'
 
     def as_dict(self):
-        return self._raw_data
+        return {k: getattr(self, k) for k in WEAPON_KEYS}
 
     def damage_rolls(self) -> List[Tuple[int, ...]]:
         rolls = [x for x in combinations_with_replacement(range(1, 7), self.attacks)]
         return rolls
 
     def avg_dmgs(self) -> float:
+        dmg_rolls = self.damage_rolls()
         for i in [3, 4, 5]:
             to_hit = i
             total_rolls = 0
             damages = list()
 
-            for pr in self._dmg_rolls:
+            for pr in dmg_rolls:
                 total_rolls = total_rolls + 1
                 damage = 0
                 for dice in pr:
@@ -110,6 +151,12 @@ class Weapon:
         return dmg_chance
 
 
+@functools.lru_cache(maxsize=WEAPON_PROFILE_CACHE_SIZE)
+def shared_weapon(profile: Tuple) -> Weapon:
+    """The shared Weapon for a profile, given as its ``WEAPON_KEYS`` values."""
+    return Weapon(dict(zip(WEAPON_KEYS, profile)))
+
+
 @dataclass
 class FighterProfile:
     _id: str
@@ -129,22 +176,44 @@ class FighterProfile:
 
 
 class Fighter:
+    __slots__ = (
+        '_id',
+        'name',
+        'warband',
+        'subfaction',
+        'grand_alliance',
+        'movement',
+        'toughness',
+        'wounds',
+        'weapons',
+        'runemarks',
+        'points',
+        '_raw_data',
+        'abilities',
+        'faction',
+        'fingerprint',
+    )
+
     def __init__(self, profile: dict):
+        # Repeated strings are interned on the fighter only; the profile may be shared, e.g. by overlay layers,
+        # and is never modified
         self._id: str = profile['_id']
         self.name: str = profile['name']
-        self.warband: str = profile['warband']
+        self.warband: str = sys.intern(profile['warband'])
         self.subfaction: Optional['SubFaction'] = None
-        self.grand_alliance: str = profile['grand_alliance']
+        self.grand_alliance: str = sys.intern(profile['grand_alliance'])
         self.movement: int = profile['movement']
         self.toughness: int = profile['toughness']
         self.wounds: int = profile['wounds']
-        self.weapons: List[Weapon] = [Weapon(x) for x in profile['weapons']]
-        self.runemarks: List[str] = profile['runemarks']
+        self.weapons: List[Weapon] = [Weapon.from_dict(x) for x in profile['weapons']]
+        self.runemarks: List[str] = [sys.intern(x) for x in profile['runemarks']]
         self.points: int = profile['points']
 
+        # A reference to the source profile (not a copy), kept so as_dict preserves the source key order
         self._raw_data: dict = profile
         self.abilities: List['Ability'] = []
         self.faction: Optional['Faction'] = None
+        self.fingerprint: str = content_fingerprint(profile)
 
     def __repr__(self):
         return self.name
@@ -238,8 +307,8 @@ class Fighter:
 
 
 class Fighters:
-    def __init__(self, fighters: List[Dict]):
-        self.fighters = [Fighter(x) for x in fighters]
+    def __init__(self, fighters: List[Union[Fighter, Dict]]):
+        self.fighters = [x if isinstance(x, Fighter) else Fighter(x) for x in fighters]
         self.max_values, self.min_values = self._get_extreme_values()
 
     def _get_extreme_values(self) -> Tuple[Dict[str, int], Dict[str, int]]:
@@ -330,20 +399,10 @@ class FighterJSONDataPayload(JSONDataPayload):
             json.dump(sort_fighters(sorted_data), nf, ensure_ascii=False, indent=4, sort_keys=False)
 
     def validate_data(self):
-        with open(self.schema, 'r') as f:
-            aggregate_schema = json.load(f)
-        jsonschema.validate(self.data, aggregate_schema)
+        schema_registry.validate(self.data, self.schema)
 
     def as_dataframe(self, add_formulae: bool = False) -> pd.DataFrame:
-        temp_data = deepcopy(self.data)
-        for fighter in temp_data:
-            # The fighters need to be flattened for their weapon values to fit into rows/columns
-            for i, w in enumerate(fighter['weapons']):
-                for k, v in w.items():
-                    fighter[f'weapon_{i + 1}_{k}'] = v
-            del fighter['weapons']
-
-        return pd.DataFrame(temp_data)
+        return fighters_frame(self.data)
 
     def write_legacy_format(self, dst_root: Path = Path(PROJECT_ROOT, 'data')):
         out_file = dst_root / 'fighters_legacy.json'
@@ -0,0 +1,96 @@
+"""
+Content fingerprints for Warcry data and their roll-ups.
+
+Every fighter, ability and faction carries a fingerprint of its source content
+(``models.content_fingerprint``). This module rolls those up per warband, per
+grand alliance and for the whole dataset, so caches can tell exactly what
+changed between runs without hashing everything again.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Dict, Iterable, List, Tuple
+
+from .abilities import Ability
+from .constants import SpecialWarbands
+from .factions import Factions
+from .fighters import Fighters
+
+
+def rollup(entries: Iterable[Tuple[str, str, str]]) -> str:
+    """Combine (kind, key, fingerprint) entries into one order-independent fingerprint."""
+    digest = hashlib.sha256()
+    for kind, key, fingerprint in sorted(entries):
+        digest.update(f'{kind}\0{key}\0{fingerprint}\n'.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+class DatasetFingerprints:
+    """Fingerprints of every entity plus roll-ups per warband and grand alliance.
+
+    Entity keys are ``<kind>:<_id>`` for fighters and abilities and ``faction:<warband>``
+    for factions. Abilities of a subfaction count towards the warband that owns it, and
+    universal abilities towards ``universal``.
+    """
+
+    def __init__(self, entities: Dict[str, str], warbands: Dict[str, str], grand_alliances: Dict[str, str]):
+        self.entities = entities
+        self.warbands = warbands
+        self.grand_alliances = grand_alliances
+        self.dataset = rollup(tuple(key.split(':', 1)) + (fp,) for key, fp in entities.items())
+
+    @classmethod
+    def from_models(cls, fighters: Fighters, abilities: List[Ability], factions: Factions) -> 'DatasetFingerprints':
+        owner = {SpecialWarbands.UNIVERSAL: SpecialWarbands.UNIVERSAL}
+        for warband, subfactions in factions.subfactions_by_runemark.items():
+            owner.update({runemark: warband for runemark in subfactions})
+            owner[warband] = warband
+        grand_alliance_of = {f.warband: f.grand_alliance for f in factions.factions}
+        grand_alliance_of[SpecialWarbands.UNIVERSAL] = SpecialWarbands.UNIVERSAL
+
+        entities: Dict[str, str] = {}
+        by_warband: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+        by_grand_alliance: Dict[str, List[Tuple[str, str, str]]] = defaultdict(list)
+
+        def add(kind: str, key: str, fingerprint: str, warband: str, grand_alliance: str) -> None:
+            entry = (kind, key, fingerprint)
+            entities[f'{kind}:{key}'] = fingerprint
+            by_warband[warband].append(entry)
+            by_grand_alliance[grand_alliance].append(entry)
+
+        for fighter in fighters.fighters:
+            add('fighter', fighter._id, fighter.fingerprint, fighter.warband, fighter.grand_alliance)
+        for faction in factions.factions:
+            add('faction', faction.warband, faction.fingerprint, faction.warband, faction.grand_alliance)
+        for ability in abilities:
+            warband = owner.get(ability.warband, ability.warband)
+            add('ability', ability._id, ability.fingerprint, warband, grand_alliance_of.get(warband, ''))
+
+        return cls(
+            entities=entities,
+            warbands={w: rollup(entries) for w, entries in by_warband.items()},
+            grand_alliances={ga: rollup(entries) for ga, entries in by_grand_alliance.items()},
+        )
+
+    def as_dict(self) -> Dict[str, Dict[str, str]]:
+        """JSON-serialisable form, e.g. to store alongside a cache and pass to ``changed_since`` later."""
+        return {'entities': self.entities, 'warbands': self.warbands, 'grand_alliances': self.grand_alliances}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Dict[str, str]]) -> 'DatasetFingerprints':
+        return cls(data['entities'], data['warbands'], data['grand_alliances'])
+
+    def changed_since(self, previous: 'DatasetFingerprints') -> Dict[str, List[str]]:
+        """Entity keys, warbands and grand alliances that were added, removed or changed.
+
+        Returns:
+            ``{'entities': [...], 'warbands': [...], 'grand_alliances': [...]}``, each sorted
+        """
+        def diff(current: Dict[str, str], old: Dict[str, str]) -> List[str]:
+            return sorted(k for k in current.keys() | old.keys() if current.get(k) != old.get(k))
+
+        return {
+            'entities': diff(self.entities, previous.entities),
+            'warbands': diff(self.warbands, previous.warbands),
+            'grand_alliances': diff(self.grand_alliances, previous.grand_alliances),
+        }
@@ -0,0 +1,196 @@
+"""
+Canonical formatting of the source data files.
+
+The canonical form of a data file is UTF-8 text in the ``write_data_json``
+layout, with entity keys in ``SourceKeys`` order and fighters (and their
+weapons) ordered by ``sort_fighters``. Formatting is idempotent, so a file's
+content hash tells whether it is already canonical: hashes of canonical files
+are cached, and those files are skipped without being parsed on later runs.
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from .constants import DataTypes, SourceKeys
+from .data_loading import DATA_TYPE_SUFFIXES, WarbandDataLoader
+from .models import PROJECT_DATA, PROJECT_ROOT, FileLoadingError, content_fingerprint, data_json_text, load_json_bytes
+from .partitions import file_hash
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+CACHE_PATH = PROJECT_ROOT / '.cache' / 'format' / 'canonical.json'
+# Cached hashes are only trusted for the same formatter version and key order
+CACHE_KEY = content_fingerprint([
+    FORMAT_VERSION, SourceKeys.FIGHTER, SourceKeys.WEAPON, SourceKeys.ABILITY, SourceKeys.FACTION,
+    SourceKeys.SUBFACTION,
+])
+
+
+def ordered(entity: Any, keys: Sequence[str]) -> Any:
+    """A copy of a dict with ``keys`` first, in that order, then any other keys in their original order."""
+    if not isinstance(entity, dict):
+        return entity
+    first = {k: entity[k] for k in keys if k in entity}
+    return {**first, **{k: v for k, v in entity.items() if k not in first}}
+
+
+def canonical_fighters(fighters: Any) -> Any:
+    from .fighters import sort_fighters
+
+    fighters = [ordered(f, SourceKeys.FIGHTER) for f in fighters]
+    fighters = sort_fighters(fighters)
+    for f in fighters:
+        f['weapons'] = [ordered(w, SourceKeys.WEAPON) for w in f['weapons']]
+    return fighters
+
+
+def canonical_faction(faction: Any) -> Any:
+    faction = ordered(faction, SourceKeys.FACTION)
+    if isinstance(faction, dict) and isinstance(faction.get('subfactions'), list):
+        faction['subfactions'] = [ordered(s, SourceKeys.SUBFACTION) for s in faction['subfactions']]
+    return faction
+
+
+def canonical_content(datatype: Optional[str], content: Any) -> Any:
+    """Content of a data file in canonical order.
+
+    Raises:
+        KeyError, TypeError: Fighters that ``sort_fighters`` cannot order, e.g. with missing fields
+    """
+    if datatype == DataTypes.FIGHTERS and isinstance(content, list):
+        return canonical_fighters(content)
+    if datatype == DataTypes.ABILITIES and isinstance(content, list):
+        return [ordered(a, SourceKeys.ABILITY) for a in content]
+    if datatype == DataTypes.FACTIONS:
+        return canonical_faction(content)
+    return content
+
+
+def datatype_of(file: Path) -> Optional[str]:
+    return next((datatype for datatype, suffix in DATA_TYPE_SUFFIXES.items() if file.name.endswith(suffix)), None)
+
+
+class FormatResult(NamedTuple):
+    """Outcome of formatting one file.
+
+    Attributes:
+        file: The data file
+        changed: Whether the file was not in canonical form (and, unless checking, was rewritten)
+        canonical_hash: Hash of the file's canonical content, None if it could not be formatted
+        error: Why the file could not be formatted
+    """
+    file: Path
+    changed: bool
+    canonical_hash: Optional[str] = None
+    error: Optional[str] = None
+
+
+def format_file(file: Path, write: bool = True) -> FormatResult:
+    """Bring one data file into canonical form.
+
+    Args:
+        file: The data file
+        write: Rewrite the file if it is not canonical; False only reports whether it would be
+    """
+    try:
+        raw = file.read_bytes()
+        content = load_json_bytes(raw, file)
+    except (OSError, FileLoadingError) as e:
+        return FormatResult(file, False, error=str(e))
+    try:
+        content = canonical_content(datatype_of(file), content)
+    except (KeyError, TypeError) as e:
+        return FormatResult(file, False, error=f'cannot order entities, fix the schema errors first ({e!r})')
+
+    canonical = data_json_text(content).encode('utf-8')
+    if canonical == raw:
+        return FormatResult(file, False, file_hash(raw))
+    if write:
+        tmp = file.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_bytes(canonical)
+        os.replace(tmp, file)
+    return FormatResult(file, True, file_hash(canonical))
+
+
+def format_file_check(file: Path) -> FormatResult:
+    return format_file(file, write=False)
+
+
+class CanonicalHashes:
+    """Content hashes of data files known to be in canonical form.
+
+    Args:
+        path: Cache file
+    """
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self.hashes: set = set()
+        try:
+            cached = json.loads(path.read_text(encoding='utf-8'))
+            if cached.get('key') == CACHE_KEY:
+                self.hashes = set(cached['hashes'])
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def save(self, hashes: Iterable[str]) -> None:
+        """Replace the cache with ``hashes``, those of the files as they are now."""
+        self.hashes = set(hashes)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps({'key': CACHE_KEY, 'hashes': sorted(self.hashes)}), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+class DataFormatter:
+    """Formats the source data files across a process pool.
+
+    Files whose content hash is cached as canonical are skipped; the rest are
+    formatted one task per file. Results come back in the order the files were given.
+
+    Args:
+        data_root: Data folder
+        max_workers: Worker processes, defaults to the CPU count; 1 formats in this process
+        check: Only report files that are not canonical, without writing them
+        hashes: Canonical hash cache, defaults to the shared one
+    """
+
+    def __init__(self, data_root: Path = PROJECT_DATA, max_workers: Optional[int] = None, check: bool = False,
+                 hashes: Optional[CanonicalHashes] = None):
+        self.data_root = data_root
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.check = check
+        self.hashes = hashes or CanonicalHashes()
+
+    def run(self, files: Optional[Iterable[Path]] = None) -> List[FormatResult]:
+        """Format ``files``, or every data file, returning the results for the files that were not skipped."""
+        files = list(files if files is not None else WarbandDataLoader(self.data_root).iter_data_files())
+        current: Dict[Path, str] = {}
+        for file in files:
+            try:
+                current[file] = file_hash(file.read_bytes())
+            except OSError:
+                pass  # Reported by format_file
+        pending = [f for f in files if current.get(f) not in self.hashes.hashes]
+
+        task = format_file_check if self.check else format_file
+        workers = min(self.max_workers, len(pending))
+        if workers <= 1:
+            results = list(map(task, pending))
+        else:
+            chunksize = max(1, len(pending) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(task, pending, chunksize=chunksize))
+        logger.info(f"{len(files) - len(pending)} of {len(files)} files already canonical, "
+                    f"{len(pending)} checked across {max(workers, 1)} processes")
+
+        # Cache the files that are canonical now; in check mode, unformatted files are left as they were
+        canonical = {h for h in current.values() if h in self.hashes.hashes}
+        canonical.update(r.canonical_hash for r in results if r.canonical_hash and not (self.check and r.changed))
+        self.hashes.save(canonical)
+        return results
@@ -0,0 +1,272 @@
+"""
+Immutable, read-only views of the processed Warcry dataset.
+
+``FrozenDataset`` holds frozen copies of every fighter, ability and faction
+with their assignments resolved, so it can be shared between threads without
+locks. ``LiveDataset`` rebuilds one from a pipeline and publishes it with a
+single reference assignment: readers take ``live.current`` once per request and
+always see one consistent dataset, and superseded datasets are freed when the
+last reader drops its reference.
+"""
+
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Dict, Mapping, Optional, Tuple
+
+import jsonschema
+
+from .abilities import Ability
+from .factions import Faction, SubFaction
+from .fighters import Fighter, Weapon
+from .indexing import FighterIndex, FighterQuery
+
+if TYPE_CHECKING:
+    from .warband_pipeline import WarbandDataPipeline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FrozenAbility:
+    _id: str
+    name: str
+    warband: str
+    cost: str
+    description: str
+    runemarks: Tuple[str, ...]
+    fingerprint: str
+
+    @classmethod
+    def from_ability(cls, ability: Ability) -> 'FrozenAbility':
+        return cls(
+            ability._id, ability.name, ability.warband, ability.cost, ability.description,
+            tuple(ability.runemarks), ability.fingerprint
+        )
+
+
+@dataclass(frozen=True)
+class FrozenSubFaction:
+    runemark: str
+    bladeborn: bool
+    heroes_all: bool
+    singleton: bool
+
+    @classmethod
+    def from_subfaction(cls, subfaction: SubFaction) -> 'FrozenSubFaction':
+        return cls(subfaction.runemark, subfaction.bladeborn, subfaction.heroes_all, subfaction.singleton)
+
+
+@dataclass(frozen=True)
+class FrozenFaction:
+    grand_alliance: str
+    warband: str
+    bladeborn: bool
+    heroes_all: bool
+    singleton: bool
+    subfactions: Tuple[FrozenSubFaction, ...]
+    fingerprint: Optional[str]
+
+    @classmethod
+    def from_faction(cls, faction: Faction) -> 'FrozenFaction':
+        subfactions = tuple(sorted(
+            (FrozenSubFaction.from_subfaction(s) for s in faction.subfactions), key=lambda s: s.runemark
+        ))
+        return cls(
+            faction.grand_alliance, faction.warband, faction.bladeborn, faction.heroes_all, faction.singleton,
+            subfactions, faction.fingerprint
+        )
+
+
+@dataclass(frozen=True)
+class FrozenWeapon:
+    attacks: int
+    dmg_crit: int
+    dmg_hit: int
+    max_range: int
+    min_range: int
+    runemark: str
+    strength: int
+    avg_dmg_vs_lower: float
+    avg_dmg_vs_same: float
+    avg_dmg_vs_higher: float
+
+    @classmethod
+    def from_weapon(cls, weapon: Weapon) -> 'FrozenWeapon':
+        return cls(
+            weapon.attacks, weapon.dmg_crit, weapon.dmg_hit, weapon.max_range, weapon.min_range, weapon.runemark,
+            weapon.strength, weapon.avg_dmg_vs_lower, weapon.avg_dmg_vs_same, weapon.avg_dmg_vs_higher
+        )
+
+
+@dataclass(frozen=True)
+class FrozenFighter:
+    """A fighter with its faction, subfaction and abilities resolved."""
+    _id: str
+    name: str
+    warband: str
+    grand_alliance: str
+    movement: int
+    toughness: int
+    wounds: int
+    points: int
+    runemarks: Tuple[str, ...]
+    weapons: Tuple[FrozenWeapon, ...]
+    faction: Optional[FrozenFaction]
+    subfaction: Optional[FrozenSubFaction]
+    abilities: Tuple[FrozenAbility, ...]
+    fingerprint: str
+
+    def subfaction_runemark(self) -> Optional[str]:
+        return self.subfaction.runemark if self.subfaction else None
+
+
+@dataclass(frozen=True, eq=False, repr=False)
+class FrozenDataset:
+    """A consistent, read-only view of the processed data.
+
+    All collections are tuples or read-only mappings, and no attribute can be
+    reassigned. The object is fully built before it is published.
+
+    Attributes:
+        version: Increasing number assigned by ``LiveDataset``
+        fingerprint: Dataset roll-up fingerprint, see ``fingerprints``
+    """
+    fighters: Tuple[FrozenFighter, ...]
+    abilities: Tuple[FrozenAbility, ...]
+    factions: Tuple[FrozenFaction, ...]
+    fingerprint: str
+    version: int = 0
+    created: str = field(default_factory=lambda: datetime.now().isoformat())
+    abilities_by_id: Mapping[str, FrozenAbility] = field(init=False)
+    factions_by_warband: Mapping[str, FrozenFaction] = field(init=False)
+    _fighter_index: FighterIndex = field(init=False)
+
+    def __post_init__(self):
+        # The only writes, made while the dataset is built and before anyone can read it
+        object.__setattr__(self, 'abilities_by_id', MappingProxyType({a._id: a for a in self.abilities}))
+        object.__setattr__(self, 'factions_by_warband', MappingProxyType({f.warband: f for f in self.factions}))
+        object.__setattr__(self, '_fighter_index', FighterIndex(list(self.fighters)))
+
+    def __repr__(self):
+        return f'FrozenDataset(version={self.version}, fighters={len(self.fighters)}, abilities={len(self.abilities)})'
+
+    @classmethod
+    def from_pipeline(cls, pipeline: 'WarbandDataPipeline', version: int = 0) -> 'FrozenDataset':
+        """Copy the processed data of a pipeline into frozen objects.
+
+        Raises:
+            jsonschema.ValidationError: The pipeline's data is invalid
+        """
+        pipeline.stage_validate()
+        pipeline.stage_process()
+        frozen_abilities: Dict[int, FrozenAbility] = {id(a): FrozenAbility.from_ability(a) for a in pipeline.abilities}
+        frozen_factions: Dict[str, FrozenFaction] = {
+            f.warband: FrozenFaction.from_faction(f) for f in pipeline.factions.factions
+        }
+        # Fighters share Weapon flyweights, so their frozen copies are shared the same way
+        frozen_weapons: Dict[int, FrozenWeapon] = {}
+
+        def freeze_weapon(weapon: Weapon) -> FrozenWeapon:
+            frozen = frozen_weapons.get(id(weapon))
+            if frozen is None:
+                frozen = frozen_weapons[id(weapon)] = FrozenWeapon.from_weapon(weapon)
+            return frozen
+
+        def freeze_fighter(fighter: Fighter) -> FrozenFighter:
+            faction = frozen_factions.get(fighter.faction.warband) if fighter.faction else None
+            subfaction = None
+            if faction and fighter.subfaction:
+                subfaction = next((s for s in faction.subfactions if s.runemark == fighter.subfaction.runemark), None)
+            return FrozenFighter(
+                fighter._id, fighter.name, fighter.warband, fighter.grand_alliance, fighter.movement,
+                fighter.toughness, fighter.wounds, fighter.points, tuple(fighter.runemarks),
+                tuple(freeze_weapon(w) for w in fighter.weapons),
+                faction, subfaction,
+                tuple(frozen_abilities[id(a)] for a in fighter.abilities),
+                fighter.fingerprint
+            )
+
+        return cls(
+            fighters=tuple(freeze_fighter(f) for f in pipeline.fighters.fighters),
+            abilities=tuple(frozen_abilities.values()),
+            factions=tuple(frozen_factions.values()),
+            fingerprint=pipeline.fingerprints.dataset,
+            version=version
+        )
+
+    def get_fighter(self, _id: str) -> Optional[FrozenFighter]:
+        position = self._fighter_index.by_id.get(_id)
+        return None if position is None else self.fighters[position]
+
+    def get_ability(self, _id: str) -> Optional[FrozenAbility]:
+        return self.abilities_by_id.get(_id)
+
+    def get_faction(self, warband: str) -> Optional[FrozenFaction]:
+        return self.factions_by_warband.get(warband)
+
+    def query_fighters(self) -> FighterQuery:
+        """Start an indexed fighter query over this dataset, see ``indexing.FighterQuery``."""
+        return FighterQuery(self._fighter_index)
+
+
+class LiveDataset:
+    """Publishes frozen datasets built from a pipeline for concurrent readers.
+
+    Reloads are serialised and run entirely off to the side; the new dataset becomes
+    visible through one reference assignment, which is atomic in CPython. Readers need
+    no locks, but should read ``current`` once and use that dataset for a whole request.
+
+    Example:
+        live = LiveDataset(WarbandDataPipeline())
+        dataset = live.current          # in a request thread
+        live.reload_in_background()     # after a data commit
+    """
+
+    def __init__(self, pipeline: 'WarbandDataPipeline'):
+        self.pipeline = pipeline
+        self._current: Optional[FrozenDataset] = None
+        self._reload_lock = threading.Lock()
+        self._versions = itertools.count(1)
+
+    @property
+    def current(self) -> FrozenDataset:
+        """The latest published dataset, building the first one if needed."""
+        current = self._current
+        return current if current is not None else self.reload()
+
+    def reload(self) -> FrozenDataset:
+        """Bring the pipeline up to date, then build and publish a new dataset if the data changed.
+
+        If the new data fails validation, the error is logged and the current dataset stays
+        published; readers never see invalid data.
+
+        Raises:
+            jsonschema.ValidationError: The data is invalid and no dataset has been published yet
+        """
+        with self._reload_lock:
+            current = self._current
+            try:
+                if current is not None:
+                    self.pipeline.refresh()
+                    if self.pipeline.fingerprints.dataset == current.fingerprint:
+                        logger.info(f"Data unchanged, keeping dataset version {current.version}")
+                        return current
+                dataset = FrozenDataset.from_pipeline(self.pipeline, version=next(self._versions))
+            except jsonschema.ValidationError as e:
+                if current is None:
+                    raise
+                logger.error(f"Reload failed validation, keeping dataset version {current.version}: {e.message}")
+                return current
+            self._current = dataset
+            logger.info(f"Published {dataset!r}")
+            return dataset
+
+    def reload_in_background(self) -> threading.Thread:
+        """Run ``reload`` in a daemon thread; readers keep the current dataset until it finishes."""
+        thread = threading.Thread(target=self.reload, name='warcry-dataset-reload', daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,242 @@
+"""
+Validation of only the data files changed in a git revision range.
+
+Changed fighters, abilities and faction files are validated in full. The checks
+that span files are run against an index of the IDs in every unchanged data
+file: duplicate ``_id`` values, and localisation entries for abilities that do
+not exist. The index is cached by git blob hash, so unchanged files are not
+opened again on later runs. Only the local repository is used.
+"""
+
+import json
+import logging
+import os
+import re
+import subprocess
+from collections import defaultdict
+from pathlib import Path, PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .constants import DataTypes, IdPatterns
+from .data_loading import DATA_TYPE_SUFFIXES
+from .models import LOCALISATION_DATA, PROJECT_DATA, PROJECT_ROOT, FileLoadingError, load_json_file
+from .validation_system import ValidationResult, entity_label, schema_for_file, validate_file
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+INDEX_PATH = PROJECT_ROOT / '.cache' / 'validation' / 'id-index.json'
+# Entity types whose _id must be unique across all files
+UNIQUE_ID_TYPES = (DataTypes.FIGHTERS, DataTypes.ABILITIES)
+PLACEHOLDER_ID = re.compile(IdPatterns.PLACEHOLDER, flags=re.IGNORECASE)
+
+
+class GitError(Exception):
+    """Raised when git is not available or a revision cannot be resolved."""
+    pass
+
+
+def run_git(repo: Path, *args: str) -> str:
+    try:
+        completed = subprocess.run(['git', *args], cwd=repo, capture_output=True, text=True, check=True)
+    except FileNotFoundError as e:
+        raise GitError('git is not installed') from e
+    except subprocess.CalledProcessError as e:
+        raise GitError(f"git {' '.join(args)} failed: {e.stderr.strip()}") from e
+    return completed.stdout
+
+
+def changed_files(repo: Path, revisions: str, paths: Iterable[str]) -> List[str]:
+    """Repository-relative paths of files added, changed or removed.
+
+    Args:
+        repo: Repository root
+        revisions: A range such as ``origin/main...HEAD``, or a single revision to
+            compare the working tree (including untracked files) against
+        paths: Repository-relative folders to look in
+    """
+    paths = list(paths)
+    files = run_git(repo, 'diff', '--name-only', '--no-renames', '-z', revisions, '--', *paths).split('\0')
+    if '..' not in revisions:
+        files += run_git(repo, 'ls-files', '--others', '--exclude-standard', '-z', '--', *paths).split('\0')
+    return sorted(f for f in set(files) if f)
+
+
+def tracked_blobs(repo: Path, paths: Iterable[str]) -> Dict[str, str]:
+    """Repository-relative path -> blob hash of every file under ``paths`` in the git index."""
+    blobs = {}
+    for line in run_git(repo, 'ls-files', '--stage', '-z', '--', *paths).split('\0'):
+        if line:
+            # <mode> <blob> <stage>\t<path>
+            info, path = line.split('\t', 1)
+            blobs[path] = info.split()[1]
+    return blobs
+
+
+def datatype_of(file_name: str) -> Optional[str]:
+    return next((datatype for datatype, suffix in DATA_TYPE_SUFFIXES.items() if file_name.endswith(suffix)), None)
+
+
+def entity_ids(content: Any) -> List[str]:
+    """Assigned ``_id`` values in a fighters or abilities file; placeholders get unique IDs on load."""
+    if not isinstance(content, list):
+        return []
+    return [
+        e['_id'] for e in content
+        if isinstance(e, dict) and isinstance(e.get('_id'), str) and not PLACEHOLDER_ID.match(e['_id'])
+    ]
+
+
+class IdIndex:
+    """Entity IDs per data file, cached by git blob hash.
+
+    Args:
+        path: Cache file
+    """
+
+    def __init__(self, path: Path = INDEX_PATH):
+        self.path = path
+        self.blobs: Dict[str, List[str]] = {}
+        self.used: set = set()
+        self.read = 0
+        try:
+            cached = json.loads(path.read_text(encoding='utf-8'))
+            if cached.get('version') == INDEX_VERSION:
+                self.blobs = cached['blobs']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    def ids(self, file: Path, blob: str) -> List[str]:
+        """IDs in a file, read from the cache or, on a miss, from the file itself."""
+        self.used.add(blob)
+        if blob not in self.blobs:
+            self.blobs[blob] = entity_ids(load_json_file(file))
+            self.read += 1
+        return self.blobs[blob]
+
+    def save(self) -> None:
+        """Write the entries used in this run, dropping those of files that no longer exist."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(f'.{os.getpid()}.tmp')
+        blobs = {blob: ids for blob, ids in self.blobs.items() if blob in self.used}
+        tmp.write_text(json.dumps({'version': INDEX_VERSION, 'blobs': blobs}), encoding='utf-8')
+        os.replace(tmp, self.path)
+
+
+class IncrementalValidator:
+    """Validates the data and localisation files changed in a git revision range.
+
+    Changed files are read from the working tree, which should be checked out at the
+    end of the range.
+
+    Args:
+        revisions: Revision range, or a single revision to compare the working tree against
+        data_root: Data folder, inside the git repository
+        localisation_root: Localisation folder, inside the git repository
+        index: ID index of unchanged files, defaults to the shared cache
+    """
+
+    def __init__(self, revisions: str, data_root: Path = PROJECT_DATA,
+                 localisation_root: Path = LOCALISATION_DATA, index: Optional[IdIndex] = None):
+        self.revisions = revisions
+        self.data_root = data_root.resolve()
+        self.localisation_root = localisation_root.resolve()
+        self.index = index or IdIndex()
+
+    def run(self) -> ValidationResult:
+        repo = Path(run_git(self.data_root, 'rev-parse', '--show-toplevel').strip()).resolve()
+        data_folder = self.data_root.relative_to(repo).as_posix()
+        localisation_folder = self.localisation_root.relative_to(repo).as_posix()
+
+        changed = changed_files(repo, self.revisions, [data_folder, localisation_folder])
+        changed_data = [f for f in changed if PurePosixPath(f).is_relative_to(data_folder)]
+        changed_localisation = [
+            f for f in changed
+            if PurePosixPath(f).is_relative_to(localisation_folder) and f.endswith('.json') and (repo / f).is_file()
+        ]
+        to_validate = [f for f in changed_data if schema_for_file(Path(f)) and (repo / f).is_file()]
+        logger.info(f"{len(changed)} files changed in {self.revisions}: validating {len(to_validate)} data files")
+
+        result = ValidationResult(is_valid=True, data_path=self.data_root)
+        # datatype -> _id -> [(source, index, entity label)] for the changed files
+        changed_ids: Dict[str, Dict[str, List[Tuple[str, int, str]]]] = defaultdict(lambda: defaultdict(list))
+        for file in to_validate:
+            source = PurePosixPath(file).relative_to(data_folder).as_posix()
+            result.merge(validate_file(repo / file, source))
+            datatype = datatype_of(file)
+            if datatype in UNIQUE_ID_TYPES:
+                try:
+                    content = load_json_file(repo / file)
+                except FileLoadingError:
+                    continue  # Already reported by validate_file
+                valid_ids = set(entity_ids(content))
+                for index, entity in enumerate(content if isinstance(content, list) else []):
+                    if isinstance(entity, dict) and entity.get('_id') in valid_ids:
+                        changed_ids[datatype][entity['_id']].append((source, index, entity_label(entity)))
+
+        unchanged_ids = self.unchanged_ids(repo, data_folder, set(changed_data))
+        self.check_duplicates(result, changed_ids, unchanged_ids)
+
+        # Removing an ability can orphan a translation, so any ability change rechecks every localisation file
+        if any(datatype_of(f) == DataTypes.ABILITIES for f in changed_data):
+            changed_localisation = sorted(
+                PurePosixPath(localisation_folder, p.name).as_posix() for p in self.localisation_root.glob('*.json')
+            )
+        ability_ids = set(changed_ids[DataTypes.ABILITIES]).union(*(
+            ids for ids in unchanged_ids[DataTypes.ABILITIES].values()
+        ))
+        for file in changed_localisation:
+            self.check_localisation(result, repo / file, file, ability_ids)
+
+        self.index.save()
+        logger.info(f"{result.summary()} ({self.index.read} unchanged files read, rest from the ID index)")
+        return result
+
+    def unchanged_ids(self, repo: Path, data_folder: str, changed: set) -> Dict[str, Dict[str, List[str]]]:
+        """datatype -> source -> IDs of every tracked data file not in ``changed``."""
+        ids: Dict[str, Dict[str, List[str]]] = defaultdict(dict)
+        for file, blob in tracked_blobs(repo, [data_folder]).items():
+            datatype = datatype_of(file)
+            if datatype in UNIQUE_ID_TYPES and file not in changed:
+                source = PurePosixPath(file).relative_to(data_folder).as_posix()
+                ids[datatype][source] = self.index.ids(repo / file, blob)
+        return ids
+
+    @staticmethod
+    def check_duplicates(result: ValidationResult, changed_ids: Dict[str, Dict[str, List[Tuple[str, int, str]]]],
+                         unchanged_ids: Dict[str, Dict[str, List[str]]]) -> None:
+        """Report IDs of changed entities that are used more than once, in any file."""
+        for datatype in UNIQUE_ID_TYPES:
+            elsewhere: Dict[str, List[str]] = defaultdict(list)
+            for source, ids in unchanged_ids[datatype].items():
+                for _id in ids:
+                    if _id in changed_ids[datatype]:
+                        elsewhere[_id].append(source)
+            for _id, uses in changed_ids[datatype].items():
+                if len(uses) + len(elsewhere[_id]) < 2:
+                    continue
+                others = [f'{s}[{i}]' for s, i, _ in uses] + elsewhere[_id]
+                for source, index, label in uses:
+                    also = ', '.join(o for o in others if o != f'{source}[{index}]')
+                    result.add_error(f'duplicate id: {_id} (also in {also})', '_id', _id,
+                                     source=source, index=index, entity=label)
+
+    @staticmethod
+    def check_localisation(result: ValidationResult, file: Path, source: str, ability_ids: set) -> None:
+        """Every entry must translate an existing ability and give its name and description."""
+        try:
+            content = load_json_file(file)
+        except FileLoadingError as e:
+            result.add_error(str(e), source=source)
+            return
+        if not isinstance(content, dict):
+            result.add_error('localisation file must be an object of ability _id to translation', source=source)
+            return
+        for ability_id, translation in content.items():
+            if ability_id not in ability_ids:
+                result.add_error(f'translation for unknown ability {ability_id}', ability_id, source=source)
+            if not isinstance(translation, dict) or not all(
+                    isinstance(translation.get(k), str) for k in ('name', 'description')):
+                result.add_error('translation must have a name and description', ability_id, translation,
+                                 source=source)
+        result.items_validated += len(content)
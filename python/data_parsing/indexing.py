@@ -0,0 +1,205 @@
+"""
+In-memory indexes and query API for Warcry data.
+
+Builds hash indexes, inverted runemark postings and a sorted points index once,
+so lookups by ``_id``, warband, subfaction, grand alliance, runemark or points
+range do not scan every fighter.
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from .abilities import Ability
+from .factions import Faction, Factions
+from .fighters import Fighter, Fighters
+
+logger = logging.getLogger(__name__)
+
+
+class FighterIndex:
+    """Indexes over a list of fighters, storing row positions into that list."""
+
+    def __init__(self, fighters: List[Fighter]):
+        self.fighters = fighters
+        self.by_id: Dict[str, int] = {}
+        self.by_warband: Dict[str, List[int]] = defaultdict(list)
+        self.by_subfaction: Dict[str, List[int]] = defaultdict(list)
+        self.by_grand_alliance: Dict[str, List[int]] = defaultdict(list)
+        self.by_runemark: Dict[str, List[int]] = defaultdict(list)
+
+        for i, fighter in enumerate(fighters):
+            self.by_id[fighter._id] = i
+            self.by_warband[fighter.warband].append(i)
+            self.by_grand_alliance[fighter.grand_alliance].append(i)
+            subfaction = fighter.subfaction_runemark()
+            if subfaction:
+                self.by_subfaction[subfaction].append(i)
+            for runemark in set(fighter.runemarks):
+                self.by_runemark[runemark].append(i)
+
+        # Parallel sorted arrays for points range lookups
+        points_order = sorted(range(len(fighters)), key=lambda i: fighters[i].points)
+        self.points_positions: List[int] = points_order
+        self.points_values: List[int] = [fighters[i].points for i in points_order]
+
+    def points_range(self, low: Optional[int] = None, high: Optional[int] = None) -> List[int]:
+        """Return positions of fighters with points within ``[low, high]``."""
+        start = 0 if low is None else bisect_left(self.points_values, low)
+        end = len(self.points_values) if high is None else bisect_right(self.points_values, high)
+        return self.points_positions[start:end]
+
+
+class DataIndex:
+    """Lookup indexes for fighters, abilities and factions."""
+
+    def __init__(self, fighters: Fighters, abilities: List[Ability], factions: Factions):
+        self.fighters = FighterIndex(fighters.fighters)
+        self.abilities_by_id: Dict[str, Ability] = {a._id: a for a in abilities}
+        self.abilities_by_warband: Dict[str, List[Ability]] = defaultdict(list)
+        for ability in abilities:
+            self.abilities_by_warband[ability.warband].append(ability)
+        self.factions_by_warband: Dict[str, Faction] = factions.by_warband
+        logger.info(
+            f"Built indexes for {len(self.fighters.by_id)} fighters, "
+            f"{len(self.abilities_by_id)} abilities and {len(self.factions_by_warband)} factions"
+        )
+
+    def query_fighters(self) -> 'FighterQuery':
+        """Start a new fighter query over these indexes."""
+        return FighterQuery(self.fighters)
+
+
+class FighterQuery:
+    """Chainable, immutable fighter query.
+
+    Each call returns a new query, so partially built queries can be shared. Indexed
+    conditions (``where``) are resolved through ``FighterIndex`` and intersected
+    smallest-first; ``filter`` predicates are applied only to the remaining candidates.
+
+    Example:
+        pipeline.query_fighters().where(grand_alliance='order', runemarks=['hero']).sort('points').limit(5).all()
+    """
+
+    def __init__(
+        self,
+        index: FighterIndex,
+        conditions: Tuple[Tuple[str, object], ...] = (),
+        predicates: Tuple[Callable[[Fighter], bool], ...] = (),
+        sort_key: Optional[Tuple[str, bool]] = None,
+        max_results: Optional[int] = None,
+    ):
+        self._index = index
+        self._conditions = conditions
+        self._predicates = predicates
+        self._sort_key = sort_key
+        self._limit = max_results
+
+    def _replace(self, **changes) -> 'FighterQuery':
+        kwargs = {
+            'conditions': self._conditions,
+            'predicates': self._predicates,
+            'sort_key': self._sort_key,
+            'max_results': self._limit,
+        }
+        kwargs.update(changes)
+        return FighterQuery(self._index, **kwargs)
+
+    def where(
+        self,
+        _id: Optional[str] = None,
+        warband: Optional[str] = None,
+        subfaction: Optional[str] = None,
+        grand_alliance: Optional[str] = None,
+        runemarks: Sequence[str] = (),
+        min_points: Optional[int] = None,
+        max_points: Optional[int] = None,
+    ) -> 'FighterQuery':
+        """Add conditions that are answered from the indexes."""
+        conditions = list(self._conditions)
+        for key, value in (('_id', _id), ('warband', warband), ('subfaction', subfaction),
+                           ('grand_alliance', grand_alliance)):
+            if value is not None:
+                conditions.append((key, value))
+        for runemark in runemarks:
+            conditions.append(('runemark', runemark))
+        if min_points is not None or max_points is not None:
+            conditions.append(('points', (min_points, max_points)))
+        return self._replace(conditions=tuple(conditions))
+
+    def filter(self, predicate: Callable[[Fighter], bool]) -> 'FighterQuery':
+        """Add an arbitrary predicate, evaluated after the indexed conditions."""
+        return self._replace(predicates=self._predicates + (predicate,))
+
+    def sort(self, attribute: str, reverse: bool = False) -> 'FighterQuery':
+        """Order results by a fighter attribute."""
+        return self._replace(sort_key=(attribute, reverse))
+
+    def limit(self, count: int) -> 'FighterQuery':
+        """Return at most ``count`` results."""
+        return self._replace(max_results=count)
+
+    def _postings(self, key: str, value) -> List[int]:
+        index = self._index
+        if key == '_id':
+            position = index.by_id.get(value)
+            return [] if position is None else [position]
+        if key == 'points':
+            return index.points_range(*value)
+        lookup = {
+            'warband': index.by_warband,
+            'subfaction': index.by_subfaction,
+            'grand_alliance': index.by_grand_alliance,
+            'runemark': index.by_runemark,
+        }[key]
+        return lookup.get(value, [])
+
+    def _candidates(self) -> List[int]:
+        """Plan the indexed conditions: intersect postings, smallest first."""
+        if not self._conditions:
+            return list(range(len(self._index.fighters)))
+
+        postings = sorted((self._postings(k, v) for k, v in self._conditions), key=len)
+        if not postings[0]:
+            return []
+        candidates: Set[int] = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                return []
+        return sorted(candidates)
+
+    def __iter__(self) -> Iterator[Fighter]:
+        return iter(self.all())
+
+    def all(self) -> List[Fighter]:
+        """Execute the query."""
+        fighters = self._index.fighters
+        walk_points_index = self._sort_key == ('points', False) and not self._conditions
+        if walk_points_index:
+            # Results come out of the sorted points index already in order
+            positions = self._index.points_positions
+        else:
+            positions = self._candidates()
+
+        results = [fighters[i] for i in positions]
+        for predicate in self._predicates:
+            results = [f for f in results if predicate(f)]
+
+        if self._sort_key and not walk_points_index:
+            attribute, reverse = self._sort_key
+            results.sort(key=lambda f: getattr(f, attribute), reverse=reverse)
+
+        if self._limit is not None:
+            results = results[:self._limit]
+        return results
+
+    def first(self) -> Optional[Fighter]:
+        """Return the first result, or None."""
+        results = self.limit(1).all()
+        return results[0] if results else None
+
+    def count(self) -> int:
+        """Return the number of matching fighters, ignoring any limit."""
+        return len(self._replace(sort_key=None, max_results=None).all())
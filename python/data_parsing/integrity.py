@@ -0,0 +1,127 @@
+"""
+Cross-reference integrity checks for Warcry data.
+
+Schemas check each file on its own; these checks follow references between
+files. Every index is built in one pass over the data, with the fighters of each
+warband or subfaction kept as per-runemark bitmasks, so all checks together
+run in linear time.
+
+Checks:
+    * fighters whose warband has no faction file
+    * fighters whose ``subfaction`` is not declared in their warband's faction file
+    * abilities for a warband or subfaction that has no fighters
+    * abilities whose runemarks no fighter of their warband carries together
+    * abilities that ability assignment links to no fighter
+    * localisation entries whose key is not an ability ``_id``
+"""
+
+import logging
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from .abilities import Ability
+from .constants import SpecialWarbands
+from .factions import Factions
+from .fighters import Fighter, Fighters
+from .validation_system import ValidationResult
+
+logger = logging.getLogger(__name__)
+
+
+class IntegrityChecker:
+    """Checks references between processed fighters, abilities, factions and localisations.
+
+    Args:
+        fighters: Fighters with factions and abilities assigned
+        abilities: Every ability, including universal ones
+        factions: Every faction
+        localisations: Localisation file name -> ability _id -> translation
+    """
+
+    def __init__(self, fighters: Fighters, abilities: List[Ability], factions: Factions,
+                 localisations: Optional[Dict[str, Dict[str, dict]]] = None):
+        self.fighters: List[Fighter] = fighters.fighters
+        self.abilities = abilities
+        self.factions = factions
+        self.localisations = localisations or {}
+
+        # Fighter groups an ability can belong to: warbands, subfaction runemarks and universal.
+        # Each group maps runemark -> bitmask of fighter positions carrying it, plus the whole group.
+        self.groups: Dict[str, int] = defaultdict(int)
+        self.runemark_postings: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for i, fighter in enumerate(self.fighters):
+            bit = 1 << i
+            keys = [fighter.warband, SpecialWarbands.UNIVERSAL]
+            subfaction = fighter.subfaction_runemark()
+            if subfaction:
+                keys.append(subfaction)
+            for key in keys:
+                self.groups[key] |= bit
+                postings = self.runemark_postings[key]
+                for runemark in fighter.runemarks:
+                    postings[runemark] |= bit
+
+        self.ability_ids: Set[str] = {a._id for a in abilities}
+        self.linked: Set[int] = {id(a) for f in self.fighters for a in f.abilities}
+
+    @classmethod
+    def from_pipeline(cls, pipeline, localisation_files: Iterable[Path] = ()) -> 'IntegrityChecker':
+        """Build a checker over a pipeline's processed data and the given localisation files."""
+        pipeline.stage_process()
+        localisations = {file.name: pipeline.loader.load_localisation(file) for file in localisation_files}
+        return cls(pipeline.fighters, pipeline.abilities, pipeline.factions, localisations)
+
+    def check(self) -> ValidationResult:
+        """Run every check."""
+        result = ValidationResult(is_valid=True)
+        self.check_fighter_factions(result)
+        self.check_ability_references(result)
+        self.check_localisations(result)
+        logger.info(f"Integrity {result.summary()}")
+        return result
+
+    def check_fighter_factions(self, result: ValidationResult) -> None:
+        for fighter in self.fighters:
+            label = f'{fighter.grand_alliance}/{fighter.warband}/{fighter.name}'
+            declared = self.factions.subfactions_by_runemark.get(fighter.warband)
+            if declared is None:
+                result.add_error(f'warband {fighter.warband} has no faction file', 'warband', fighter.warband,
+                                 entity=label)
+                continue
+            subfaction = fighter._raw_data.get('subfaction')
+            if subfaction and subfaction not in declared:
+                result.add_error(f'subfaction {subfaction} is not declared in the {fighter.warband} faction',
+                                 'subfaction', subfaction, entity=label)
+        result.items_validated += len(self.fighters)
+
+    def check_ability_references(self, result: ValidationResult) -> None:
+        for ability in self.abilities:
+            label = f'{ability.warband}/{ability.name}'
+            group = self.groups.get(ability.warband, 0)
+            if not group:
+                result.add_error(f'no fighters belong to warband or subfaction {ability.warband}', 'warband',
+                                 ability.warband, entity=label)
+                continue
+
+            postings = self.runemark_postings[ability.warband]
+            matches = group
+            for runemark in ability.runemarks:
+                matches &= postings.get(runemark, 0)
+            if not matches:
+                missing = sorted(r for r in set(ability.runemarks) if r not in postings)
+                reason = f'no {ability.warband} fighter has {", ".join(missing)}' if missing \
+                    else f'no {ability.warband} fighter has all of {", ".join(ability.runemarks)}'
+                result.add_error(f'runemarks match no fighter: {reason}', 'runemarks', ability.runemarks,
+                                 entity=label)
+            elif id(ability) not in self.linked:
+                # Matching fighters exist, but assignment rules (e.g. bladeborn) link the ability to none
+                result.add_error('ability is not assigned to any fighter', '', None, entity=label)
+        result.items_validated += len(self.abilities)
+
+    def check_localisations(self, result: ValidationResult) -> None:
+        for name, translations in self.localisations.items():
+            for ability_id in translations:
+                if ability_id not in self.ability_ids:
+                    result.add_error(f'translation for unknown ability {ability_id}', ability_id, source=name)
+            result.items_validated += len(translations)
@@ -0,0 +1,113 @@
+"""
+Layered Warcry datasets: overlays resolved over a shared base layer.
+
+An overlay is a data folder with the same layout as ``data/`` holding local
+changes such as homebrew fighters, points errata or house-rule abilities.
+Fighters and abilities are matched across layers by ``_id`` and factions by
+``warband``. Fields given in an overlay entity replace those of the matching
+entity below it, so an errata entry only needs its ``_id`` and the changed
+fields; entities with a new ``_id`` are added.
+
+Resolution is copy-on-write: the resolved data shares the base layer's entity
+dicts and lists, and only the partitions and lists an overlay writes to are
+copied. The base layer is never modified, so it can be loaded and validated
+once and shared by any number of overlay combinations.
+"""
+
+import logging
+from dataclasses import replace
+from typing import Any, Dict, List, Sequence, Set, Tuple
+
+from .constants import DataTypes
+from .partitions import Partition, PartitionedData
+
+logger = logging.getLogger(__name__)
+
+# Field each data type is matched on across layers
+LAYER_KEYS = {
+    DataTypes.FIGHTERS: '_id',
+    DataTypes.ABILITIES: '_id',
+    DataTypes.FACTIONS: 'warband',
+}
+
+
+def layer_path(layer: int, relative_path: str) -> str:
+    """Source key of a file in an overlay, e.g. ``@1/order/my_warband/my_warband_fighters.json``."""
+    return f'@{layer}/{relative_path}'
+
+
+class LayeredView:
+    """Copy-on-write view over a base ``PartitionedData``.
+
+    Keeps an index of entity key -> (partition key, position) so each overlay
+    entity is resolved with a dict lookup.
+    """
+
+    def __init__(self, base: PartitionedData):
+        self.base = base
+        # Shallow partition copies: entity lists are shared until written and
+        # typed objects are rebuilt, as ability assignment differs between overlays
+        self.partitions: Dict[str, Partition] = {
+            key: replace(p, files=dict(p.files), data=dict(p.data), fighters=None, abilities=None)
+            for key, p in base.partitions.items()
+        }
+        self._copied: Set[Tuple[str, str]] = set()
+        self.index: Dict[str, Dict[Any, Tuple[str, int]]] = {datatype: {} for datatype in LAYER_KEYS}
+        for key, partition in self.partitions.items():
+            for datatype, field in LAYER_KEYS.items():
+                for position, entity in enumerate(partition.data.get(datatype, [])):
+                    self.index[datatype][entity.get(field)] = (key, position)
+        self.overridden = 0
+        self.added = 0
+
+    def _writable(self, key: str, datatype: str) -> List[Dict[str, Any]]:
+        """The entity list of a partition, copied the first time it is written to."""
+        partition = self.partitions.get(key)
+        if partition is None:
+            partition = self.partitions[key] = Partition(key=key)
+        if (key, datatype) not in self._copied:
+            partition.data[datatype] = list(partition.data.get(datatype, []))
+            self._copied.add((key, datatype))
+        partition.validated = False
+        return partition.data[datatype]
+
+    def apply(self, layer: int, overlay: PartitionedData) -> None:
+        """Resolve one overlay on top of the current view."""
+        for key, overlay_partition in overlay.partitions.items():
+            for datatype, field in LAYER_KEYS.items():
+                for entity in overlay_partition.data.get(datatype, []):
+                    entity_key = entity.get(field)
+                    found = self.index[datatype].get(entity_key)
+                    if found:
+                        target_key, position = found
+                        entities = self._writable(target_key, datatype)
+                        entities[position] = {**entities[position], **entity}
+                        self.overridden += 1
+                    else:
+                        entities = self._writable(key, datatype)
+                        self.index[datatype][entity_key] = (key, len(entities))
+                        entities.append(dict(entity))
+                        self.added += 1
+
+            files = self.partitions.setdefault(key, Partition(key=key)).files
+            files.update({layer_path(layer, path): digest for path, digest in overlay_partition.files.items()})
+
+    def resolve(self) -> PartitionedData:
+        return PartitionedData.from_partitions(self.partitions)
+
+
+def resolve_layers(base: PartitionedData, overlays: Sequence[PartitionedData]) -> PartitionedData:
+    """Resolve overlays, lowest first, over a base layer without modifying it.
+
+    Args:
+        base: Loaded base layer
+        overlays: Loaded overlay layers; later overlays override earlier ones
+
+    Returns:
+        The resolved data. Partitions an overlay wrote to are marked unvalidated.
+    """
+    view = LayeredView(base)
+    for layer, overlay in enumerate(overlays, 1):
+        view.apply(layer, overlay)
+    logger.info(f"Resolved {len(overlays)} overlays: {view.overridden} entities overridden, {view.added} added")
+    return view.resolve()
@@ -0,0 +1,183 @@
+"""
+Build manifest for incremental exports.
+
+Records the content hash of every source file and, for every output, a digest
+of the sources it is built from. On the next run, outputs whose sources, code
+and schemas are unchanged (and whose file is still as written) are skipped.
+"""
+
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .models import PROJECT_ROOT, LOCALISATION_DATA, write_data_json
+from .partitions import file_hash
+from .scheduler import Task, TaskScheduler, with_prerequisites
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_DIR = PROJECT_ROOT / '.cache' / 'manifests'
+MANIFEST_VERSION = 1
+LOCALISATION_PREFIX = 'localisation/'
+
+
+@dataclass
+class ExportTask:
+    """One output file and the sources it is built from.
+
+    Attributes:
+        output: File the task writes
+        run: Callable that writes ``output``
+        source_suffixes: Data file suffixes that feed the output, e.g. ``('_fighters.json',)``
+        extra_sources: Other source keys that feed the output, e.g. ``('localisation/french.json',)``
+        depends_on: Prerequisite scheduler tasks that must finish first, e.g. ``('stage:validate',)``
+    """
+    output: Path
+    run: Callable[[], None]
+    source_suffixes: Tuple[str, ...] = ()
+    extra_sources: Tuple[str, ...] = ()
+    depends_on: Tuple[str, ...] = ()
+
+    def select_sources(self, sources: Dict[str, str]) -> Dict[str, str]:
+        return {
+            path: digest for path, digest in sources.items()
+            if path in self.extra_sources or (
+                not path.startswith(LOCALISATION_PREFIX) and path.endswith(self.source_suffixes)
+            )
+        }
+
+
+def localisation_sources(src: Path = LOCALISATION_DATA) -> Dict[str, str]:
+    """Source key -> sha256 for every localisation file."""
+    return {
+        f'{LOCALISATION_PREFIX}{file.name}': file_hash(file.read_bytes())
+        for file in sorted(src.glob('*.json')) if file.is_file()
+    }
+
+
+def manifest_path(out_dir: Path, manifest_dir: Path = MANIFEST_DIR) -> Path:
+    """Manifest file for an output folder."""
+    key = hashlib.sha256(str(out_dir.resolve()).encode('utf-8')).hexdigest()[:16]
+    return manifest_dir / f'{out_dir.name}-{key}.json'
+
+
+class BuildManifest:
+    """Source hashes and per-output input digests from the last export into a folder."""
+
+    def __init__(self, path: Path, environment: str):
+        self.path = path
+        self.environment = environment
+        self.sources: Dict[str, str] = {}
+        self.outputs: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def load(cls, path: Path, environment: str) -> 'BuildManifest':
+        """Load a manifest, starting empty if it is missing, unreadable or from other code or schemas."""
+        manifest = cls(path, environment)
+        try:
+            content = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return manifest
+        if content.get('version') == MANIFEST_VERSION and content.get('environment') == environment:
+            manifest.sources = content.get('sources', {})
+            manifest.outputs = content.get('outputs', {})
+        return manifest
+
+    def save(self) -> None:
+        write_data_json(dst=self.path, data={
+            'version': MANIFEST_VERSION,
+            'environment': self.environment,
+            'sources': self.sources,
+            'outputs': self.outputs,
+        })
+
+    def changed_sources(self, sources: Dict[str, str]) -> List[str]:
+        """Source keys added, removed or changed since the manifest was written."""
+        changed = [path for path, digest in sources.items() if self.sources.get(path) != digest]
+        changed.extend(path for path in self.sources if path not in sources)
+        return sorted(changed)
+
+    def inputs_digest(self, sources: Dict[str, str]) -> str:
+        digest = hashlib.sha256(self.environment.encode('utf-8'))
+        for path, file_digest in sorted(sources.items()):
+            digest.update(f'{path}\0{file_digest}\0'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def is_current(self, output: Path, inputs_digest: str) -> bool:
+        """True if ``output`` was built from these inputs and has not been changed or removed since."""
+        recorded = self.outputs.get(output.as_posix())
+        if not recorded or recorded.get('inputs') != inputs_digest or not output.is_file():
+            return False
+        return recorded.get('output') == file_hash(output.read_bytes())
+
+    def record(self, output: Path, inputs_digest: str) -> None:
+        self.outputs[output.as_posix()] = {'inputs': inputs_digest, 'output': file_hash(output.read_bytes())}
+
+
+def stale_tasks(tasks: Iterable[ExportTask], sources: Dict[str, str], manifest: BuildManifest,
+                full: bool = False) -> Tuple[List[Tuple[ExportTask, str]], List[ExportTask]]:
+    """Split tasks into those that need to run (with their input digest) and those that can be skipped."""
+    to_run = []
+    skipped = []
+    for task in tasks:
+        digest = manifest.inputs_digest(task.select_sources(sources))
+        if not full and manifest.is_current(task.output, digest):
+            skipped.append(task)
+        else:
+            to_run.append((task, digest))
+    return to_run, skipped
+
+
+def run_incremental(tasks: Iterable[ExportTask], sources: Dict[str, str], manifest: BuildManifest,
+                    full: bool = False, before_run: Optional[Callable[[], None]] = None,
+                    prerequisites: Sequence[Task] = (), max_workers: int = 1) -> Dict[str, List[Path]]:
+    """Run the tasks whose inputs changed and record the results in the manifest.
+
+    The tasks run on a ``TaskScheduler``, after the prerequisites they depend on. A
+    failed task is not recorded, so it runs again next time, and the tasks depending
+    on it are cancelled; the others are still written and recorded.
+
+    Args:
+        tasks: Export tasks
+        sources: Source key -> sha256 for every current source file
+        manifest: Manifest from the previous run
+        full: Run every task regardless of the manifest
+        before_run: Called once before the first task runs, e.g. to prepare the pipeline
+        prerequisites: Scheduler tasks the export tasks can depend on, e.g. pipeline stages
+        max_workers: Tasks run at the same time
+
+    Returns:
+        ``{'written': [...], 'skipped': [...], 'failed': [...]}`` output paths, failed including cancelled
+    """
+    to_run, skipped = stale_tasks(tasks, sources, manifest, full)
+    for task in skipped:
+        logger.info(f"Skipped (unchanged): {task.output}")
+
+    def record(task: ExportTask, digest: str) -> Callable[[], None]:
+        def run() -> None:
+            task.run()
+            manifest.record(task.output, digest)
+        return run
+
+    first = ('before_run',) if before_run else ()
+    scheduled = with_prerequisites(
+        [Task(t.output.as_posix(), record(t, digest), first + t.depends_on) for t, digest in to_run],
+        [Task(p.name, p.run, first + p.depends_on) for p in prerequisites]
+    )
+    if to_run and before_run:
+        scheduled.insert(0, Task('before_run', before_run))
+    report = TaskScheduler(max_workers).run(scheduled)
+    if to_run:
+        logger.info(f"Export timings:\n{report.summary()}")
+
+    manifest.sources = dict(sources)
+    manifest.save()
+    succeeded = {r.name for r in report.done}
+    return {
+        'written': [t.output for t, _ in to_run if t.output.as_posix() in succeeded],
+        'skipped': [t.output for t in skipped],
+        'failed': [t.output for t, _ in to_run if t.output.as_posix() not in succeeded],
+    }
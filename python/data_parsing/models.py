@@ -1,9 +1,10 @@
+import hashlib
 import json
 import logging
+import os
+import textwrap
 from pathlib import Path
-from typing import List, Dict, Union, Any
-
-import jsonschema
+from typing import List, Dict, Union, Any, Iterable
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 PROJECT_DATA = Path(PROJECT_ROOT, 'data')
@@ -41,24 +42,101 @@ def load_json_file(file: Path) -> Any:
         FileLoadingError: If file cannot be loaded or parsed
     """
     try:
-        return json.loads(file.read_text(encoding='utf-8'))
+        raw = file.read_bytes()
+    except Exception as e:
+        raise FileLoadingError(f"Unexpected error reading {file}: {e}") from e
+    return load_json_bytes(raw, file)
+
+
+def content_fingerprint(data: Any) -> str:
+    """Stable fingerprint of JSON-serialisable content.
+
+    Hashes the canonical form (sorted keys, no whitespace), so the fingerprint does not
+    depend on key order or file formatting.
+    """
+    canonical = json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def load_json_bytes(raw: bytes, source: Union[Path, str] = '<bytes>') -> Any:
+    """Parse JSON from raw file content, with the same encoding fallback as load_json_file.
+
+    Args:
+        raw: File content
+        source: Where the content came from, used in messages
+    """
+    try:
+        return json.loads(raw.decode('utf-8'))
     except UnicodeDecodeError:
         # Fallback to latin-1 for legacy files
-        logger.warning(f"UTF-8 decode failed for {file}, trying latin-1")
+        logger.warning(f"UTF-8 decode failed for {source}, trying latin-1")
         try:
-            return json.loads(file.read_text(encoding='latin-1'))
+            return json.loads(raw.decode('latin-1'))
         except UnicodeDecodeError as e:
-            raise FileLoadingError(f"Could not decode file {file} with UTF-8 or latin-1: {e}") from e
+            raise FileLoadingError(f"Could not decode file {source} with UTF-8 or latin-1: {e}") from e
+        except json.JSONDecodeError as e:
+            raise FileLoadingError(f"Invalid JSON in {source}: {e}") from e
     except json.JSONDecodeError as e:
-        raise FileLoadingError(f"Invalid JSON in {file}: {e}") from e
+        raise FileLoadingError(f"Invalid JSON in {source}: {e}") from e
     except Exception as e:
-        raise FileLoadingError(f"Unexpected error reading {file}: {e}") from e
+        raise FileLoadingError(f"Unexpected error reading {source}: {e}") from e
+
+
+def data_json_text(data: Union[List, Dict]) -> str:
+    """The layout every data and output file is written in: 4-space indents, non-ASCII kept, key order kept."""
+    return json.dumps(data, ensure_ascii=False, indent=4, sort_keys=False)
 
 
 def write_data_json(dst: Path, data: Union[List, Dict], encoding: str = 'utf-8'):
     dst.parent.mkdir(parents=True, exist_ok=True)
     with open(dst, 'w', encoding=encoding) as f:
-        json.dump(data, f, ensure_ascii=False, indent=4, sort_keys=False)
+        f.write(data_json_text(data))
+
+
+class JSONArrayWriter:
+    """Write a JSON array one item at a time, in the same layout as ``write_data_json``.
+
+    Items are written to a temporary file next to ``dst``, which replaces ``dst`` only
+    when the block exits cleanly; if it raises, ``dst`` is left as it was.
+
+    Example:
+        with JSONArrayWriter(dst) as writer:
+            for item in items:
+                writer.write(item)
+    """
+
+    def __init__(self, dst: Path, encoding: str = 'utf-8'):
+        self.dst = dst
+        self.encoding = encoding
+        self.count = 0
+        self._tmp = dst.with_suffix(f'.{os.getpid()}.tmp')
+        self._file = None
+
+    def __enter__(self) -> 'JSONArrayWriter':
+        self.dst.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self._tmp, 'w', encoding=self.encoding)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        try:
+            if exc_type is None:
+                self._file.write('\n]' if self.count else '[]')
+        finally:
+            self._file.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.dst)
+        else:
+            self._tmp.unlink(missing_ok=True)
+
+    def write(self, item: Any) -> None:
+        self._file.write(',\n' if self.count else '[\n')
+        self._file.write(textwrap.indent(json.dumps(item, ensure_ascii=False, indent=4), '    '))
+        self.count += 1
+
+    def extend(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.write(item)
+
 
 class DataPayload:
     """
@@ -97,6 +175,5 @@ class JSONDataPayload(DataPayload):
             json.dump(self.data, f, ensure_ascii=False, indent=4, sort_keys=True)
 
     def validate_data(self):
-        with open(self.schema, 'r') as f:
-            schema_data = json.load(f)
-        jsonschema.validate(self.data, schema_data)
+        from .schema_registry import validate
+        validate(self.data, self.schema)
@@ -0,0 +1,99 @@
+"""
+Warband partitions of the Warcry data tree.
+
+Each folder of source files (``data/<grand_alliance>/<warband>/`` or
+``data/universal/``) is a partition. Partitions remember the content hash of
+their files, so changed warbands can be reloaded, revalidated and rebuilt
+without touching the rest of the dataset.
+"""
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import PurePosixPath
+from typing import Any, Dict, Iterable, List, Optional, TYPE_CHECKING
+
+from .constants import DataTypes
+
+if TYPE_CHECKING:
+    from .abilities import Ability
+    from .fighters import Fighter
+
+
+def empty_data() -> Dict[str, List[Any]]:
+    return {DataTypes.FIGHTERS: [], DataTypes.ABILITIES: [], DataTypes.FACTIONS: []}
+
+
+def file_hash(raw: bytes) -> str:
+    return hashlib.sha256(raw).hexdigest()
+
+
+def partition_key(relative_file: str) -> str:
+    """The partition a data file belongs to: its folder relative to the data root, e.g. ``chaos/beasts_of_chaos``."""
+    return PurePosixPath(relative_file).parent.as_posix()
+
+
+@dataclass
+class Partition:
+    """Raw data, and optionally typed objects, loaded from one folder of source files.
+
+    Attributes:
+        key: Folder relative to the data root
+        files: Relative file path -> sha256 of the file content
+        data: Raw fighters, abilities and factions loaded from the files
+        validated: Whether ``data`` has passed schema validation
+        fighters: Fighter objects built from ``data``, or None until built
+        abilities: Ability objects built from ``data``, or None until built
+    """
+    key: str
+    files: Dict[str, str] = field(default_factory=dict)
+    data: Dict[str, List[Any]] = field(default_factory=empty_data)
+    validated: bool = False
+    fighters: Optional[List['Fighter']] = None
+    abilities: Optional[List['Ability']] = None
+
+
+@dataclass
+class PartitionedData:
+    """Partitions in load order, plus the merged raw data the exporters work from.
+
+    The merged lists hold the same dicts as the partitions, so in-place changes
+    (such as ID assignment) are seen through both.
+    """
+    partitions: Dict[str, Partition] = field(default_factory=dict)
+    data: Dict[str, List[Any]] = field(default_factory=empty_data)
+
+    @classmethod
+    def from_partitions(cls, partitions: Dict[str, Partition]) -> 'PartitionedData':
+        return cls(partitions=partitions, data=merge_partitions(partitions.values()))
+
+    def source_hashes(self) -> Dict[str, str]:
+        """Relative file path -> sha256 for every loaded source file."""
+        return {path: digest for p in self.partitions.values() for path, digest in p.files.items()}
+
+    def replace_partitions(self, partitions: Dict[str, Partition]) -> None:
+        """Swap in a new set of partitions, rebuilding the merged data in place."""
+        self.partitions = partitions
+        merged = merge_partitions(partitions.values())
+        for datatype, entities in merged.items():
+            self.data.setdefault(datatype, [])[:] = entities
+
+
+def merge_partitions(partitions: Iterable[Partition]) -> Dict[str, List[Any]]:
+    """Concatenate partition data in order."""
+    merged = empty_data()
+    for partition in partitions:
+        for datatype, entities in partition.data.items():
+            merged[datatype].extend(entities)
+    return merged
+
+
+def changed_partitions(old: Dict[str, Dict[str, str]], new: Dict[str, Dict[str, str]]) -> List[str]:
+    """Keys of partitions that were added, removed or whose file hashes differ.
+
+    Args:
+        old: Partition key -> {relative path: sha256} from the previous load
+        new: Partition key -> {relative path: sha256} for the current files
+    """
+    changed = [key for key, files in new.items() if old.get(key) != files]
+    changed.extend(key for key in old if key not in new)
+    return changed
@@ -0,0 +1,237 @@
+"""
+Concurrent execution of tasks with declared dependencies.
+
+Each task names the tasks it depends on. A task starts once all of them have
+finished, and independent tasks run concurrently on a thread pool. Threads suit
+the exports: they share the pipeline's memoised stages, which are computed once
+under the pipeline's stage lock, and spend their time writing files.
+
+When a task fails, the tasks that depend on it, directly or not, are cancelled
+without running; every other task still runs to completion.
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class SchedulerError(Exception):
+    """Raised when tasks have duplicate names or unknown or circular dependencies."""
+    pass
+
+
+class TaskFailedError(Exception):
+    """Raised by ``ScheduleReport.raise_for_failures`` when tasks failed."""
+    pass
+
+
+class TaskStatus:
+    """Outcome of a scheduled task."""
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+@dataclass(frozen=True)
+class Task:
+    """A unit of work and the names of the tasks that must finish before it starts."""
+    name: str
+    run: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskResult:
+    """How a task ended and how long it ran; cancelled tasks did not run.
+
+    Attributes:
+        error: The exception a failed task raised
+        cause: For a cancelled task, the failed task it depended on
+    """
+    name: str
+    status: str
+    seconds: float = 0.0
+    error: Optional[Exception] = None
+    cause: Optional[str] = None
+
+
+class ScheduleReport:
+    """Results of one scheduler run, in dependency order."""
+
+    def __init__(self, results: List[TaskResult], seconds: float):
+        self.results = results
+        self.seconds = seconds
+
+    def with_status(self, status: str) -> List[TaskResult]:
+        return [r for r in self.results if r.status == status]
+
+    @property
+    def done(self) -> List[TaskResult]:
+        return self.with_status(TaskStatus.DONE)
+
+    @property
+    def failed(self) -> List[TaskResult]:
+        return self.with_status(TaskStatus.FAILED)
+
+    @property
+    def cancelled(self) -> List[TaskResult]:
+        return self.with_status(TaskStatus.CANCELLED)
+
+    def summary(self) -> str:
+        """One line per task with its status and time, then the total wall time."""
+        width = max((len(r.name) for r in self.results), default=0)
+        lines = []
+        for r in self.results:
+            detail = f'{r.seconds:.3f}s' if r.status != TaskStatus.CANCELLED else f'({r.cause} failed)'
+            lines.append(f'{r.name:<{width}}  {r.status:<9}  {detail}')
+        busy = sum(r.seconds for r in self.results)
+        lines.append(f'{len(self.results)} tasks in {self.seconds:.3f}s ({busy:.3f}s of task time)')
+        return '\n'.join(lines)
+
+    def raise_for_failures(self) -> None:
+        """Raise ``TaskFailedError`` from the first failure, if any task failed."""
+        failed = self.failed
+        if failed:
+            cancelled = len(self.cancelled)
+            raise TaskFailedError(
+                f"{len(failed)} tasks failed ({', '.join(r.name for r in failed)}), {cancelled} cancelled"
+            ) from failed[0].error
+
+
+def order_tasks(tasks: Iterable[Task]) -> List[Task]:
+    """Tasks in an order where every task follows its dependencies, otherwise keeping the given order.
+
+    Raises:
+        SchedulerError: Duplicate task names, or dependencies that are unknown or circular
+    """
+    tasks = list(tasks)
+    by_name: Dict[str, Task] = {}
+    for task in tasks:
+        if task.name in by_name:
+            raise SchedulerError(f'Duplicate task name: {task.name}')
+        by_name[task.name] = task
+    for task in tasks:
+        missing = [d for d in task.depends_on if d not in by_name]
+        if missing:
+            raise SchedulerError(f'Task {task.name} depends on unknown tasks: {missing}')
+
+    ordered: List[Task] = []
+    placed = set()
+    visiting = set()
+
+    def place(task: Task) -> None:
+        if task.name in placed:
+            return
+        if task.name in visiting:
+            raise SchedulerError(f'Circular dependency involving task {task.name}')
+        visiting.add(task.name)
+        for dependency in task.depends_on:
+            place(by_name[dependency])
+        visiting.discard(task.name)
+        placed.add(task.name)
+        ordered.append(task)
+
+    for task in tasks:
+        place(task)
+    return ordered
+
+
+def with_prerequisites(tasks: Iterable[Task], prerequisites: Iterable[Task]) -> List[Task]:
+    """``tasks`` preceded by the prerequisites they depend on, directly or through other prerequisites."""
+    tasks = list(tasks)
+    available = {p.name: p for p in prerequisites}
+    needed: Dict[str, Task] = {}
+    pending = [d for t in tasks for d in t.depends_on]
+    while pending:
+        name = pending.pop()
+        if name in available and name not in needed:
+            needed[name] = available[name]
+            pending.extend(available[name].depends_on)
+    return [p for p in available.values() if p.name in needed] + tasks
+
+
+def run_timed(task: Task) -> TaskResult:
+    start = time.perf_counter()
+    try:
+        task.run()
+    except Exception as e:
+        seconds = time.perf_counter() - start
+        logger.error(f"Task {task.name} failed after {seconds:.3f} seconds: {e!r}")
+        return TaskResult(task.name, TaskStatus.FAILED, seconds, error=e)
+    seconds = time.perf_counter() - start
+    logger.info(f"Task {task.name} completed in {seconds:.3f} seconds")
+    return TaskResult(task.name, TaskStatus.DONE, seconds)
+
+
+class TaskScheduler:
+    """Runs tasks as soon as their dependencies have finished.
+
+    Args:
+        max_workers: Tasks running at the same time, defaults to the CPU count; 1 runs
+            every task in this thread, in dependency order
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, tasks: Iterable[Task]) -> ScheduleReport:
+        """Run every task whose dependencies succeed, returning how each one ended.
+
+        Raises:
+            SchedulerError: The tasks cannot be scheduled; nothing is run
+        """
+        start = time.perf_counter()
+        tasks = order_tasks(tasks)
+        by_name = {t.name: t for t in tasks}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        waiting: Dict[str, int] = {}
+        for task in tasks:
+            waiting[task.name] = len(set(task.depends_on))
+            for dependency in set(task.depends_on):
+                dependents[dependency].append(task.name)
+
+        results: Dict[str, TaskResult] = {}
+        ready: Deque[Task] = deque(t for t in tasks if not waiting[t.name])
+
+        def finish(result: TaskResult) -> None:
+            results[result.name] = result
+            if result.status == TaskStatus.DONE:
+                for name in dependents[result.name]:
+                    waiting[name] -= 1
+                    if not waiting[name] and name not in results:
+                        ready.append(by_name[name])
+                return
+            pending = list(dependents[result.name])
+            while pending:
+                name = pending.pop()
+                if name not in results:
+                    logger.warning(f"Task {name} cancelled: {result.name} failed")
+                    results[name] = TaskResult(name, TaskStatus.CANCELLED, cause=result.name)
+                    pending.extend(dependents[name])
+
+        if self.max_workers <= 1:
+            while ready:
+                finish(run_timed(ready.popleft()))
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='warcry-task') as pool:
+                running: Dict[Future, Task] = {}
+                while ready or running:
+                    while ready:
+                        task = ready.popleft()
+                        running[pool.submit(run_timed, task)] = task
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        running.pop(future)
+                        finish(future.result())
+
+        report = ScheduleReport([results[t.name] for t in tasks], time.perf_counter() - start)
+        logger.info(f"Ran {len(report.done)} of {len(tasks)} tasks in {report.seconds:.3f} seconds "
+                    f"across {self.max_workers} workers ({len(report.failed)} failed, "
+                    f"{len(report.cancelled)} cancelled)")
+        return report
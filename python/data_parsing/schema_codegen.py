@@ -0,0 +1,321 @@
+"""
+Specialised Python validators generated from the JSON schemas.
+
+``jsonschema`` interprets a schema on every call: it looks up each keyword's
+validator, descends through generators and builds error objects along the way.
+The schemas in ``schemas/`` only use a handful of keywords, so each one can be
+compiled into a plain function of straight-line ``isinstance``, enum and
+required-field checks that answers "is this valid?" without that overhead.
+Callers still ask ``jsonschema`` for the error messages once data is known to
+be invalid.
+
+Generated source is cached in ``.cache/validators`` under a hash of the schema,
+the schemas it may ``$ref`` and the generator version, and regenerated when any
+of them change. ``differential_check`` confirms that the generated validators
+accept and reject exactly what ``jsonschema`` does.
+"""
+
+import itertools
+import logging
+import os
+import random
+from copy import copy, deepcopy
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from urllib.parse import urldefrag, urljoin
+
+import jsonschema
+
+from .models import PROJECT_ROOT, content_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever the generated code changes, so cached validators are regenerated
+GENERATOR_VERSION = 1
+CACHE_DIR = PROJECT_ROOT / '.cache' / 'validators'
+
+# Keywords jsonschema treats as annotations only (no format checker is configured)
+ANNOTATIONS = frozenset({
+    '$schema', '$id', '$comment', 'title', 'description', 'examples', 'default', 'format',
+    'readOnly', 'writeOnly', 'deprecated',
+})
+KEYWORDS = frozenset({'$ref', 'type', 'enum', 'required', 'properties', 'items'})
+# Type checks of the draft 6 and later type checkers, where 1.0 is an integer and booleans are not numbers
+TYPE_CHECKS = {
+    'array': 'isinstance({v}, list)',
+    'boolean': 'isinstance({v}, bool)',
+    'integer': '(isinstance({v}, int) and not isinstance({v}, bool) or isinstance({v}, float) and {v}.is_integer())',
+    'null': '{v} is None',
+    'number': '(isinstance({v}, Number) and not isinstance({v}, bool))',
+    'object': 'isinstance({v}, dict)',
+    'string': 'isinstance({v}, str)',
+}
+# Drafts whose semantics the generator follows; draft 6 and 7 ignore keywords next to $ref
+SUPPORTED_DRAFTS = {
+    jsonschema.Draft6Validator: True,
+    jsonschema.Draft7Validator: True,
+    jsonschema.Draft201909Validator: False,
+    jsonschema.Draft202012Validator: False,
+}
+PRELUDE = '''\
+from numbers import Number
+
+_MISSING = object()
+'''
+
+Validator = Callable[[Any], bool]
+
+
+class UnsupportedSchemaError(Exception):
+    """Raised when a schema uses something the generator cannot compile; use jsonschema for it instead."""
+    pass
+
+
+def indent(lines: List[str]) -> List[str]:
+    return [f'    {line}' for line in lines]
+
+
+class SchemaCompiler:
+    """Compiles one schema, and every schema it ``$ref``s, into Python source.
+
+    Each ``$ref`` target becomes its own function, so shared and recursive
+    references are compiled once. The entry point is ``is_valid(instance)``.
+
+    Args:
+        schema: Schema to compile
+        store: URL -> schema for resolving ``$ref``, see ``schema_registry.local_schema_store``
+    """
+
+    def __init__(self, schema: Any, store: Dict[str, Any]):
+        cls = jsonschema.validators.validator_for(schema)
+        if cls not in SUPPORTED_DRAFTS:
+            raise UnsupportedSchemaError(f'{cls.__name__} schemas are not supported')
+        self.schema = schema
+        self.store = store
+        self.ref_overrides_siblings = SUPPORTED_DRAFTS[cls]
+        self.functions: Dict[str, str] = {}
+        self.pending: List[Tuple[str, Any, str]] = []
+        self.constants: List[str] = []
+        self.variables = 0
+
+    def source(self) -> str:
+        base = self.schema.get('$id', '') if isinstance(self.schema, dict) else ''
+        blocks = [self.function('is_valid', self.schema, base)]
+        while self.pending:
+            blocks.append(self.function(*self.pending.pop(0)))
+        return '\n\n'.join(['\n'.join([PRELUDE] + self.constants) + '\n'] + blocks)
+
+    def function(self, name: str, schema: Any, base: str) -> str:
+        self.variables = 0
+        lines = [f'def {name}(v0):'] + indent(self.emit(schema, 'v0', base) + ['return True'])
+        return '\n'.join(lines) + '\n'
+
+    def variable(self) -> str:
+        self.variables += 1
+        return f'v{self.variables}'
+
+    def reference(self, ref: str, base: str) -> str:
+        """Name of the function validating a ``$ref`` target."""
+        url, fragment = urldefrag(urljoin(base, ref))
+        if fragment:
+            raise UnsupportedSchemaError(f'$ref with a fragment: {ref}')
+        if url not in self.store:
+            raise UnsupportedSchemaError(f'$ref to a schema that is not available locally: {ref}')
+        if url not in self.functions:
+            self.functions[url] = f'_ref{len(self.functions)}'
+            self.pending.append((self.functions[url], self.store[url], url))
+        return self.functions[url]
+
+    def emit(self, schema: Any, var: str, base: str) -> List[str]:
+        """Statements that ``return False`` if the value in ``var`` does not match ``schema``."""
+        if schema is True:
+            return []
+        if schema is False:
+            return ['return False']
+        if not isinstance(schema, dict):
+            raise UnsupportedSchemaError(f'schema must be an object or boolean, not {schema!r}')
+        unknown = set(schema) - KEYWORDS - ANNOTATIONS
+        if unknown:
+            raise UnsupportedSchemaError(f'unsupported keywords: {", ".join(sorted(unknown))}')
+        if isinstance(schema.get('$id'), str):
+            base = urljoin(base, schema['$id'])
+
+        lines = []
+        if '$ref' in schema:
+            lines += [f'if not {self.reference(schema["$ref"], base)}({var}):', '    return False']
+            if self.ref_overrides_siblings:
+                return lines
+
+        known_type = None
+        if 'type' in schema:
+            types = [schema['type']] if isinstance(schema['type'], str) else list(schema['type'])
+            if not types or any(t not in TYPE_CHECKS for t in types):
+                raise UnsupportedSchemaError(f'unsupported type: {schema["type"]!r}')
+            checks = ' or '.join(TYPE_CHECKS[t].format(v=var) for t in types)
+            lines += [f'if not ({checks}):' if len(types) > 1 else f'if not {checks}:', '    return False']
+            known_type = types[0] if len(types) == 1 else None
+
+        if 'enum' in schema:
+            enum = schema['enum']
+            # A string can only equal a string, so this matches jsonschema's bool-aware comparison
+            if not isinstance(enum, list) or not all(isinstance(e, str) for e in enum):
+                raise UnsupportedSchemaError(f'only enums of strings are supported: {enum!r}')
+            constant = f'_ENUM{len(self.constants)}'
+            self.constants.append(f'{constant} = frozenset({sorted(set(enum))!r})')
+            check = f'{var} in {constant}' if known_type == 'string' else f'isinstance({var}, str) and {var} in {constant}'
+            lines += [f'if not ({check}):', '    return False']
+
+        object_lines = []
+        for name in schema.get('required', []):
+            object_lines += [f'if {name!r} not in {var}:', '    return False']
+        for name, subschema in schema.get('properties', {}).items():
+            value = self.variable()
+            checks = self.emit(subschema, value, base)
+            if checks:
+                object_lines += [f'{value} = {var}.get({name!r}, _MISSING)', f'if {value} is not _MISSING:']
+                object_lines += indent(checks)
+        if object_lines:
+            lines += object_lines if known_type == 'object' else [f'if isinstance({var}, dict):'] + indent(object_lines)
+
+        if 'items' in schema:
+            if not isinstance(schema['items'], (dict, bool)):
+                raise UnsupportedSchemaError('only a single items schema is supported')
+            item = self.variable()
+            checks = self.emit(schema['items'], item, base)
+            if checks:
+                array_lines = [f'for {item} in {var}:'] + indent(checks)
+                lines += array_lines if known_type == 'array' else [f'if isinstance({var}, list):'] + indent(array_lines)
+        return lines
+
+
+def schema_hash(schema: Any, store: Dict[str, Any]) -> str:
+    """Hash of everything the generated code depends on: the schema, the schemas it may $ref and the generator."""
+    return content_fingerprint([GENERATOR_VERSION, schema, store])
+
+
+def generate_source(schema: Any, store: Dict[str, Any], name: str = '<schema>') -> str:
+    """Python source of a module whose ``is_valid(instance)`` checks instances against ``schema``.
+
+    Raises:
+        UnsupportedSchemaError: The schema uses a keyword or construct the generator does not handle
+    """
+    header = f'# Generated by data_parsing.schema_codegen from {name}, do not edit\n'
+    return header + SchemaCompiler(schema, store).source()
+
+
+def load_validator(name: str, schema: Any, store: Dict[str, Any], cache_dir: Optional[Path] = CACHE_DIR) -> Validator:
+    """The generated validator for a schema, read from the cache or generated and cached.
+
+    Args:
+        name: Schema file name, used for the cache file
+        schema: Schema content
+        store: URL -> schema for resolving ``$ref``
+        cache_dir: Folder for generated source, or None to generate in memory only
+
+    Raises:
+        UnsupportedSchemaError: The schema cannot be compiled
+    """
+    stem = Path(name).stem
+    digest = schema_hash(schema, store)
+    source = None
+    cached = cache_dir / f'{stem}-{digest[:16]}.py' if cache_dir else None
+    if cached and cached.is_file():
+        source = cached.read_text(encoding='utf-8')
+    if source is None:
+        source = generate_source(schema, store, name)
+        logger.debug(f"Generated validator for {name}")
+        if cached:
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                for stale in cache_dir.glob(f'{stem}-*.py'):
+                    stale.unlink()
+                tmp = cached.with_suffix(f'.{os.getpid()}.tmp')
+                tmp.write_text(source, encoding='utf-8')
+                os.replace(tmp, cached)
+            except OSError as e:
+                logger.warning(f"Could not cache the generated validator for {name}: {e}")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, str(cached or name), 'exec'), namespace)
+    return namespace['is_valid']
+
+
+# Values swapped in by mutants: every JSON type, booleans and integral floats, and strings outside any enum
+MUTANT_VALUES = (None, True, False, 0, 1, -1, 1.0, 1.5, '', 'not-a-value', [], {}, ['x'], [{}], {'x': 1})
+
+
+def iter_paths(value: Any, path: Tuple = ()) -> Iterator[Tuple]:
+    """Path (keys and indices) of every value nested in a JSON document, including the root."""
+    yield path
+    if isinstance(value, dict):
+        for key, child in value.items():
+            yield from iter_paths(child, path + (key,))
+    elif isinstance(value, list):
+        for i, child in enumerate(value):
+            yield from iter_paths(child, path + (i,))
+
+
+def mutants(instance: Any, rng: random.Random, count: int) -> Iterator[Any]:
+    """Copies of a document with one value replaced, removed or added in each.
+
+    Only the containers on the path to the change are copied; the rest is shared with ``instance``.
+    """
+    paths = list(iter_paths(instance))
+    for _ in range(count):
+        path = rng.choice(paths)
+        operation = rng.choice(('replace', 'remove', 'add'))
+        value = deepcopy(rng.choice(MUTANT_VALUES))
+        if not path:
+            yield value if operation == 'replace' else instance
+            continue
+        mutant = parent = copy(instance)
+        for key in path[:-1]:
+            parent[key] = copy(parent[key])
+            parent = parent[key]
+        key = path[-1]
+        if operation == 'replace':
+            parent[key] = value
+        elif operation == 'remove':
+            del parent[key]
+        elif isinstance(parent[key], dict):
+            parent[key] = {**parent[key], 'unexpected': value}
+        elif isinstance(parent[key], list):
+            parent[key] = parent[key] + [value]
+        yield mutant
+
+
+class Disagreement(NamedTuple):
+    """An instance that a generated validator and jsonschema judge differently."""
+    schema: str
+    instance: Any
+    generated: bool
+    expected: bool
+
+
+def differential_check(cases: Iterable[Tuple[Path, Any]], registry, mutations: int = 20,
+                       seed: int = 0) -> Tuple[int, List[Disagreement]]:
+    """Compare generated validators with jsonschema on instances and mutated copies of them.
+
+    Args:
+        cases: (schema file, instance) pairs, e.g. every entity in the data
+        registry: ``SchemaRegistry`` providing both validators
+        mutations: Mutated copies of each instance to check as well
+        seed: Random seed, so failures can be reproduced
+
+    Returns:
+        Number of instances checked, and every instance the validators disagree on
+    """
+    rng = random.Random(seed)
+    checked = 0
+    disagreements = []
+    for schema, instance in cases:
+        generated = registry.generated(schema)
+        if generated is None:
+            raise UnsupportedSchemaError(f'no generated validator for {schema.name}')
+        validator = registry.validator(schema)
+        for candidate in itertools.chain([instance], mutants(instance, rng, mutations)):
+            fast, expected = generated(candidate), validator.is_valid(candidate)
+            checked += 1
+            if fast != expected:
+                disagreements.append(Disagreement(schema.name, candidate, fast, expected))
+    return checked, disagreements
@@ -0,0 +1,164 @@
+"""
+Compiled JSON schema validators shared by everything in the process.
+
+Each schema is read, checked and compiled into a validator once. The schemas
+``$ref`` each other by their GitHub URLs; those are resolved from the local
+``schemas/`` folder, so validation never goes to the network. Successful
+validations are remembered by a fingerprint of the data, so validating
+unchanged data against the same schema again costs one hash.
+
+Where the schema allows, validity is decided by a validator generated from it
+(see ``schema_codegen``); ``jsonschema`` is only run to explain failures.
+"""
+
+import json
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import jsonschema
+from jsonschema.exceptions import best_match
+
+from .models import PROJECT_ROOT, content_fingerprint
+from .schema_codegen import CACHE_DIR, UnsupportedSchemaError, load_validator
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_DIR = PROJECT_ROOT / 'schemas'
+# URLs the schemas use to $ref each other, mapped onto SCHEMA_DIR
+REMOTE_SCHEMA_ROOTS = (
+    'https://raw.githubusercontent.com/krisling049/warcry_data/main/schemas/',
+    'https://raw.githubusercontent.com/krisling049/warcry_data/main/data/schemas/',
+)
+MAX_REMEMBERED = 4096
+
+
+def local_schema_store(schema_dir: Path = SCHEMA_DIR) -> Dict[str, Any]:
+    """Map every URL a local schema is known by to its content, for ``RefResolver``."""
+    store = {}
+    for file in sorted(schema_dir.glob('*.json')):
+        schema = json.loads(file.read_text(encoding='utf-8'))
+        for root in REMOTE_SCHEMA_ROOTS:
+            store[f'{root}{file.name}'] = schema
+        schema_id = schema.get('$id', '')
+        if schema_id.endswith('.json'):
+            store.setdefault(schema_id, schema)
+    return store
+
+
+class SchemaRegistry:
+    """Cache of compiled validators and of data that already passed them.
+
+    A schema file is recompiled when its modification time changes. Validation is
+    serialised, as ``RefResolver`` keeps per-call state and is not thread-safe.
+
+    Args:
+        schema_dir: Folder whose schemas remote ``$ref`` URLs resolve to
+        max_remembered: Most (schema, data fingerprint) pairs remembered as valid
+        codegen_cache: Folder for generated validator source, or None to keep it in memory
+    """
+
+    def __init__(self, schema_dir: Path = SCHEMA_DIR, max_remembered: int = MAX_REMEMBERED,
+                 codegen_cache: Optional[Path] = CACHE_DIR):
+        self.schema_dir = schema_dir
+        self.max_remembered = max_remembered
+        self.codegen_cache = codegen_cache
+        self._store: Optional[Dict[str, Any]] = None
+        self._validators: Dict[Path, Tuple[int, Any, Optional[Callable[[Any], bool]]]] = {}
+        self._valid: 'OrderedDict[Tuple[Path, int, str], None]' = OrderedDict()
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def store(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._store is None:
+                self._store = local_schema_store(self.schema_dir)
+            return self._store
+
+    def _compiled(self, schema: Path) -> Tuple[Path, int, Any, Optional[Callable[[Any], bool]]]:
+        path = schema.resolve()
+        mtime_ns = path.stat().st_mtime_ns
+        cached = self._validators.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            schema_data = json.loads(path.read_text(encoding='utf-8'))
+            cls = jsonschema.validators.validator_for(schema_data)
+            cls.check_schema(schema_data)
+            resolver = jsonschema.RefResolver.from_schema(schema_data, store=self.store)
+            try:
+                generated = load_validator(path.name, schema_data, self.store, self.codegen_cache)
+            except UnsupportedSchemaError as e:
+                logger.debug(f"No generated validator for {path.name}: {e}")
+                generated = None
+            cached = self._validators[path] = (mtime_ns, cls(schema_data, resolver=resolver), generated)
+            logger.debug(f"Compiled {cls.__name__} for {path.name}")
+        return path, cached[0], cached[1], cached[2]
+
+    def validator(self, schema: Path) -> Any:
+        """The compiled validator for a schema file."""
+        with self._lock:
+            return self._compiled(schema)[2]
+
+    def generated(self, schema: Path) -> Optional[Callable[[Any], bool]]:
+        """The validator generated from a schema file, or None if it could not be generated."""
+        with self._lock:
+            return self._compiled(schema)[3]
+
+    def validate(self, data: Any, schema: Path) -> bool:
+        """Validate data against a schema file, like ``jsonschema.validate``.
+
+        Raises:
+            jsonschema.ValidationError: The best matching error if the data is invalid
+
+        Returns:
+            True if the data was validated, False if identical data had already passed
+        """
+        fingerprint = content_fingerprint(data)
+        with self._lock:
+            path, mtime_ns, validator, generated = self._compiled(schema)
+            key = (path, mtime_ns, fingerprint)
+            if key in self._valid:
+                self._valid.move_to_end(key)
+                self.hits += 1
+                return False
+
+            if generated is None or not generated(data):
+                error = best_match(validator.iter_errors(data))
+                if error is not None:
+                    raise error
+            self.misses += 1
+            self._valid[key] = None
+            if len(self._valid) > self.max_remembered:
+                self._valid.popitem(last=False)
+            return True
+
+    def errors(self, data: Any, schema: Path) -> List[jsonschema.ValidationError]:
+        """Every error in data against a schema file, in the order the validator finds them."""
+        with self._lock:
+            _, _, validator, generated = self._compiled(schema)
+            if generated is not None and generated(data):
+                return []
+            return list(validator.iter_errors(data))
+
+    def clear(self) -> None:
+        """Forget every compiled validator and remembered validation."""
+        with self._lock:
+            self._store = None
+            self._validators.clear()
+            self._valid.clear()
+
+
+# Shared by the whole process
+registry = SchemaRegistry()
+
+
+def get_validator(schema: Path) -> Any:
+    return registry.validator(schema)
+
+
+def validate(data: Any, schema: Path) -> bool:
+    """Validate data against a schema file with the shared registry, see ``SchemaRegistry.validate``."""
+    return registry.validate(data, schema)
@@ -0,0 +1,133 @@
+"""
+Serialised snapshots of the processed Warcry dataset.
+
+A snapshot stores the results of the pipeline stages (raw data, validation,
+typed objects with factions, subfactions and abilities linked) keyed by a hash
+of everything that produced them, so later runs on the same data can restore
+them instead of reparsing, revalidating and reassigning.
+
+The key has two parts: the environment (schemas, pipeline code and load
+filters) and the data files. A snapshot from the same environment but older
+data can still be restored and brought up to date one warband at a time.
+
+Snapshots are pickles and must only be loaded from a trusted local cache.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .models import PROJECT_ROOT
+
+logger = logging.getLogger(__name__)
+
+# Bump when the snapshot layout changes in a way the source hash would not catch
+SNAPSHOT_VERSION = 1
+SNAPSHOT_DIR = PROJECT_ROOT / '.cache' / 'snapshots'
+SCHEMA_DIR = PROJECT_ROOT / 'schemas'
+PACKAGE_DIR = Path(__file__).parent
+MAX_SNAPSHOTS = 5
+
+
+class SnapshotError(Exception):
+    """Raised when a snapshot cannot be read or does not match the current data."""
+    pass
+
+
+@dataclass
+class Snapshot:
+    """A versioned set of memoised stage results."""
+    content_hash: str
+    environment_hash: str
+    stages: Dict[str, Any]
+    version: int = SNAPSHOT_VERSION
+    created: str = field(default_factory=lambda: datetime.now().isoformat())
+
+
+def _hash_files(digest: 'hashlib._Hash', files: Iterable[Path], root: Path) -> None:
+    for file in sorted(files):
+        digest.update(file.relative_to(root).as_posix().encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(file.read_bytes())
+        digest.update(b'\0')
+
+
+def environment_hash(extra: str = '') -> str:
+    """Hash the schemas and pipeline source that process the data.
+
+    Args:
+        extra: Any further configuration that affects the result, e.g. load filters
+    """
+    digest = hashlib.sha256()
+    digest.update(f'v{SNAPSHOT_VERSION}|{extra}'.encode('utf-8'))
+    _hash_files(digest, SCHEMA_DIR.glob('*.json'), SCHEMA_DIR)
+    _hash_files(digest, PACKAGE_DIR.rglob('*.py'), PACKAGE_DIR)
+    return digest.hexdigest()
+
+
+def data_hash(sources: Dict[str, Dict[str, str]], environment: str) -> str:
+    """Combine per-file content hashes with the environment hash.
+
+    Args:
+        sources: Partition key -> {relative file path: sha256}, as from ``WarbandDataLoader.scan_sources``
+        environment: Result of ``environment_hash``
+    """
+    digest = hashlib.sha256(environment.encode('utf-8'))
+    for path, file_digest in sorted((p, d) for files in sources.values() for p, d in files.items()):
+        digest.update(f'{path}\0{file_digest}\0'.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def snapshot_path(environment: str, digest: str, snapshot_dir: Path = SNAPSHOT_DIR) -> Path:
+    return snapshot_dir / f'v{SNAPSHOT_VERSION}-{environment[:16]}-{digest[:32]}.pickle'
+
+
+def latest_snapshot(environment: str, snapshot_dir: Path = SNAPSHOT_DIR) -> Optional[Path]:
+    """The most recently written snapshot for this environment, if any."""
+    candidates = list(snapshot_dir.glob(f'v{SNAPSHOT_VERSION}-{environment[:16]}-*.pickle'))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+def save_snapshot(snapshot: Snapshot, dst: Path) -> Path:
+    """Write a snapshot atomically and prune the oldest snapshots in the same folder."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_suffix(f'.{os.getpid()}.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, dst)
+    logger.info(f"Saved snapshot {dst}")
+
+    existing = sorted(dst.parent.glob('*.pickle'), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in existing[MAX_SNAPSHOTS:]:
+        stale.unlink(missing_ok=True)
+    return dst
+
+
+def load_snapshot(src: Path, expected_environment: Optional[str] = None, expected_hash: Optional[str] = None) -> Snapshot:
+    """Read a snapshot, checking its version and optionally its hashes.
+
+    Raises:
+        SnapshotError: If the file is missing or unreadable, or is for another version, environment or data
+    """
+    if not src.is_file():
+        raise SnapshotError(f'No snapshot at {src}')
+    try:
+        with open(src, 'rb') as f:
+            snapshot = pickle.load(f)
+    except Exception as e:
+        raise SnapshotError(f'Could not read snapshot {src}: {e}') from e
+
+    if not isinstance(snapshot, Snapshot) or snapshot.version != SNAPSHOT_VERSION:
+        raise SnapshotError(f'Snapshot {src} has an unsupported version')
+    if expected_environment and snapshot.environment_hash != expected_environment:
+        raise SnapshotError(f'Snapshot {src} was built by different code or schemas')
+    if expected_hash and snapshot.content_hash != expected_hash:
+        raise SnapshotError(f'Snapshot {src} was built from different data')
+    return snapshot
@@ -0,0 +1,134 @@
+"""
+Staged execution for Warcry data pipelines.
+
+Pipeline steps are declared as stages with explicit dependencies. A stage runs
+the first time it is needed, after its dependencies, and its result is memoised
+until the stage is invalidated.
+"""
+
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+STAGE_PREFIX = 'stage_'
+
+
+class StageError(Exception):
+    """Raised when a stage is unknown or its dependencies are invalid."""
+    pass
+
+
+def stage(*depends_on: str) -> Callable:
+    """Declare a ``stage_<name>`` method as a pipeline stage.
+
+    Calling the decorated method runs the stage through ``StagedPipeline.run_stage``,
+    so dependencies run first and the result is memoised.
+
+    Args:
+        depends_on: Names of the stages that must complete before this one
+    """
+    def decorator(func: Callable) -> Callable:
+        if not func.__name__.startswith(STAGE_PREFIX):
+            raise StageError(f'Stage methods must be named {STAGE_PREFIX}<name>: {func.__name__}')
+        name = func.__name__[len(STAGE_PREFIX):]
+
+        @functools.wraps(func)
+        def wrapper(self: 'StagedPipeline') -> Any:
+            return self.run_stage(name)
+
+        wrapper.stage_name = name
+        wrapper.stage_func = func
+        wrapper.stage_dependencies = depends_on
+        return wrapper
+    return decorator
+
+
+class StagedPipeline:
+    """Mixin that runs ``@stage`` methods on demand, in dependency order, memoising results."""
+
+    stages: Dict[str, Tuple[Callable, Tuple[str, ...]]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        stages = {}
+        for klass in reversed(cls.__mro__):
+            for attr in vars(klass).values():
+                if hasattr(attr, 'stage_name'):
+                    stages[attr.stage_name] = (attr.stage_func, attr.stage_dependencies)
+        for name, (_, dependencies) in stages.items():
+            missing = [d for d in dependencies if d not in stages]
+            if missing:
+                raise StageError(f'Stage {name} depends on unknown stages: {missing}')
+        cls.stages = stages
+
+    def _stage_state(self) -> Tuple[Dict[str, Any], threading.RLock]:
+        lock = self.__dict__.get('_stage_lock') or self.__dict__.setdefault('_stage_lock', threading.RLock())
+        results = self.__dict__.setdefault('_stage_results', {})
+        return results, lock
+
+    def run_stage(self, name: str) -> Any:
+        """Run a stage and its dependencies if they have not run yet, and return its result."""
+        results, lock = self._stage_state()
+        if name in results:
+            return results[name]
+        if name not in self.stages:
+            raise StageError(f'Unknown stage: {name}')
+
+        with lock:
+            if name in results:
+                return results[name]
+            func, dependencies = self.stages[name]
+            for dependency in dependencies:
+                self.run_stage(dependency)
+
+            start = time.perf_counter()
+            result = func(self)
+            results[name] = result
+            logger.info(f"Stage {name} completed in {time.perf_counter() - start:.3f} seconds")
+            return result
+
+    def stage_completed(self, name: str) -> bool:
+        """Return True if the stage has run and not been invalidated since."""
+        results, _ = self._stage_state()
+        return name in results
+
+    def completed_stages(self) -> List[str]:
+        """Names of the stages that currently hold a result, in the order they completed."""
+        results, _ = self._stage_state()
+        return list(results)
+
+    def dependents(self, name: str) -> List[str]:
+        """All stages that depend on ``name``, directly or transitively."""
+        found = []
+        pending = [name]
+        while pending:
+            current = pending.pop()
+            for other, (_, dependencies) in self.stages.items():
+                if current in dependencies and other not in found:
+                    found.append(other)
+                    pending.append(other)
+        return found
+
+    def stage_results(self, *names: str) -> Dict[str, Any]:
+        """Return the memoised results of the named stages, running any that have not run yet."""
+        return {name: self.run_stage(name) for name in names}
+
+    def restore_stages(self, results: Dict[str, Any]) -> None:
+        """Install previously computed stage results, e.g. from a snapshot."""
+        unknown = [name for name in results if name not in self.stages]
+        if unknown:
+            raise StageError(f'Unknown stages: {unknown}')
+        stored, lock = self._stage_state()
+        with lock:
+            stored.update(results)
+
+    def invalidate(self, name: str) -> None:
+        """Drop the memoised result of a stage and of every stage that depends on it."""
+        results, lock = self._stage_state()
+        with lock:
+            for stale in [name, *self.dependents(name)]:
+                results.pop(stale, None)
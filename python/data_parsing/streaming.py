@@ -0,0 +1,254 @@
+"""
+Bounded-memory streaming export of Warcry data.
+
+Warbands are processed one partition (data folder) at a time: loaded,
+validated, linked to factions and abilities, exported and then released.
+Only the factions and universal abilities, which every warband may need, stay
+in memory for the whole run.
+
+Aggregate outputs are written incrementally. Outputs kept in source order
+(``fighters_tts.json``) are appended as each partition finishes; sorted outputs
+(``fighters.json`` and the ability files) are spilled to disk as sorted runs
+and merged into place at the end, so peak memory depends on the largest
+warband rather than the size of the whole dataset.
+"""
+
+import heapq
+import json
+import logging
+import os
+import tempfile
+from contextlib import ExitStack
+from copy import deepcopy
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import schema_registry
+from .abilities import Ability
+from .constants import AbilityCosts, DataTypes, FileTypes, OutputFiles, SpecialWarbands
+from .data_loading import WarbandDataLoader
+from .data_processing import WarbandDataProcessor
+from .exporters import TTSExporter
+from .factions import Factions
+from .fighters import Fighter, Fighters, sort_fighters
+from .models import JSONArrayWriter, load_json_bytes
+from .partitions import Partition, partition_key
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_OPEN_RUNS = 64
+
+
+def fighter_sort_key(fighter: Dict[str, Any]) -> Tuple:
+    """Same order as ``sort_fighters``."""
+    return fighter['grand_alliance'], fighter['warband'], fighter['points']
+
+
+def ability_sort_key(ability: Dict[str, Any]) -> str:
+    """Same order as the ability exports."""
+    return ability.get('warband', '')
+
+
+class ExternalSorter:
+    """Stable external merge sort of JSON-serialisable items.
+
+    Each run is sorted in memory and spilled to a temporary file; iterating merges
+    the runs lazily. Items with equal keys keep the order of the runs they were added
+    in, so adding runs in load order gives the same result as a stable in-memory sort.
+
+    Args:
+        key: Sort key
+        directory: Folder for the spilled runs
+        max_open_runs: Most runs merged at once; more runs are merged in several passes
+    """
+
+    def __init__(self, key: Callable[[Any], Any], directory: Path, max_open_runs: int = DEFAULT_MAX_OPEN_RUNS):
+        self.key = key
+        self.directory = directory
+        self.max_open_runs = max_open_runs
+        self.runs: List[Path] = []
+
+    def _write_run(self, items: Iterable[Any]) -> Path:
+        fd, name = tempfile.mkstemp(suffix='.jsonl', dir=self.directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            for item in items:
+                f.write(json.dumps(item, ensure_ascii=False))
+                f.write('\n')
+        return Path(name)
+
+    @staticmethod
+    def _read_run(path: Path) -> Iterator[Any]:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                yield json.loads(line)
+
+    def _merge(self, runs: List[Path]) -> Iterator[Any]:
+        return heapq.merge(*(self._read_run(run) for run in runs), key=self.key)
+
+    def add_run(self, items: Iterable[Any]) -> None:
+        """Sort a batch of items and spill it to disk."""
+        items = sorted(items, key=self.key)
+        if items:
+            self.runs.append(self._write_run(items))
+
+    def __iter__(self) -> Iterator[Any]:
+        runs = list(self.runs)
+        while len(runs) > self.max_open_runs:
+            runs = [
+                self._write_run(self._merge(runs[i:i + self.max_open_runs]))
+                for i in range(0, len(runs), self.max_open_runs)
+            ]
+        return self._merge(runs)
+
+
+class StreamingExporter:
+    """Processes and exports one warband partition at a time.
+
+    Produces the same JSON and TTS outputs as ``WarbandDataPipeline``. The
+    DataFrame-based HTML and CSV exports need the whole fighter table at once and
+    are not written in streaming mode.
+
+    Args:
+        loader: Loader for the data folder, including any filters or bundle
+        schema: Schema each partition is validated against
+        tts_exporter: TTS exporter, defaults to a new one
+        max_open_runs: Most spilled runs merged at once
+    """
+
+    def __init__(self, loader: WarbandDataLoader, schema: Path, tts_exporter: Optional[TTSExporter] = None,
+                 max_open_runs: int = DEFAULT_MAX_OPEN_RUNS):
+        self.loader = loader
+        self.schema = schema
+        self.tts_exporter = tts_exporter or TTSExporter()
+        self.max_open_runs = max_open_runs
+
+    def iter_partition_files(self) -> Iterator[Tuple[str, List[Path]]]:
+        """Yield (partition key, files) in load order without reading any file."""
+        current_key, files = None, []
+        for file in self.loader.iter_data_files():
+            key = partition_key(self.loader.relative_path(file))
+            if key != current_key and files:
+                yield current_key, files
+                files = []
+            current_key = key
+            files.append(file)
+        if files:
+            yield current_key, files
+
+    def load_factions(self) -> Factions:
+        """Load every faction file; factions are small and shared by all partitions."""
+        factions = [
+            load_json_bytes(self.loader.read_bytes(file), file)
+            for file in self.loader.iter_data_files()
+            if file.name.endswith(FileTypes.FACTION.value)
+        ]
+        return Factions(factions)
+
+    def load_partition(self, key: str, files: List[Path]) -> Optional[Partition]:
+        """Load, assign IDs to and validate one partition."""
+        partition = self.loader.load_partitions(files).get(key)
+        if partition is None:
+            return None
+        WarbandDataProcessor.assign_ids(partition.data)
+        schema_registry.validate(partition.data, self.schema)
+        partition.validated = True
+        return partition
+
+    def export(self, dst_root: Path, localisation_files: Iterable[Path] = ()) -> Dict[str, int]:
+        """Write the JSON and TTS outputs to ``dst_root``.
+
+        Args:
+            dst_root: Output folder
+            localisation_files: Localisation files, each written to ``<dst_root>/<language>/abilities.json``
+
+        Returns:
+            Number of items written per output file name
+        """
+        factions = self.load_factions()
+        partition_files = list(self.iter_partition_files())
+
+        universal_abilities: List[Ability] = []
+        universal_partition = None
+        for key, files in partition_files:
+            if key == SpecialWarbands.UNIVERSAL:
+                universal_partition = self.load_partition(key, files)
+                if universal_partition:
+                    universal_abilities = [Ability(a) for a in universal_partition.data[DataTypes.ABILITIES]]
+
+        with tempfile.TemporaryDirectory(prefix='warcry-stream-') as tmp:
+            fighter_runs = ExternalSorter(fighter_sort_key, Path(tmp), self.max_open_runs)
+            ability_runs = ExternalSorter(ability_sort_key, Path(tmp), self.max_open_runs)
+
+            with JSONArrayWriter(Path(dst_root, OutputFiles.FIGHTERS_TTS_JSON)) as tts:
+                seen_universal = False
+                for key, files in partition_files:
+                    if key == SpecialWarbands.UNIVERSAL:
+                        partition, seen_universal = universal_partition, True
+                    else:
+                        partition = self.load_partition(key, files)
+                    if partition is None:
+                        continue
+
+                    fighters = Fighters([Fighter(f) for f in partition.data[DataTypes.FIGHTERS]])
+                    if fighters.fighters:
+                        # Keep the global load order, which decides the order abilities are linked in
+                        own_abilities = [Ability(a) for a in partition.data[DataTypes.ABILITIES]]
+                        abilities = (universal_abilities + own_abilities) if seen_universal \
+                            else (own_abilities + universal_abilities)
+                        processor = WarbandDataProcessor(fighters, abilities, factions)
+                        processor.assign_factions()
+                        processor.assign_abilities()
+                        tts.extend(self.tts_exporter.convert_to_tts_format(fighters))
+
+                    fighter_runs.add_run(sort_fighters([dict(sorted(f.items())) for f in partition.data[DataTypes.FIGHTERS]]))
+                    ability_runs.add_run(partition.data[DataTypes.ABILITIES])
+                    logger.info(f"Streamed partition {key}: {len(fighters.fighters)} fighters")
+
+            counts = {OutputFiles.FIGHTERS_TTS_JSON: tts.count}
+            with JSONArrayWriter(Path(dst_root, OutputFiles.FIGHTERS_JSON)) as writer:
+                writer.extend(fighter_runs)
+            counts[OutputFiles.FIGHTERS_JSON] = writer.count
+            counts.update(self._export_abilities(ability_runs, dst_root, localisation_files))
+
+        for name, count in counts.items():
+            logger.info(f"Streamed {count} items to {Path(dst_root, name)}")
+        return counts
+
+    def _export_abilities(self, abilities: Iterable[Dict[str, Any]], dst_root: Path,
+                          localisation_files: Iterable[Path]) -> Dict[str, int]:
+        """Write every ability output from a single pass over the sorted abilities."""
+        localisations = {
+            Path(file.stem, OutputFiles.ABILITIES_JSON).as_posix(): self.loader.load_localisation(file)
+            for file in localisation_files
+        }
+        with ExitStack() as stack:
+            def open_writer(name: str) -> JSONArrayWriter:
+                return stack.enter_context(JSONArrayWriter(Path(dst_root, name)))
+
+            all_abilities = open_writer(OutputFiles.ABILITIES_BATTLETRAITS_JSON)
+            abilities_only = open_writer(OutputFiles.ABILITIES_JSON)
+            battletraits = open_writer(OutputFiles.BATTLETRAITS_JSON)
+            localised = {name: (open_writer(name), data) for name, data in localisations.items()}
+
+            for ability in abilities:
+                all_abilities.write(ability)
+                if ability.get('cost') == AbilityCosts.BATTLETRAIT:
+                    battletraits.write(ability)
+                else:
+                    abilities_only.write(ability)
+                for writer, localisation in localised.values():
+                    translated = deepcopy(ability)
+                    ability_id = translated.get('_id')
+                    if ability_id in localisation:
+                        translated.update(localisation[ability_id])
+                    else:
+                        logger.warning(f"Localization not found for {ability_id} - {translated.get('name')}")
+                    writer.write(translated)
+
+        counts = {
+            OutputFiles.ABILITIES_BATTLETRAITS_JSON: all_abilities.count,
+            OutputFiles.ABILITIES_JSON: abilities_only.count,
+            OutputFiles.BATTLETRAITS_JSON: battletraits.count,
+        }
+        counts.update({name: writer.count for name, (writer, _) in localised.items()})
+        return counts
@@ -4,15 +4,23 @@ Validation architecture for Warcry data processing.
 Provides structured validation results and composable validators.
 """
 
-import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence
 
 import jsonschema
+import numpy as np
 
-from .constants import SchemaFiles
+from .constants import FileTypes, SchemaFiles
+from .models import PROJECT_DATA, FileLoadingError, load_json_file
+from . import schema_registry
+
+if TYPE_CHECKING:
+    from .business_rules import ColumnRule
+    from .fighter_table import FighterTable
 
 logger = logging.getLogger(__name__)
 
@@ -24,10 +32,23 @@ class ValidationError:
     path: str = ""
     value: Any = None
     schema_path: str = ""
-    
-    def __str__(self) -> str:
+    source: str = ""
+    index: Optional[int] = None
+    entity: str = ""
+
+    @property
+    def location(self) -> str:
+        """Where the error is, e.g. ``chaos/beasts_of_chaos/beasts_of_chaos_fighters.json[3].points``."""
+        location = self.source
+        if self.index is not None:
+            location += f"[{self.index}]"
         if self.path:
-            return f"Error at {self.path}: {self.message}"
+            location = f"{location}.{self.path}" if location else self.path
+        return location
+
+    def __str__(self) -> str:
+        if self.location:
+            return f"Error at {self.location}: {self.message}"
         return self.message
 
 
@@ -54,9 +75,9 @@ class ValidationResult:
     data_path: Optional[Path] = None
     items_validated: int = 0
     
-    def add_error(self, message: str, path: str = "", value: Any = None) -> None:
-        """Add a validation error."""
-        self.errors.append(ValidationError(message, path, value, str(self.schema_path or "")))
+    def add_error(self, message: str, path: str = "", value: Any = None, **location: Any) -> None:
+        """Add a validation error, optionally with its ``source``, ``index`` and ``entity``."""
+        self.errors.append(ValidationError(message, path, value, str(self.schema_path or ""), **location))
         self.is_valid = False
     
     def add_warning(self, message: str, path: str = "", value: Any = None) -> None:
@@ -106,7 +127,8 @@ class SchemaValidator:
         """Initialize with schema file path."""
         self.schema_path = schema_path
         try:
-            self.schema = json.loads(schema_path.read_text(encoding='utf-8'))
+            self.validator = schema_registry.get_validator(schema_path)
+            self.schema = self.validator.schema
         except Exception as e:
             raise ValueError(f"Failed to load schema from {schema_path}: {e}")
     
@@ -120,7 +142,7 @@ class SchemaValidator:
         
         try:
             # Validate against schema
-            jsonschema.validate(data, self.schema)
+            schema_registry.validate(data, self.schema_path)
             
             # Count items validated
             if isinstance(data, list):
@@ -150,51 +172,12 @@ class BusinessRuleValidator:
     def validate_fighter(self, fighter_data: Dict[str, Any]) -> ValidationResult:
         """Validate a fighter against business rules."""
         from .business_rules import ValidationRules
-        
+
         result = ValidationResult(is_valid=True, items_validated=1)
-        
-        # Validate points
-        points = fighter_data.get('points', 0)
-        if not ValidationRules.is_valid_points_value(points):
-            result.add_error(
-                f"Invalid points value: {points} (must be 0-2000)",
-                path="points",
-                value=points
-            )
-        
-        # Validate movement
-        movement = fighter_data.get('movement', 0)
-        if not ValidationRules.is_valid_movement(movement):
-            result.add_error(
-                f"Invalid movement value: {movement} (must be 1-12)",
-                path="movement", 
-                value=movement
-            )
-        
-        # Validate toughness
-        toughness = fighter_data.get('toughness', 0)
-        if not ValidationRules.is_valid_toughness(toughness):
-            result.add_error(
-                f"Invalid toughness value: {toughness} (must be 1-8)",
-                path="toughness",
-                value=toughness
-            )
-        
-        # Validate wounds
-        wounds = fighter_data.get('wounds', 0)
-        if not ValidationRules.is_valid_wounds(wounds):
-            result.add_error(
-                f"Invalid wounds value: {wounds} (must be 1-50)",
-                path="wounds",
-                value=wounds
-            )
-        
-        # Check for missing required fields
-        required_fields = ['_id', 'name', 'warband', 'grand_alliance', 'weapons', 'runemarks']
-        for field in required_fields:
-            if field not in fighter_data or not fighter_data[field]:
-                result.add_error(f"Missing required field: {field}", path=field)
-        
+        for rule in ValidationRules.fighter_rules():
+            value = fighter_data.get(rule.field, 0)
+            if not rule.allows(value):
+                result.add_error(rule.message(value), path=rule.field, value=value)
         return result
     
     def validate_ability(self, ability_data: Dict[str, Any]) -> ValidationResult:
@@ -203,9 +186,9 @@ class BusinessRuleValidator:
         
         # Check for missing required fields
         required_fields = ['_id', 'name', 'warband', 'cost', 'description', 'runemarks']
-        for field in required_fields:
-            if field not in ability_data or not ability_data[field]:
-                result.add_error(f"Missing required field: {field}", path=field)
+        for field_name in required_fields:
+            if field_name not in ability_data or not ability_data[field_name]:
+                result.add_error(f"Missing required field: {field_name}", path=field_name)
         
         # Validate cost format
         cost = ability_data.get('cost', '')
@@ -220,6 +203,165 @@ class BusinessRuleValidator:
         return result
 
 
+class BulkFighterValidator:
+    """Business-rule validation of many fighters at once.
+
+    Each rule is evaluated as one NumPy mask over a whole column, and errors are
+    created only for the rows that break it, so validating a large homebrew set
+    costs a pass per column rather than a ``ValidationResult`` per fighter.
+
+    Args:
+        rules: Declarative column rules, defaults to ``ValidationRules.fighter_rules()``
+    """
+
+    def __init__(self, rules: Optional[Sequence['ColumnRule']] = None):
+        from .business_rules import ValidationRules
+
+        self.rules: List['ColumnRule'] = list(ValidationRules.fighter_rules() if rules is None else rules)
+
+    def add_rule(self, rule: 'ColumnRule') -> None:
+        """Add a constraint, e.g. ``RangeRule('points', 0, 500)`` for a low-points format."""
+        self.rules.append(rule)
+
+    @staticmethod
+    def column(fighters_data: List[Dict[str, Any]], rule: 'ColumnRule') -> np.ndarray:
+        """One field of every fighter as the column type a rule evaluates.
+
+        Range rules get a float column with missing values as 0 and non-numbers as NaN;
+        required rules get a boolean column of whether each value is present and not empty.
+        """
+        from .business_rules import RangeRule, is_number
+
+        field_name = rule.field
+        if isinstance(rule, RangeRule):
+            values = (f.get(field_name, 0) for f in fighters_data)
+            return np.fromiter((v if is_number(v) else np.nan for v in values),
+                               dtype=np.float64, count=len(fighters_data))
+        return np.fromiter((bool(f.get(field_name)) for f in fighters_data), dtype=bool, count=len(fighters_data))
+
+    def validate(self, fighters_data: List[Dict[str, Any]]) -> ValidationResult:
+        """Validate raw fighter dicts; errors are ordered by fighter, then by rule."""
+        columns = [self.column(fighters_data, rule) for rule in self.rules]
+        return self._report(self.rules, columns, len(fighters_data),
+                            lambda row, rule: fighters_data[row].get(rule.field, 0))
+
+    def validate_table(self, table: 'FighterTable') -> ValidationResult:
+        """Validate the numeric range rules against a ``FighterTable``'s stat columns.
+
+        A table is built from ``Fighter`` objects, so required fields are always present
+        and only range rules on its stat columns are evaluated.
+        """
+        from .business_rules import RangeRule
+
+        rules = [r for r in self.rules if isinstance(r, RangeRule) and r.field in table.stats]
+        columns = [table.stats[r.field].astype(np.float64) for r in rules]
+        return self._report(rules, columns, len(table), lambda row, rule: table.stats[rule.field][row].item())
+
+    @staticmethod
+    def _report(rules: Sequence['ColumnRule'], columns: List[np.ndarray], rows: int,
+                value_at: Callable[[int, 'ColumnRule'], Any]) -> ValidationResult:
+        """Turn the violating rows of each rule's column into errors."""
+        result = ValidationResult(is_valid=True, items_validated=rows)
+        if not rules or not rows:
+            return result
+        violations = np.column_stack([rule.violations(col) for rule, col in zip(rules, columns)])
+        # Row-major order: by fighter, then by rule
+        for row, rule_index in zip(*np.nonzero(violations)):
+            rule = rules[rule_index]
+            value = value_at(int(row), rule)
+            result.add_error(rule.message(value), path=rule.field, value=value, index=int(row))
+        return result
+
+
+FILE_SCHEMAS = {
+    FileTypes.FIGHTERS.value: SchemaFiles.FIGHTER,
+    FileTypes.ABILITIES.value: SchemaFiles.ABILITY,
+    FileTypes.FACTION.value: SchemaFiles.FACTION,
+}
+
+
+def schema_for_file(file: Path) -> Optional[Path]:
+    """The per-entity schema for a data file, or None if it is not a data file."""
+    return next((schema for suffix, schema in FILE_SCHEMAS.items() if file.name.endswith(suffix)), None)
+
+
+def entity_label(entity: Any) -> str:
+    """Readable name of a fighter, ability or faction, e.g. ``chaos/Beasts of Chaos/Gor``."""
+    if not isinstance(entity, dict):
+        return ""
+    return "/".join(str(entity[k]) for k in ('grand_alliance', 'warband', 'name') if k in entity)
+
+
+def validate_file(file: Path, source: str = "") -> ValidationResult:
+    """Validate every entity in one data file against its schema.
+
+    Module-level so it can be sent to worker processes.
+
+    Args:
+        file: Fighters, abilities or faction file
+        source: Name to report errors under, defaults to the file path
+    """
+    schema = schema_for_file(file)
+    source = source or file.as_posix()
+    result = ValidationResult(is_valid=True, schema_path=schema, data_path=file)
+    try:
+        content = load_json_file(file)
+    except FileLoadingError as e:
+        result.add_error(str(e), source=source)
+        return result
+
+    # Fighter and ability files hold arrays, faction files a single object
+    entities = enumerate(content) if isinstance(content, list) else [(None, content)]
+    for index, entity in entities:
+        for error in schema_registry.registry.errors(entity, schema):
+            result.add_error(
+                error.message, ".".join(str(p) for p in error.absolute_path), error.instance,
+                source=source, index=index, entity=entity_label(entity)
+            )
+        result.items_validated += 1
+    return result
+
+
+class ParallelFileValidator:
+    """Validates data files across a process pool, one task per file.
+
+    Results are merged in the order the files were given, so the report does not
+    depend on which worker finished first.
+
+    Args:
+        data_root: Folder errors are reported relative to
+        max_workers: Worker processes, defaults to the CPU count; 1 validates in this process
+    """
+
+    def __init__(self, data_root: Path = PROJECT_DATA, max_workers: Optional[int] = None):
+        self.data_root = data_root
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def source_name(self, file: Path) -> str:
+        try:
+            return file.relative_to(self.data_root).as_posix()
+        except ValueError:
+            return file.as_posix()
+
+    def validate_files(self, files: Iterable[Path]) -> ValidationResult:
+        """Validate data files, skipping any file that is not a fighters, abilities or faction file."""
+        files = [f for f in files if schema_for_file(f)]
+        sources = [self.source_name(f) for f in files]
+        workers = min(self.max_workers, len(files))
+        if workers <= 1:
+            results = list(map(validate_file, files, sources))
+        else:
+            chunksize = max(1, len(files) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(validate_file, files, sources, chunksize=chunksize))
+            logger.debug(f"Validated {len(files)} files across {workers} processes")
+
+        merged = ValidationResult(is_valid=True, data_path=self.data_root)
+        for result in results:
+            merged.merge(result)
+        return merged
+
+
 class CompositeValidator:
     """Combines multiple validators for comprehensive validation."""
     
@@ -233,6 +375,7 @@ class CompositeValidator:
             'abilities_aggregate': SchemaValidator(SchemaFiles.ABILITIES_AGGREGATE),
         }
         self.business_validator = BusinessRuleValidator()
+        self.bulk_fighter_validator = BulkFighterValidator()
     
     def validate_fighters(self, fighters_data: List[Dict[str, Any]], 
                          data_path: Optional[Path] = None) -> ValidationResult:
@@ -243,14 +386,15 @@ class CompositeValidator:
         schema_result = self.schema_validators['fighters_aggregate'].validate(fighters_data, data_path)
         result.merge(schema_result)
         
-        # Individual fighter validation
-        for i, fighter_data in enumerate(fighters_data):
-            fighter_result = self.business_validator.validate_fighter(fighter_data)
-            if not fighter_result.is_valid:
-                # Add index to error paths
-                for error in fighter_result.errors:
-                    error.path = f"[{i}].{error.path}" if error.path else f"[{i}]"
-                result.merge(fighter_result)
+        # Business rules, evaluated column by column; errors keep the "[<index>].<field>" paths
+        # this method has always reported
+        bulk_result = self.bulk_fighter_validator.validate(fighters_data)
+        for error in bulk_result.errors:
+            error.path = f"[{error.index}].{error.path}" if error.path else f"[{error.index}]"
+            error.index = None
+        # The schema result has already counted these fighters
+        bulk_result.items_validated = 0
+        result.merge(bulk_result)
         
         return result
     
@@ -276,6 +420,13 @@ class CompositeValidator:
         
         return result
     
+    def validate_files(self, files: Iterable[Path], data_root: Path = PROJECT_DATA,
+                       max_workers: Optional[int] = None) -> ValidationResult:
+        """Schema-validate source data files in parallel, reporting errors by file and array index."""
+        result = ParallelFileValidator(data_root, max_workers).validate_files(files)
+        logger.info(result.summary())
+        return result
+
     def validate_all_data(self, data: Dict[str, List[Dict[str, Any]]]) -> ValidationResult:
         """Validate all data types in a combined result."""
         result = ValidationResult(is_valid=True)
@@ -6,28 +6,70 @@ Replaces the monolithic WarbandsJSONDataPayload with a clean, focused architectu
 
 import logging
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, NamedTuple, Sequence
 
 import jsonschema
+import pandas as pd
 
 from .abilities import Ability
-from .constants import FileExtensions, OutputFiles
-from .data_loading import WarbandDataLoader
+from .bundle import DataBundle
+from .constants import FileExtensions, OutputFiles, DataTypes
+from .data_loading import WarbandDataLoader, DataFilter
 from .data_processing import WarbandDataProcessor
 from .exporters import JSONExporter, TTSExporter, HTMLExporter
-from .factions import Factions
-from .fighters import Fighters
-from .models import DataPayload, PROJECT_DATA, PROJECT_ROOT, load_json_file, LOCALISATION_DATA
+from .exporters.html_exporter import TABULAR_WRITERS
+from .factions import Faction, Factions
+from .fighter_table import FighterTable
+from .fighters import Fighter, Fighters, fighters_frame
+from .fingerprints import DatasetFingerprints
+from .frozen import FrozenDataset
+from .indexing import DataIndex, FighterQuery
+from .layers import layer_path, resolve_layers
+from .models import DataPayload, PROJECT_DATA, PROJECT_ROOT, LOCALISATION_DATA
+from .partitions import PartitionedData, merge_partitions, changed_partitions
+from . import schema_registry
+from .snapshots import (
+    Snapshot, SnapshotError, SNAPSHOT_DIR, environment_hash, data_hash, snapshot_path, latest_snapshot,
+    save_snapshot, load_snapshot
+)
+from .scheduler import ScheduleReport, Task, TaskScheduler, with_prerequisites
+from .stages import StagedPipeline, stage
+from .streaming import StreamingExporter
 
 logger = logging.getLogger(__name__)
 
 
-class WarbandDataPipeline(DataPayload):
+class ModelData(NamedTuple):
+    """Typed data objects built from the raw data."""
+    fighters: Fighters
+    abilities: List[Ability]
+    factions: Factions
+
+
+class WarbandDataPipeline(StagedPipeline, DataPayload):
     """
     Main orchestrator for warband data processing.
     
     Coordinates data loading, processing, validation and export operations
     using focused, single-responsibility components.
+
+    Work is split into stages that run on demand and are memoised:
+
+        load -> validate -> frame
+        load -> validate -> model -> process -> index, table
+        load -> validate -> model -> fingerprints
+
+    Typed objects are only built from data that passed validation, so anything
+    read through them (fighters, queries, fingerprints, ``freeze``) raises
+    ``jsonschema.ValidationError`` instead of returning invalid data.
+
+    Constructing the pipeline does no work. Each export runs only the stages it
+    needs, e.g. ``export_battletraits_json`` loads and validates but never builds
+    fighters or assigns abilities.
+
+    With ``overlays``, the data is resolved from ``src`` plus the overlay folders (see
+    ``layers``). The base layer is loaded and validated by a separate pipeline, which
+    can be shared between overlay combinations through ``with_overlays``.
     """
     
     def __init__(
@@ -35,61 +77,375 @@ class WarbandDataPipeline(DataPayload):
         src: Path = PROJECT_DATA,
         schema: Path = Path(PROJECT_ROOT, 'schemas', 'warband_schema.json'),
         src_format: str = 'json',
-        filter_string: str = '*.json'
+        filter_string: str = '*.json',
+        data_filter: Optional[DataFilter] = None,
+        bundle: Optional[DataBundle] = None,
+        overlays: Sequence[Path] = (),
+        base: Optional['WarbandDataPipeline'] = None
     ):
         if not src.is_dir():
             raise TypeError(f'src must be a dir: {src}')
         
         # Initialize components
-        self.loader = WarbandDataLoader(src, filter_string)
+        self.loader = WarbandDataLoader(src, filter_string, data_filter, bundle)
+        self.overlay_loaders = [WarbandDataLoader(Path(o), filter_string, data_filter) for o in overlays]
+        if self.overlay_loaders and base is None:
+            base = WarbandDataPipeline(src, schema, src_format, filter_string, data_filter, bundle)
+        self.base = base if self.overlay_loaders else None
         self.json_exporter = JSONExporter()
         self.tts_exporter = TTSExporter()
         self.html_exporter = HTMLExporter()
         
-        # Load and process data
-        super().__init__(src, schema, src_format)
-        
-        # Create typed data objects
-        self.fighters = Fighters(self.data['fighters'])
-        self.abilities = [Ability(x) for x in self.data['abilities']]
-        self.factions = Factions(self.data['factions'])
-        
-        # Process the data
-        self.processor = WarbandDataProcessor(self.fighters, self.abilities, self.factions)
-        self.processor.process_all(self.data)
+        # DataPayload.__init__ loads and validates eagerly, so its attributes are set here
+        # and loading is left to the stages
+        self.src = src
+        self.src_format = src_format
+        self.schema = schema
 
     def __repr__(self):
+        if not self.stage_completed('model'):
+            return f'WarbandDataPipeline(src={self.src}, completed_stages={self.completed_stages()})'
         return f'WarbandDataPipeline(fighters={len(self.fighters.fighters)}, abilities={len(self.abilities)}, factions={len(self.factions.factions)})'
 
+    # Stages
+    @stage()
+    def stage_load(self) -> PartitionedData:
+        """Load raw data per warband folder and give placeholder entities an _id.
+
+        With overlays, the validated base layer is reused and the overlays resolved over it.
+        """
+        if self.base is None:
+            loaded = self.loader.load_partitioned_data()
+            WarbandDataProcessor.assign_ids(loaded.data)
+            return loaded
+
+        self.base.stage_validate()
+        overlays = []
+        for loader in self.overlay_loaders:
+            overlay = loader.load_partitioned_data()
+            WarbandDataProcessor.assign_ids(overlay.data)
+            overlays.append(overlay)
+        return resolve_layers(self.base.stage_load(), overlays)
+
+    @stage('load')
+    def stage_validate(self) -> bool:
+        """Validate the raw data against the schema.
+
+        Only partitions that have not been validated yet are checked, so after a
+        ``refresh`` just the changed warbands are revalidated.
+        """
+        pending = [p for p in self.stage_load().partitions.values() if not p.validated]
+        validated = 0
+        for partition in pending:
+            try:
+                validated += schema_registry.validate(partition.data, self.schema)
+            except jsonschema.ValidationError:
+                logger.error(f"Validation failed for {partition.key}")
+                raise
+            partition.validated = True
+        if pending:
+            logger.info(f"Data validation passed ({validated} of {len(pending)} partitions checked, rest unchanged)")
+        return True
+
+    @stage('validate')
+    def stage_model(self) -> ModelData:
+        """Create typed data objects from the validated data, reusing those of partitions that have not changed."""
+        partitions = self.stage_load().partitions.values()
+        for partition in partitions:
+            if partition.fighters is None:
+                partition.fighters = [Fighter(x) for x in partition.data[DataTypes.FIGHTERS]]
+                partition.abilities = [Ability(x) for x in partition.data[DataTypes.ABILITIES]]
+        return ModelData(
+            fighters=Fighters([f for p in partitions for f in p.fighters]),
+            abilities=[a for p in partitions for a in p.abilities],
+            factions=Factions(self.data[DataTypes.FACTIONS])
+        )
+
+    @stage('model')
+    def stage_process(self) -> WarbandDataProcessor:
+        """Assign factions and abilities to fighters."""
+        model = self.stage_model()
+        for fighter in model.fighters.fighters:
+            # Fighters reused from unchanged partitions carry assignments from a previous run
+            fighter.faction = None
+            fighter.subfaction = None
+            fighter.abilities = []
+        processor = WarbandDataProcessor(model.fighters, model.abilities, model.factions)
+        processor.assign_factions()
+        processor.assign_abilities()
+        return processor
+
+    @stage('process')
+    def stage_index(self) -> DataIndex:
+        """Build lookup indexes over the processed data."""
+        return DataIndex(self.fighters, self.abilities, self.factions)
+
+    @stage('model')
+    def stage_fingerprints(self) -> DatasetFingerprints:
+        """Roll up the entity fingerprints per warband, grand alliance and dataset."""
+        model = self.stage_model()
+        return DatasetFingerprints.from_models(model.fighters, model.abilities, model.factions)
+
+    @stage('process')
+    def stage_table(self) -> FighterTable:
+        """Build the columnar fighter table over the processed data."""
+        return FighterTable.from_fighters(self.fighters)
+
+    @stage('validate')
+    def stage_frame(self) -> pd.DataFrame:
+        """Flatten the fighters into the DataFrame every tabular export is written from."""
+        return fighters_frame(self.data[DataTypes.FIGHTERS])
+
+    def refresh(self) -> List[str]:
+        """Bring the loaded data up to date with the files on disk.
+
+        Only warband folders whose files were added, removed or changed are reloaded.
+        Validation and model building then run for those partitions alone, while
+        faction and ability assignment is redone for the whole (cheap) dataset.
+
+        Returns:
+            Keys of the partitions that changed, e.g. ``['chaos/beasts_of_chaos']``
+        """
+        if not self.stage_completed('load'):
+            self.stage_load()
+            return list(self.stage_load().partitions)
+
+        if self.base is not None:
+            # Resolving the overlays is cheap, so only the base layer is refreshed incrementally
+            changed = self.base.refresh()
+            self.invalidate('load')
+            return changed
+
+        loaded = self.stage_load()
+        if self.loader.bundle:
+            self.loader.bundle.expire()
+        current = self.loader.scan_sources()
+        changed = changed_partitions({k: p.files for k, p in loaded.partitions.items()}, current)
+        if not changed:
+            return []
+
+        files = [self.src / path for key in changed if key in current for path in current[key]]
+        reloaded = self.loader.load_partitions(files)
+        WarbandDataProcessor.assign_ids(merge_partitions(reloaded.values()))
+        loaded.replace_partitions({
+            key: reloaded[key] if key in reloaded else loaded.partitions[key]
+            for key in current
+            if key in reloaded or key in loaded.partitions
+        })
+        logger.info(f"Refreshed {len(changed)} changed partitions: {changed}")
+
+        # Drops the model and everything built on it too
+        self.invalidate('validate')
+        return changed
+
+    def source_hashes(self) -> Dict[str, str]:
+        """Relative data file path -> sha256 for every loaded source file."""
+        return self.stage_load().source_hashes()
+
+    def scan_sources(self) -> Dict[str, Dict[str, str]]:
+        """Hash the current source files of every layer without parsing them.
+
+        Returns:
+            Partition key -> {source key: sha256}, overlay files keyed by ``layers.layer_path``
+        """
+        sources = self.loader.scan_sources()
+        for layer, loader in enumerate(self.overlay_loaders, 1):
+            for key, files in loader.scan_sources().items():
+                sources.setdefault(key, {}).update({layer_path(layer, p): d for p, d in files.items()})
+        return sources
+
+    def with_overlays(self, *overlays: Path) -> 'WarbandDataPipeline':
+        """A pipeline over this one's data plus ``overlays``, sharing this pipeline's loaded base layer.
+
+        Example:
+            base = WarbandDataPipeline()
+            errata = base.with_overlays(Path('overrides/errata'))
+            homebrew = base.with_overlays(Path('overrides/errata'), Path('overrides/homebrew'))
+        """
+        if self.base is not None:
+            return self.base.with_overlays(*[l.src for l in self.overlay_loaders], *overlays)
+        return WarbandDataPipeline(
+            self.src, self.schema, self.src_format, self.loader.filter_str, self.loader.data_filter,
+            self.loader.bundle, overlays=overlays, base=self
+        )
+
+    # Stage results
+    @property
+    def data(self) -> Dict[str, List[Any]]:
+        return self.stage_load().data
+
+    @property
+    def fighters(self) -> Fighters:
+        return self.stage_process().fighters
+
+    @property
+    def abilities(self) -> List[Ability]:
+        return self.stage_process().abilities
+
+    @property
+    def factions(self) -> Factions:
+        return self.stage_process().factions
+
+    @property
+    def processor(self) -> WarbandDataProcessor:
+        return self.stage_process()
+
+    @property
+    def index(self) -> DataIndex:
+        return self.stage_index()
+
+    @property
+    def fighter_table(self) -> FighterTable:
+        return self.stage_table()
+
+    @property
+    def fighters_frame(self) -> pd.DataFrame:
+        return self.stage_frame()
+
+    @property
+    def fingerprints(self) -> DatasetFingerprints:
+        return self.stage_fingerprints()
+
+    def warband_fingerprint(self, warband: str) -> Optional[str]:
+        """Roll-up fingerprint of a warband's fighters, abilities and faction, or None if unknown."""
+        return self.fingerprints.warbands.get(warband)
+
+    def grand_alliance_fingerprint(self, grand_alliance: str) -> Optional[str]:
+        """Roll-up fingerprint of everything in a grand alliance, or None if unknown."""
+        return self.fingerprints.grand_alliances.get(grand_alliance)
+
+    # Lookups
+    def get_fighter(self, _id: str) -> Optional[Fighter]:
+        """Return the fighter with the given _id, or None."""
+        position = self.index.fighters.by_id.get(_id)
+        return None if position is None else self.fighters.fighters[position]
+
+    def get_ability(self, _id: str) -> Optional[Ability]:
+        """Return the ability with the given _id, or None."""
+        return self.index.abilities_by_id.get(_id)
+
+    def get_faction(self, warband: str) -> Optional[Faction]:
+        """Return the faction for the given warband, or None."""
+        return self.index.factions_by_warband.get(warband)
+
+    def freeze(self) -> FrozenDataset:
+        """Build an immutable copy of the processed data that is safe to share between threads."""
+        return FrozenDataset.from_pipeline(self)
+
+    def query_fighters(self) -> FighterQuery:
+        """Start an indexed fighter query, e.g. ``query_fighters().where(warband='Kruleboyz').all()``."""
+        return self.index.query_fighters()
+
+    # Snapshots
+    SNAPSHOT_STAGES = ('load', 'validate', 'model', 'process')
+
+    def environment_hash(self) -> str:
+        """Hash of the filters, schemas and code that this pipeline's results depend on."""
+        return environment_hash(
+            f'{self.loader.filter_str}|{self.loader.data_filter.cache_key()}|{self.schema.name}|layers={len(self.overlay_loaders)}'
+        )
+
+    def content_hash(self) -> str:
+        """Hash of the source files plus everything in ``environment_hash``."""
+        return data_hash(self.scan_sources(), self.environment_hash())
+
+    def save_snapshot(self, dst: Optional[Path] = None) -> Path:
+        """Run the processing stages if needed and save them as a snapshot.
+
+        Args:
+            dst: Snapshot file, defaults to a file named after the content hash in ``SNAPSHOT_DIR``
+        """
+        environment = self.environment_hash()
+        digest = data_hash({k: p.files for k, p in self.stage_load().partitions.items()}, environment)
+        snapshot = Snapshot(
+            content_hash=digest,
+            environment_hash=environment,
+            stages=self.stage_results(*self.SNAPSHOT_STAGES)
+        )
+        return save_snapshot(snapshot, dst or snapshot_path(environment, digest))
+
+    def load_snapshot(self, src: Optional[Path] = None, allow_stale: bool = False) -> bool:
+        """Restore the processing stages from a snapshot.
+
+        Args:
+            src: Snapshot file, defaults to the one for the current content hash
+            allow_stale: Accept a snapshot of older data built by the same code and schemas,
+                then ``refresh`` the warbands that have changed since
+
+        Returns:
+            True if a snapshot was restored, False otherwise
+        """
+        environment = self.environment_hash()
+        digest = self.content_hash()
+        try:
+            if src is None:
+                src = snapshot_path(environment, digest)
+                if allow_stale and not src.is_file():
+                    src = latest_snapshot(environment) or src
+            snapshot = load_snapshot(src, expected_environment=environment)
+        except SnapshotError as e:
+            logger.info(f"Snapshot not used: {e}")
+            return False
+
+        if snapshot.content_hash != digest and not allow_stale:
+            logger.info(f"Snapshot not used: {src} was built from different data")
+            return False
+
+        self.restore_stages(snapshot.stages)
+        logger.info(f"Restored stages {list(snapshot.stages)} from snapshot created {snapshot.created}")
+        if snapshot.content_hash != digest:
+            self.refresh()
+        return True
+
+    def use_snapshot(self, snapshot_dir: Path = SNAPSHOT_DIR) -> bool:
+        """Restore from the newest usable snapshot and save one for next time.
+
+        An exact match is restored as is. A snapshot of older data is restored and only
+        the changed warbands are reprocessed. Without either, everything is processed.
+
+        Returns:
+            True if a snapshot was restored, False if the data was processed from scratch
+        """
+        environment = self.environment_hash()
+        digest = self.content_hash()
+        exact = snapshot_path(environment, digest, snapshot_dir)
+        stale = latest_snapshot(environment, snapshot_dir)
+        if exact.is_file():
+            restored = self.load_snapshot(exact)
+        else:
+            restored = bool(stale) and self.load_snapshot(stale, allow_stale=True)
+        if not exact.is_file() or not restored:
+            self.save_snapshot(exact)
+        return restored
+
     def load_data(self) -> Dict[str, List[Any]]:
         """Load all warband data using the data loader."""
         return self.loader.load_all_data()
 
-    def validate_data(self):
-        """Validate the loaded data against the schema."""
-        schema_data = load_json_file(self.schema)
-        jsonschema.validate(self.data, schema_data)
+    def validate_data(self, data: Optional[Dict[str, List[Any]]] = None):
+        """Validate the loaded data, or the given subset of it, against the schema."""
+        schema_registry.validate(self.data if data is None else data, self.schema)
         logger.info("Data validation passed")
 
     # Export methods - JSON formats
     def export_fighters_json(self, dst: Path) -> None:
         """Export fighters to JSON format."""
-        self.validate_data()
+        self.stage_validate()
         self.json_exporter.export_fighters(self.data['fighters'], dst)
 
     def export_abilities_json(self, dst: Path, exclude_battletraits: bool = False) -> None:
         """Export abilities to JSON format."""
-        self.validate_data()
+        self.stage_validate()
         self.json_exporter.export_abilities(self.data['abilities'], dst, exclude_battletraits)
 
     def export_battletraits_json(self, dst: Path) -> None:
         """Export battletraits to JSON format."""
-        self.validate_data()
+        self.stage_validate()
         self.json_exporter.export_battletraits(self.data['abilities'], dst)
 
     def export_warbands_structure(self, dst: Path) -> None:
         """Export data in warband-organized structure."""
-        self.validate_data()
+        self.stage_validate()
         self.json_exporter.export_warbands_structure(
             self.data['fighters'], 
             self.data['abilities'], 
@@ -99,78 +455,128 @@ class WarbandDataPipeline(DataPayload):
 
     def export_legacy_fighters(self, dst_root: Path) -> None:
         """Export fighters in legacy format."""
-        self.validate_data()
+        self.stage_validate()
         self.json_exporter.export_legacy_fighters(self.data['fighters'], dst_root)
 
     # Export methods - TTS format
     def export_tts_fighters(self, dst: Path) -> None:
         """Export fighters in TTS format."""
-        self.validate_data()
+        self.stage_validate()
         self.tts_exporter.export_fighters(self.fighters, dst)
 
-    # Export methods - HTML/CSV/XLSX formats
+    # Export methods - HTML/CSV/XLSX formats, all written from the one flattened fighters frame
     def export_fighters_html(self, dst_root: Path) -> None:
         """Export fighters to HTML format."""
-        self.validate_data()
-        self.html_exporter.export_fighters_html(self.data['fighters'], dst_root)
+        self.html_exporter.export_fighters_html(self.stage_frame(), dst_root)
 
     def export_fighters_csv(self, dst_root: Path) -> None:
         """Export fighters to CSV format."""
-        self.validate_data()
-        self.html_exporter.export_fighters_csv(self.data['fighters'], dst_root)
+        self.html_exporter.export_fighters_csv(self.stage_frame(), dst_root)
 
     def export_fighters_xlsx(self, dst_root: Path) -> None:
         """Export fighters to XLSX format."""
-        self.validate_data()
-        self.html_exporter.export_fighters_xlsx(self.data['fighters'], dst_root)
+        self.html_exporter.export_fighters_xlsx(self.stage_frame(), dst_root)
 
     def export_fighters_markdown_table(self, dst_root: Path) -> None:
         """Export fighters to Markdown table format."""
-        self.validate_data()
-        self.html_exporter.export_fighters_markdown_table(self.data['fighters'], dst_root)
+        self.html_exporter.export_fighters_markdown_table(self.stage_frame(), dst_root)
+
+    def export_fighters_tables(self, dst_root: Path, table_formats: Sequence[str] = tuple(TABULAR_WRITERS),
+                               max_workers: int = 1) -> List[Path]:
+        """Export fighters to several tabular formats, optionally writing them concurrently."""
+        return self.html_exporter.export_fighters_tables(self.stage_frame(), dst_root, table_formats, max_workers)
 
     # Localization support
     def export_localized_data(self, loc_file: Path, dst: Path) -> None:
         """Export localized ability data."""
-        self.validate_data()
+        self.stage_validate()
         localization_data = self.loader.load_localisation(loc_file)
         self.json_exporter.export_localized_data(self.data['abilities'], localization_data, dst)
 
     # Convenience methods
-    def export_all_standard_formats(self, dst_root: Path) -> None:
+    def stage_tasks(self) -> List[Task]:
+        """Scheduler tasks for the stages exports depend on, named ``stage:<name>``."""
+        return [
+            Task('stage:validate', self.stage_validate),
+            Task('stage:process', self.stage_process),
+            Task('stage:frame', self.stage_frame, ('stage:validate',)),
+        ]
+
+    def standard_export_tasks(self, dst_root: Path) -> List[Task]:
+        """Scheduler tasks writing every standard output into ``dst_root``, after ``stage_tasks``."""
+        validated = ('stage:validate',)
+        return [
+            Task(OutputFiles.FIGHTERS_JSON,
+                 lambda: self.export_fighters_json(Path(dst_root, OutputFiles.FIGHTERS_JSON)), validated),
+            Task(OutputFiles.ABILITIES_JSON,
+                 lambda: self.export_abilities_json(Path(dst_root, OutputFiles.ABILITIES_JSON),
+                                                    exclude_battletraits=True), validated),
+            Task(OutputFiles.BATTLETRAITS_JSON,
+                 lambda: self.export_battletraits_json(Path(dst_root, OutputFiles.BATTLETRAITS_JSON)), validated),
+            Task(OutputFiles.ABILITIES_BATTLETRAITS_JSON,
+                 lambda: self.export_abilities_json(Path(dst_root, OutputFiles.ABILITIES_BATTLETRAITS_JSON),
+                                                    exclude_battletraits=False), validated),
+            Task(OutputFiles.FIGHTERS_TTS_JSON,
+                 lambda: self.export_tts_fighters(Path(dst_root, OutputFiles.FIGHTERS_TTS_JSON)),
+                 ('stage:validate', 'stage:process')),
+            Task(OutputFiles.FIGHTERS_HTML, lambda: self.export_fighters_html(dst_root), ('stage:frame',)),
+            Task(OutputFiles.FIGHTERS_CSV, lambda: self.export_fighters_csv(dst_root), ('stage:frame',)),
+            Task('warbands', lambda: self.export_warbands_structure(dst_root), validated),
+        ]
+
+    def localisation_export_tasks(self, dst_root: Path) -> List[Task]:
+        """Scheduler tasks writing the abilities in every localisation, after ``stage_tasks``."""
+        tasks = []
+        for loc_file in sorted(LOCALISATION_DATA.iterdir()):
+            if loc_file.is_file() and loc_file.suffix == FileExtensions.JSON:
+                dst = Path(dst_root, loc_file.stem, OutputFiles.ABILITIES_JSON)
+                tasks.append(Task(
+                    f'{loc_file.stem}/{OutputFiles.ABILITIES_JSON}',
+                    lambda loc_file=loc_file, dst=dst: self.export_localized_data(loc_file, dst),
+                    ('stage:validate',)
+                ))
+        return tasks
+
+    def run_export_tasks(self, tasks: List[Task], max_workers: int = 1) -> ScheduleReport:
+        """Run export tasks after the stages they depend on, with up to ``max_workers`` at once.
+
+        Raises:
+            TaskFailedError: Once every task not depending on a failed one has finished
+        """
+        report = TaskScheduler(max_workers).run(with_prerequisites(tasks, self.stage_tasks()))
+        logger.info(f"Export timings:\n{report.summary()}")
+        report.raise_for_failures()
+        return report
+
+    def export_all_standard_formats(self, dst_root: Path, max_workers: int = 1) -> None:
         """Export data in all standard formats.
         
-        This replaces the old write_to_disk method.
+        This replaces the old write_to_disk method. The outputs are independent, so with
+        ``max_workers`` above 1 they are written concurrently.
         """
         logger.info("Starting export of all standard formats")
-        
-        # JSON exports
-        self.export_fighters_json(Path(dst_root, 'fighters.json'))
-        self.export_abilities_json(Path(dst_root, 'abilities.json'), exclude_battletraits=True)
-        self.export_battletraits_json(Path(dst_root, 'battletraits.json'))
-        self.export_abilities_json(Path(dst_root, 'abilities_battletraits.json'), exclude_battletraits=False)
-        
-        # TTS export
-        self.export_tts_fighters(Path(dst_root, 'fighters_tts.json'))
-        
-        # Other formats
-        self.export_fighters_html(dst_root)
-        self.export_fighters_csv(dst_root)
-        
-        # Warband structure
-        self.export_warbands_structure(dst_root)
-        
+        self.run_export_tasks(self.standard_export_tasks(dst_root), max_workers)
         logger.info("Completed export of all standard formats")
 
-    def export_all_with_localization(self, dst_root: Path) -> None:
+    def export_all_with_localization(self, dst_root: Path, max_workers: int = 1) -> None:
         """Export all formats including localized versions."""
-        # Standard exports
-        self.export_all_standard_formats(dst_root)
-        
-        # Localized exports
-        for loc_file in LOCALISATION_DATA.iterdir():
-            if loc_file.is_file() and loc_file.suffix == FileExtensions.JSON:
-                lang = loc_file.stem
-                self.export_localized_data(loc_file, Path(dst_root, lang, OutputFiles.ABILITIES_JSON))
-        
+        logger.info("Starting export of all standard formats")
+        tasks = self.standard_export_tasks(dst_root) + self.localisation_export_tasks(dst_root)
+        self.run_export_tasks(tasks, max_workers)
         logger.info("Completed export including localization")
+
+    def export_streaming(self, dst_root: Path) -> Dict[str, int]:
+        """Export the JSON, TTS and localized outputs one warband partition at a time.
+
+        Peak memory depends on the largest warband rather than the whole dataset, and
+        none of this pipeline's stages are run. HTML and CSV are not written.
+
+        Raises:
+            ValueError: The pipeline has overlays, which streaming does not resolve
+        """
+        if self.overlay_loaders:
+            raise ValueError('Streaming export reads the base data only and cannot apply overlays')
+        localisation_files = [
+            f for f in sorted(LOCALISATION_DATA.iterdir()) if f.is_file() and f.suffix == FileExtensions.JSON
+        ]
+        return StreamingExporter(self.loader, self.schema, self.tts_exporter).export(dst_root, localisation_files)
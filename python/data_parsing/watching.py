@@ -0,0 +1,105 @@
+"""
+Polling file watcher for rebuilding Warcry data while it is being edited.
+
+Polls file modification times and sizes under a set of folders, so it works on
+any platform without extra dependencies. Bursts of saves are debounced into a
+single batch of changed paths.
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POLL_INTERVAL = 0.5
+DEFAULT_DEBOUNCE = 1.0
+
+FileState = Tuple[int, int]
+
+
+class DirectoryWatcher:
+    """Detects files added, removed or modified under one or more folders.
+
+    Args:
+        roots: Folders to watch recursively
+        suffixes: Only watch files with these suffixes, e.g. ``('.json',)``
+        poll_interval: Seconds between scans
+        debounce: Seconds without further changes before a batch is reported
+    """
+
+    def __init__(
+        self,
+        roots: Iterable[Path],
+        suffixes: Tuple[str, ...] = ('.json',),
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE
+    ):
+        self.roots = [Path(r) for r in roots]
+        self.suffixes = suffixes
+        self.poll_interval = poll_interval
+        self.debounce = debounce
+        self._state = self.scan()
+
+    def _scan_dir(self, directory: str, state: Dict[str, FileState]) -> None:
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.startswith('.'):
+                    self._scan_dir(entry.path, state)
+            elif entry.name.endswith(self.suffixes):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                state[entry.path] = (stat.st_mtime_ns, stat.st_size)
+
+    def scan(self) -> Dict[str, FileState]:
+        """Path -> (mtime, size) for every watched file."""
+        state: Dict[str, FileState] = {}
+        for root in self.roots:
+            self._scan_dir(str(root), state)
+        return state
+
+    def poll(self) -> Set[Path]:
+        """Paths that were added, removed or modified since the previous poll."""
+        current = self.scan()
+        previous = self._state
+        self._state = current
+        changed = {p for p, s in current.items() if previous.get(p) != s}
+        changed.update(p for p in previous if p not in current)
+        return {Path(p) for p in changed}
+
+    def wait_for_changes(self, should_stop: Optional[Callable[[], bool]] = None) -> Set[Path]:
+        """Block until files change and then stay unchanged for ``debounce`` seconds.
+
+        Args:
+            should_stop: Checked every poll; if it returns True the paths seen so far are returned
+
+        Returns:
+            Every path changed during the burst
+        """
+        changed: Set[Path] = set()
+        last_change = None
+        while True:
+            time.sleep(self.poll_interval)
+            batch = self.poll()
+            now = time.monotonic()
+            if batch:
+                changed.update(batch)
+                last_change = now
+            elif last_change is not None and now - last_change >= self.debounce:
+                return changed
+            if should_stop and should_stop():
+                return changed
+
+    def watch(self, on_change: Callable[[Set[Path]], None]) -> None:
+        """Call ``on_change`` with each debounced batch of changes until interrupted."""
+        logger.info(f"Watching {', '.join(str(r) for r in self.roots)} for changes")
+        while True:
+            on_change(self.wait_for_changes())
@@ -1,22 +1,195 @@
 import argparse
 import logging
+import sys
+import time
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set
 
+from data_parsing.bundle import open_bundle
+from data_parsing.constants import FileTypes, OutputFiles
+from data_parsing.manifest import (
+    LOCALISATION_PREFIX, BuildManifest, ExportTask, localisation_sources, manifest_path, run_incremental
+)
 from data_parsing.models import DIST, LOCALISATION_DATA, LOCAL_DATA
 from data_parsing.warband_pipeline import WarbandDataPipeline
+from data_parsing.watching import DirectoryWatcher
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
 class TypedArgs:
     local: bool
+    no_snapshot: bool
+    full: bool
+    watch: bool
+    bundle: bool
+    stream: bool
+    overlay: Optional[List[Path]]
+    jobs: int
 
 
 def parse_args() -> TypedArgs:
 
     parser = argparse.ArgumentParser()
     parser.add_argument('-local', action='store_true', help='export data to untracked folder instead of docs')
-    return TypedArgs(**vars(parser.parse_args()))
+    parser.add_argument(
+        '--no-snapshot',
+        action='store_true',
+        help='always process the data from scratch instead of restoring a matching snapshot'
+    )
+    parser.add_argument(
+        '--full',
+        action='store_true',
+        help='rebuild every output from scratch, ignoring the build manifest and snapshots'
+    )
+    parser.add_argument(
+        '--watch',
+        action='store_true',
+        help='keep running and rebuild the affected outputs whenever data or localisation files change'
+    )
+    parser.add_argument(
+        '--bundle',
+        action='store_true',
+        help='read the data from a packed bundle, rebuilding it when the data files change'
+    )
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='export the JSON and TTS outputs one warband at a time in bounded memory (no HTML or CSV)'
+    )
+    parser.add_argument(
+        '--overlay',
+        type=Path,
+        nargs='+',
+        help='data folders layered over data/, lowest first, overriding entities by _id'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=1,
+        help='write up to this many independent outputs at the same time'
+    )
+    args = parser.parse_args()
+    if args.stream and args.overlay:
+        parser.error('--stream reads each base warband folder on its own and cannot apply --overlay')
+    return TypedArgs(**vars(args))
+
+
+def export_tasks(pipeline: WarbandDataPipeline, out_dir: Path) -> List[ExportTask]:
+    abilities = (FileTypes.ABILITIES.value,)
+    fighters = (FileTypes.FIGHTERS.value,)
+    all_data = tuple(ft.value for ft in FileTypes)
+    # Pipeline stages each output needs, see WarbandDataPipeline.stage_tasks
+    validated = ('stage:validate',)
+    processed = ('stage:validate', 'stage:process')
+    tabulated = ('stage:frame',)
+
+    tasks = [
+        ExportTask(
+            Path(out_dir, OutputFiles.ABILITIES_JSON),
+            lambda: pipeline.export_abilities_json(dst=Path(out_dir, OutputFiles.ABILITIES_JSON), exclude_battletraits=True),
+            abilities,
+            depends_on=validated
+        ),
+        ExportTask(
+            Path(out_dir, OutputFiles.BATTLETRAITS_JSON),
+            lambda: pipeline.export_battletraits_json(dst=Path(out_dir, OutputFiles.BATTLETRAITS_JSON)),
+            abilities,
+            depends_on=validated
+        ),
+        ExportTask(
+            Path(out_dir, OutputFiles.ABILITIES_BATTLETRAITS_JSON),
+            lambda: pipeline.export_abilities_json(
+                dst=Path(out_dir, OutputFiles.ABILITIES_BATTLETRAITS_JSON), exclude_battletraits=False
+            ),
+            abilities,
+            depends_on=validated
+        ),
+        ExportTask(
+            Path(out_dir, OutputFiles.FIGHTERS_JSON),
+            lambda: pipeline.export_fighters_json(dst=Path(out_dir, OutputFiles.FIGHTERS_JSON)),
+            fighters,
+            depends_on=validated
+        ),
+        ExportTask(
+            Path(out_dir, OutputFiles.FIGHTERS_TTS_JSON),
+            lambda: pipeline.export_tts_fighters(dst=Path(out_dir, OutputFiles.FIGHTERS_TTS_JSON)),
+            all_data,
+            depends_on=processed
+        ),
+        ExportTask(
+            Path(out_dir, OutputFiles.FIGHTERS_HTML),
+            lambda: pipeline.export_fighters_html(dst_root=out_dir),
+            fighters,
+            depends_on=tabulated
+        ),
+        ExportTask(
+            Path(out_dir, OutputFiles.FIGHTERS_CSV),
+            lambda: pipeline.export_fighters_csv(dst_root=out_dir),
+            fighters,
+            depends_on=tabulated
+        ),
+    ]
+    for file in sorted(LOCALISATION_DATA.iterdir()):
+        if file.is_file() and file.suffix == '.json':
+            dst = Path(out_dir, file.stem, OutputFiles.ABILITIES_JSON)
+            tasks.append(ExportTask(
+                dst,
+                lambda loc_file=file, dst=dst: pipeline.export_localized_data(loc_file=loc_file, dst=dst),
+                abilities,
+                (f'{LOCALISATION_PREFIX}{file.name}',),
+                depends_on=validated
+            ))
+    return tasks
+
+
+def current_sources(pipeline: WarbandDataPipeline) -> Dict[str, str]:
+    """Source key -> sha256 for every data and localisation file."""
+    sources = {path: digest for files in pipeline.scan_sources().values() for path, digest in files.items()}
+    sources.update(localisation_sources())
+    return sources
+
+
+def export(pipeline: WarbandDataPipeline, out_dir: Path, manifest: BuildManifest, full: bool = False,
+           before_run: Optional[Callable[[], None]] = None, jobs: int = 1) -> Dict[str, List[Path]]:
+    return run_incremental(
+        export_tasks(pipeline, out_dir), current_sources(pipeline), manifest, full=full, before_run=before_run,
+        prerequisites=pipeline.stage_tasks(), max_workers=jobs
+    )
+
+
+def report_failures(result: Dict[str, List[Path]]) -> None:
+    for output in result['failed']:
+        print(f'failed (will retry next run): {output}')
+
+
+def watch(pipeline: WarbandDataPipeline, out_dir: Path, manifest: BuildManifest, jobs: int = 1) -> None:
+    """Rebuild the outputs affected by each burst of saves, keeping the processed data in memory."""
+    pipeline.stage_process()
+
+    def rebuild(paths: Set[Path]) -> None:
+        start = time.perf_counter()
+        try:
+            changed = pipeline.refresh()
+            result = export(pipeline, out_dir, manifest, jobs=jobs)
+        except Exception as e:
+            logger.error(f"Rebuild failed: {e}")
+            print(f'rebuild failed after {time.perf_counter() - start:.2f}s, waiting for the next change')
+            return
+        report_failures(result)
+        print(
+            f"{len(paths)} files changed, {len(changed)} warbands reloaded: "
+            f"{len(result['written'])} written, {len(result['skipped'])} skipped, {len(result['failed'])} failed "
+            f"in {time.perf_counter() - start:.2f}s"
+        )
+
+    try:
+        roots = [pipeline.src, *[loader.src for loader in pipeline.overlay_loaders], LOCALISATION_DATA]
+        DirectoryWatcher(roots).watch(rebuild)
+    except KeyboardInterrupt:
+        print('stopped watching')
 
 
 if __name__ == '__main__':
@@ -29,17 +202,29 @@ if __name__ == '__main__':
 
     out_dir = LOCAL_DATA if args.local else DIST
 
-    combined_data = WarbandDataPipeline()
-    combined_data.export_abilities_json(dst=Path(out_dir, 'abilities.json'), exclude_battletraits=True)
-    combined_data.export_battletraits_json(dst=Path(out_dir, 'battletraits.json'))
-    combined_data.export_abilities_json(dst=Path(out_dir, 'abilities_battletraits.json'), exclude_battletraits=False)
-    combined_data.export_fighters_json(dst=Path(out_dir, 'fighters.json'))
-    combined_data.export_tts_fighters(dst=Path(out_dir, 'fighters_tts.json'))
-    combined_data.export_fighters_html(dst_root=out_dir)
-    combined_data.export_fighters_csv(dst_root=out_dir)
-    for file in LOCALISATION_DATA.iterdir():
-        if file.is_file() and file.suffix == '.json':
-            lang = file.stem
-            combined_data.export_localized_data(loc_file=file, dst=Path(out_dir, lang, 'abilities.json'))
+    combined_data = WarbandDataPipeline(bundle=open_bundle() if args.bundle else None, overlays=args.overlay or ())
+    if args.stream:
+        counts = combined_data.export_streaming(out_dir)
+        print(f'done: streamed {len(counts)} outputs, HTML and CSV are not written in streaming mode')
+    else:
+        manifest = BuildManifest.load(manifest_path(out_dir), combined_data.environment_hash())
+        changed = manifest.changed_sources(current_sources(combined_data))
+        if manifest.sources and not args.full:
+            print(f'{len(changed)} source files changed since the last export')
+
+        def prepare():
+            if not (args.no_snapshot or args.full or combined_data.stage_completed('load')):
+                combined_data.use_snapshot()
+
+        result = export(combined_data, out_dir, manifest, full=args.full, before_run=prepare, jobs=args.jobs)
+        for output in result['skipped']:
+            print(f'skipped (unchanged): {output}')
+        report_failures(result)
+        print(f"done: {len(result['written'])} written, {len(result['skipped'])} skipped, "
+              f"{len(result['failed'])} failed")
 
-    print('done')
+        if args.watch:
+            prepare()
+            watch(combined_data, out_dir, manifest, jobs=args.jobs)
+        elif result['failed']:
+            sys.exit(1)
@@ -0,0 +1,58 @@
+"""
+Rewrite the source data files in canonical form, or check that they already are
+"""
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from data_parsing.formatting import DataFormatter
+from data_parsing.models import PROJECT_DATA
+
+
+if __name__ == '__main__':
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(levelname)s - %(name)s - %(message)s'
+    )
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "files",
+        type=Path,
+        nargs='*',
+        help="data files to format, defaults to every file in --data"
+    )
+    parser.add_argument(
+        "--data",
+        type=Path,
+        default=PROJECT_DATA,
+        help="path to project data folder"
+    )
+    parser.add_argument(
+        "--check",
+        action='store_true',
+        help="only list files that are not in canonical form, exiting non-zero if there are any"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="format across this many processes, defaults to the CPU count"
+    )
+    args = parser.parse_args()
+
+    formatter = DataFormatter(args.data, max_workers=args.jobs, check=args.check)
+    results = formatter.run(args.files or None)
+
+    errors = [r for r in results if r.error]
+    changed = [r for r in results if r.changed]
+    for r in errors:
+        logging.error(f'could not format {r.file}: {r.error}')
+    for r in changed:
+        logging.info(f'{"would reformat" if args.check else "reformatted"} {r.file}')
+
+    if errors:
+        sys.exit(f'{len(errors)} files could not be formatted')
+    if args.check and changed:
+        sys.exit(f'{len(changed)} files are not in canonical form, run python format_data.py to fix them')
+    logging.info(f'{len(changed)} files reformatted' if changed else 'all files in canonical form')
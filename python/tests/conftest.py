@@ -0,0 +1,27 @@
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+
+# The scripts import data_parsing from the python folder, so the tests do too
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data_parsing.models import PROJECT_DATA  # noqa: E402
+
+# A few warbands of the real data plus the universal abilities, small enough to copy for each test
+SAMPLE_FOLDERS = (
+    'chaos/beasts_of_chaos',
+    'chaos/blades_of_khorne_bloodbound',
+    'order/fyreslayers',
+    'universal',
+)
+
+
+@pytest.fixture
+def data_root(tmp_path: Path) -> Path:
+    """A writable copy of ``SAMPLE_FOLDERS`` laid out like ``data/``."""
+    root = tmp_path / 'data'
+    for folder in SAMPLE_FOLDERS:
+        shutil.copytree(PROJECT_DATA / folder, root / folder)
+    return root
@@ -0,0 +1,49 @@
+import json
+
+import jsonschema
+import pytest
+
+from data_parsing.frozen import LiveDataset
+from data_parsing.warband_pipeline import WarbandDataPipeline
+
+FYRESLAYERS_FIGHTERS = 'order/fyreslayers/fyreslayers_fighters.json'
+
+
+def change_first_fighter(file, **changes):
+    fighters = json.loads(file.read_text(encoding='utf-8'))
+    fighters[0].update(changes)
+    file.write_text(json.dumps(fighters, indent=4), encoding='utf-8')
+    return fighters[0]['_id']
+
+
+def test_reload_publishes_changed_data(data_root):
+    live = LiveDataset(WarbandDataPipeline(src=data_root))
+    first = live.current
+
+    _id = change_first_fighter(data_root / FYRESLAYERS_FIGHTERS, points=999)
+    reloaded = live.reload()
+
+    assert reloaded.version == 2
+    assert live.current is reloaded
+    assert reloaded.get_fighter(_id).points == 999
+    assert first.get_fighter(_id).points != 999
+
+
+def test_invalid_reload_keeps_old_version(data_root):
+    live = LiveDataset(WarbandDataPipeline(src=data_root))
+    first = live.current
+
+    _id = change_first_fighter(data_root / FYRESLAYERS_FIGHTERS, grand_alliance='bogus')
+
+    assert live.reload() is first
+    assert live.current is first
+    assert first.version == 1
+    assert first.get_fighter(_id).grand_alliance != 'bogus'
+
+
+def test_invalid_first_load_raises(data_root):
+    change_first_fighter(data_root / FYRESLAYERS_FIGHTERS, grand_alliance='bogus')
+    live = LiveDataset(WarbandDataPipeline(src=data_root))
+
+    with pytest.raises(jsonschema.ValidationError):
+        live.current
@@ -0,0 +1,95 @@
+import copy
+import json
+
+import pytest
+
+from data_parsing.layers import resolve_layers
+from data_parsing.partitions import Partition, PartitionedData
+from data_parsing.warband_pipeline import WarbandDataPipeline
+
+
+def layer(**partitions) -> PartitionedData:
+    """PartitionedData from keyword partition keys ('/' written as '__') -> fighter dicts."""
+    return PartitionedData.from_partitions({
+        key.replace('__', '/'): Partition(
+            key=key.replace('__', '/'),
+            files={f"{key.replace('__', '/')}/fighters.json": 'hash'},
+            data={'fighters': fighters, 'abilities': [], 'factions': []},
+            validated=True,
+        )
+        for key, fighters in partitions.items()
+    })
+
+
+@pytest.fixture
+def base() -> PartitionedData:
+    return layer(
+        chaos__a=[{'_id': '1', 'name': 'One', 'points': 100}, {'_id': '2', 'name': 'Two', 'points': 200}],
+        order__b=[{'_id': '3', 'name': 'Three', 'points': 300}],
+    )
+
+
+def test_overlay_fields_replace_matching_entities(base):
+    resolved = resolve_layers(base, [layer(homebrew__errata=[{'_id': '2', 'points': 150}])])
+
+    fighters = {f['_id']: f for f in resolved.data['fighters']}
+    assert fighters['2'] == {'_id': '2', 'name': 'Two', 'points': 150}
+    # Overridden in place, in the partition that holds the base entity
+    assert resolved.partitions['chaos/a'].data['fighters'][1]['points'] == 150
+
+
+def test_new_ids_are_added_to_the_overlay_partition(base):
+    resolved = resolve_layers(base, [layer(order__c=[{'_id': '4', 'name': 'Four', 'points': 40}])])
+
+    assert [f['_id'] for f in resolved.partitions['order/c'].data['fighters']] == ['4']
+    assert len(resolved.data['fighters']) == 4
+
+
+def test_later_overlays_win(base):
+    overlays = [layer(x__y=[{'_id': '1', 'points': 1}]), layer(x__y=[{'_id': '1', 'points': 2}])]
+
+    resolved = resolve_layers(base, overlays)
+
+    assert resolved.partitions['chaos/a'].data['fighters'][0]['points'] == 2
+    assert {'@1/x/y/fighters.json', '@2/x/y/fighters.json'} <= set(resolved.partitions['x/y'].files)
+
+
+def test_base_layer_is_not_modified(base):
+    before = copy.deepcopy(base)
+
+    resolved = resolve_layers(base, [layer(chaos__a=[{'_id': '1', 'points': 5}, {'_id': '9', 'points': 9}])])
+
+    assert base == before
+    # Untouched partitions and entities are shared, not copied
+    assert resolved.partitions['order/b'].data['fighters'] is base.partitions['order/b'].data['fighters']
+    assert resolved.partitions['chaos/a'].data['fighters'][1] is base.partitions['chaos/a'].data['fighters'][1]
+    assert not resolved.partitions['chaos/a'].validated
+    assert resolved.partitions['order/b'].validated
+
+
+def test_overlay_pipeline_leaves_base_pipeline_data_unchanged(data_root, tmp_path):
+    base = WarbandDataPipeline(src=data_root)
+    fighter = copy.deepcopy(base.data['fighters'][0])
+    overlay = tmp_path / 'overlay' / 'chaos' / 'errata'
+    overlay.mkdir(parents=True)
+    (overlay / 'errata_fighters.json').write_text(
+        json.dumps([{'_id': fighter['_id'], 'points': fighter['points'] + 10}]), encoding='utf-8'
+    )
+    base_fighters = copy.deepcopy(base.data['fighters'])
+    runemark_lists = [f['runemarks'] for f in base.data['fighters']]
+
+    layered = base.with_overlays(tmp_path / 'overlay')
+    layered.stage_process()
+
+    assert layered.get_fighter(fighter['_id']).points == fighter['points'] + 10
+    assert base.data['fighters'] == base_fighters
+    # Building the overlay's fighters does not even rebind values in the shared base dicts
+    assert all(f['runemarks'] is r for f, r in zip(base.data['fighters'], runemark_lists))
+    assert base.get_fighter(fighter['_id']).points == fighter['points']
+
+
+def test_streaming_export_rejects_overlays(data_root, tmp_path):
+    pipeline = WarbandDataPipeline(src=data_root, overlays=[data_root])
+
+    with pytest.raises(ValueError):
+        pipeline.export_streaming(tmp_path / 'streamed')
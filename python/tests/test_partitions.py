@@ -0,0 +1,51 @@
+import json
+import shutil
+
+from data_parsing.partitions import changed_partitions
+from data_parsing.warband_pipeline import WarbandDataPipeline
+
+BEASTS = 'chaos/beasts_of_chaos'
+BEASTS_FIGHTERS = 'chaos/beasts_of_chaos/beasts_of_chaos_fighters.json'
+
+
+def test_changed_partitions_reports_added_removed_and_changed_keys():
+    old = {'a': {'a/x.json': '1'}, 'b': {'b/x.json': '2'}, 'c': {'c/x.json': '3'}}
+    new = {'a': {'a/x.json': '1'}, 'b': {'b/x.json': '9'}, 'd': {'d/x.json': '4'}}
+
+    assert sorted(changed_partitions(old, new)) == ['b', 'c', 'd']
+
+
+def test_changed_partitions_reports_files_added_to_a_partition():
+    old = {'a': {'a/x.json': '1'}}
+    new = {'a': {'a/x.json': '1', 'a/y.json': '2'}}
+
+    assert changed_partitions(old, new) == ['a']
+    assert changed_partitions(new, new) == []
+
+
+def test_refresh_reloads_only_changed_partitions(data_root):
+    pipeline = WarbandDataPipeline(src=data_root)
+    pipeline.stage_process()
+    untouched = pipeline.stage_load().partitions['order/fyreslayers']
+
+    fighters_file = data_root / BEASTS_FIGHTERS
+    fighters = json.loads(fighters_file.read_text(encoding='utf-8'))
+    fighters[0]['points'] += 5
+    fighters_file.write_text(json.dumps(fighters, indent=4), encoding='utf-8')
+
+    assert pipeline.refresh() == [BEASTS]
+    assert pipeline.stage_load().partitions['order/fyreslayers'] is untouched
+    refreshed = pipeline.get_fighter(fighters[0]['_id'])
+    assert refreshed.points == fighters[0]['points']
+    assert pipeline.refresh() == []
+
+
+def test_refresh_drops_removed_partitions(data_root):
+    pipeline = WarbandDataPipeline(src=data_root)
+    removed = [f['_id'] for f in pipeline.stage_load().partitions[BEASTS].data['fighters']]
+
+    shutil.rmtree(data_root / BEASTS)
+
+    assert pipeline.refresh() == [BEASTS]
+    assert BEASTS not in pipeline.stage_load().partitions
+    assert all(pipeline.get_fighter(_id) is None for _id in removed)
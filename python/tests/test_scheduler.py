@@ -0,0 +1,89 @@
+import pytest
+
+from data_parsing.manifest import BuildManifest, ExportTask, run_incremental
+from data_parsing.scheduler import SchedulerError, Task, TaskFailedError, TaskScheduler, TaskStatus, order_tasks
+
+
+def fail():
+    raise ValueError('broken')
+
+
+def recording(ran, name):
+    return lambda: ran.append(name)
+
+
+@pytest.mark.parametrize('workers', [1, 4])
+def test_failure_cancels_only_its_dependents(workers):
+    ran = []
+    tasks = [
+        Task('load', recording(ran, 'load')),
+        Task('validate', fail, ('load',)),
+        Task('process', recording(ran, 'process'), ('validate',)),
+        Task('tts', recording(ran, 'tts'), ('process',)),
+        Task('json', recording(ran, 'json'), ('load',)),
+        Task('other', recording(ran, 'other')),
+    ]
+
+    report = TaskScheduler(workers).run(tasks)
+
+    status = {r.name: r.status for r in report.results}
+    assert status == {
+        'load': TaskStatus.DONE, 'validate': TaskStatus.FAILED, 'process': TaskStatus.CANCELLED,
+        'tts': TaskStatus.CANCELLED, 'json': TaskStatus.DONE, 'other': TaskStatus.DONE,
+    }
+    assert sorted(ran) == ['json', 'load', 'other']
+    assert {r.name: r.cause for r in report.cancelled} == {'process': 'validate', 'tts': 'validate'}
+    with pytest.raises(TaskFailedError):
+        report.raise_for_failures()
+
+
+def test_tasks_start_after_their_dependencies():
+    ran = []
+    tasks = [Task(str(i), recording(ran, str(i)), (str(i - 1),) if i else ()) for i in range(10)]
+
+    TaskScheduler(4).run(reversed(tasks))
+
+    assert ran == [str(i) for i in range(10)]
+
+
+@pytest.mark.parametrize('tasks', [
+    [Task('a', fail), Task('a', fail)],
+    [Task('a', fail, ('missing',))],
+    [Task('a', fail, ('b',)), Task('b', fail, ('a',))],
+])
+def test_invalid_graphs_are_rejected_before_running(tasks):
+    with pytest.raises(SchedulerError):
+        order_tasks(tasks)
+
+
+def test_failed_outputs_are_not_recorded_and_run_again(tmp_path):
+    manifest = BuildManifest(tmp_path / 'manifest.json', 'environment')
+    sources = {'chaos/a/a_fighters.json': 'hash'}
+    broken = {'stage': True}
+
+    def stage():
+        if broken['stage']:
+            raise ValueError('invalid data')
+
+    def writer(name):
+        return lambda: (tmp_path / name).write_text(name, encoding='utf-8')
+
+    tasks = [
+        ExportTask(tmp_path / 'needs_stage.json', writer('needs_stage.json'), ('_fighters.json',),
+                   depends_on=('stage:validate',)),
+        ExportTask(tmp_path / 'independent.json', writer('independent.json'), ('_fighters.json',)),
+    ]
+    prerequisites = [Task('stage:validate', stage)]
+
+    first = run_incremental(tasks, sources, manifest, prerequisites=prerequisites, max_workers=2)
+
+    assert first['written'] == [tmp_path / 'independent.json']
+    assert first['failed'] == [tmp_path / 'needs_stage.json']
+    reloaded = BuildManifest.load(manifest.path, 'environment')
+    assert list(reloaded.outputs) == [(tmp_path / 'independent.json').as_posix()]
+
+    broken['stage'] = False
+    second = run_incremental(tasks, sources, reloaded, prerequisites=prerequisites, max_workers=2)
+
+    assert second == {'written': [tmp_path / 'needs_stage.json'], 'skipped': [tmp_path / 'independent.json'],
+                      'failed': []}
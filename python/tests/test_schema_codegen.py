@@ -0,0 +1,97 @@
+import jsonschema
+import pytest
+
+from data_parsing.schema_codegen import UnsupportedSchemaError, differential_check, load_validator
+from data_parsing.schema_registry import SchemaRegistry
+from data_parsing.warband_pipeline import WarbandDataPipeline
+from validation import iter_differential_cases
+
+WEAPON_URL = 'https://example.com/weapon.json'
+STORE = {
+    WEAPON_URL: {
+        '$schema': 'http://json-schema.org/draft-07/schema#',
+        'type': 'object',
+        'required': ['runemark', 'attacks'],
+        'properties': {
+            'runemark': {'type': 'string', 'enum': ['axe', 'sword']},
+            'attacks': {'type': 'integer'},
+            'range': {'type': ['number', 'null']},
+        },
+    },
+}
+SCHEMA = {
+    '$schema': 'http://json-schema.org/draft-07/schema#',
+    'type': 'object',
+    'required': ['name'],
+    'properties': {
+        'name': {'type': 'string'},
+        'weapons': {'type': 'array', 'items': {'$ref': WEAPON_URL}},
+    },
+}
+
+INSTANCES = [
+    {'name': 'a'},
+    {'name': 'a', 'weapons': []},
+    {'name': 'a', 'weapons': [{'runemark': 'axe', 'attacks': 2}]},
+    {'name': 'a', 'weapons': [{'runemark': 'axe', 'attacks': 2.0}]},
+    {'name': 'a', 'weapons': [{'runemark': 'axe', 'attacks': 2.5}]},
+    {'name': 'a', 'weapons': [{'runemark': 'axe', 'attacks': True}]},
+    {'name': 'a', 'weapons': [{'runemark': 'bow', 'attacks': 2}]},
+    {'name': 'a', 'weapons': [{'runemark': 'axe'}]},
+    {'name': 'a', 'weapons': [{'runemark': 'axe', 'attacks': 1, 'range': None}]},
+    {'name': 'a', 'weapons': [{'runemark': 'axe', 'attacks': 1, 'range': False}]},
+    {'name': 'a', 'weapons': {}},
+    {'name': 1},
+    {},
+    [],
+    None,
+]
+
+
+@pytest.mark.parametrize('instance', INSTANCES)
+def test_generated_validator_agrees_with_jsonschema(instance):
+    is_valid = load_validator('test.json', SCHEMA, STORE, cache_dir=None)
+    resolver = jsonschema.RefResolver.from_schema(SCHEMA, store=STORE)
+
+    assert is_valid(instance) == jsonschema.Draft7Validator(SCHEMA, resolver=resolver).is_valid(instance)
+
+
+def test_unsupported_keywords_are_rejected():
+    with pytest.raises(UnsupportedSchemaError):
+        load_validator('test.json', {'type': 'string', 'pattern': '^a'}, {}, cache_dir=None)
+
+
+def test_generated_source_is_cached_per_schema_version(tmp_path):
+    load_validator('test.json', SCHEMA, STORE, cache_dir=tmp_path)
+    first = list(tmp_path.glob('test-*.py'))
+    changed = {**SCHEMA, 'required': []}
+    is_valid = load_validator('test.json', changed, STORE, cache_dir=tmp_path)
+
+    assert len(first) == 1
+    assert len(list(tmp_path.glob('test-*.py'))) == 1
+    assert not first[0].exists()
+    assert is_valid({})
+
+
+def test_differential_check_finds_no_disagreements_on_the_data(data_root):
+    pipeline = WarbandDataPipeline(src=data_root)
+    registry = SchemaRegistry(codegen_cache=None)
+
+    checked, disagreements = differential_check(iter_differential_cases(pipeline), registry, mutations=5)
+
+    assert disagreements == []
+    assert checked > len(pipeline.data['fighters']) * 6
+
+
+def test_differential_check_reports_disagreements(data_root):
+    class AcceptEverything(SchemaRegistry):
+        def generated(self, schema):
+            return lambda instance: True
+
+    pipeline = WarbandDataPipeline(src=data_root)
+    cases = list(iter_differential_cases(pipeline))[:20]
+
+    _, disagreements = differential_check(cases, AcceptEverything(codegen_cache=None), mutations=20)
+
+    assert disagreements
+    assert all(d.generated and not d.expected for d in disagreements)
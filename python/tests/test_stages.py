@@ -0,0 +1,62 @@
+import json
+
+import jsonschema
+import pytest
+
+from data_parsing.warband_pipeline import WarbandDataPipeline
+
+FYRESLAYERS_FIGHTERS = 'order/fyreslayers/fyreslayers_fighters.json'
+
+
+def break_first_fighter(file, **changes):
+    fighters = json.loads(file.read_text(encoding='utf-8'))
+    fighters[0].update(changes)
+    file.write_text(json.dumps(fighters, indent=4), encoding='utf-8')
+    return fighters[0]['_id']
+
+
+def test_model_stages_run_after_validation(data_root):
+    pipeline = WarbandDataPipeline(src=data_root)
+
+    pipeline.stage_model()
+
+    assert pipeline.stage_completed('validate')
+
+
+@pytest.mark.parametrize('read', [
+    lambda p: p.fighters,
+    lambda p: p.query_fighters(),
+    lambda p: p.fingerprints,
+    lambda p: p.freeze(),
+])
+def test_invalid_data_is_never_modelled(data_root, read):
+    break_first_fighter(data_root / FYRESLAYERS_FIGHTERS, grand_alliance='bogus')
+    pipeline = WarbandDataPipeline(src=data_root)
+
+    with pytest.raises(jsonschema.ValidationError):
+        read(pipeline)
+    assert not pipeline.stage_completed('model')
+
+
+def test_invalid_overlay_is_never_modelled(data_root, tmp_path):
+    base = WarbandDataPipeline(src=data_root)
+    fighter = base.data['fighters'][0]
+    overlay = tmp_path / 'overlay' / 'order' / 'errata'
+    overlay.mkdir(parents=True)
+    (overlay / 'errata_fighters.json').write_text(
+        json.dumps([{'_id': fighter['_id'], 'points': 'lots'}]), encoding='utf-8'
+    )
+
+    with pytest.raises(jsonschema.ValidationError):
+        base.with_overlays(tmp_path / 'overlay').fighters
+
+
+def test_refresh_revalidates_before_remodelling(data_root):
+    pipeline = WarbandDataPipeline(src=data_root)
+    pipeline.stage_process()
+
+    break_first_fighter(data_root / FYRESLAYERS_FIGHTERS, points='lots')
+    pipeline.refresh()
+
+    with pytest.raises(jsonschema.ValidationError):
+        pipeline.fighters
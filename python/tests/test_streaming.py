@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from data_parsing.constants import OutputFiles
+from data_parsing.models import JSONArrayWriter
+from data_parsing.streaming import ExternalSorter
+from data_parsing.warband_pipeline import WarbandDataPipeline
+
+STREAMED_OUTPUTS = (
+    OutputFiles.FIGHTERS_JSON,
+    OutputFiles.FIGHTERS_TTS_JSON,
+    OutputFiles.ABILITIES_JSON,
+    OutputFiles.BATTLETRAITS_JSON,
+    OutputFiles.ABILITIES_BATTLETRAITS_JSON,
+)
+
+
+@pytest.mark.parametrize('max_open_runs', [2, 64])
+def test_external_sorter_is_stable_across_runs(tmp_path, max_open_runs):
+    rng = random.Random(0)
+    items = [{'key': rng.randint(0, 5), 'order': i} for i in range(500)]
+    sorter = ExternalSorter(lambda item: item['key'], tmp_path, max_open_runs=max_open_runs)
+    for start in range(0, len(items), 37):
+        sorter.add_run(items[start:start + 37])
+
+    # Equal keys keep the order they were added in, like a stable in-memory sort
+    assert list(sorter) == sorted(items, key=lambda item: item['key'])
+
+
+def test_external_sorter_without_runs_is_empty(tmp_path):
+    sorter = ExternalSorter(lambda item: item, tmp_path)
+    sorter.add_run([])
+
+    assert list(sorter) == []
+
+
+def test_json_array_writer_keeps_destination_on_error(tmp_path):
+    dst = tmp_path / 'out.json'
+    dst.write_text('previous', encoding='utf-8')
+
+    with pytest.raises(ValueError):
+        with JSONArrayWriter(dst) as writer:
+            writer.write({'a': 1})
+            raise ValueError('stopped partway')
+
+    assert dst.read_text(encoding='utf-8') == 'previous'
+    assert list(tmp_path.iterdir()) == [dst]
+
+
+def test_json_array_writer_matches_write_data_json_layout(tmp_path):
+    dst = tmp_path / 'out.json'
+    with JSONArrayWriter(dst) as writer:
+        writer.extend([{'a': 1}, {'b': [1, 2]}])
+
+    assert dst.read_text(encoding='utf-8') == '[\n    {\n        "a": 1\n    },\n    {\n        "b": [\n' \
+                                              '            1,\n            2\n        ]\n    }\n]'
+
+
+def test_streaming_export_matches_normal_export(data_root, tmp_path):
+    normal, streamed = tmp_path / 'normal', tmp_path / 'streamed'
+    WarbandDataPipeline(src=data_root).export_all_standard_formats(normal)
+    counts = WarbandDataPipeline(src=data_root).export_streaming(streamed)
+
+    for name in STREAMED_OUTPUTS:
+        assert (streamed / name).read_bytes() == (normal / name).read_bytes(), name
+    assert counts[OutputFiles.FIGHTERS_JSON] == counts[OutputFiles.FIGHTERS_TTS_JSON] > 0
+
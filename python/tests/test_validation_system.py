@@ -0,0 +1,72 @@
+import copy
+import random
+
+import pytest
+
+from data_parsing.business_rules import RangeRule
+from data_parsing.validation_system import BulkFighterValidator, BusinessRuleValidator, CompositeValidator
+from data_parsing.warband_pipeline import WarbandDataPipeline
+
+ODD_VALUES = (None, '', 'x', True, False, -1, 0, 1, 12.5, 2000, 2001, 10 ** 6, float('nan'), [], ['hero'])
+FIELDS = ('points', 'movement', 'toughness', 'wounds', '_id', 'name', 'warband', 'grand_alliance', 'weapons',
+          'runemarks')
+
+
+@pytest.fixture
+def fighters(data_root):
+    return copy.deepcopy(WarbandDataPipeline(src=data_root).data['fighters'])
+
+
+def broken_fighters(fighters, seed=0):
+    """The fighters with random fields replaced by odd values or removed."""
+    rng = random.Random(seed)
+    for fighter in fighters:
+        for field_name in rng.sample(FIELDS, rng.randint(0, 3)):
+            if rng.random() < 0.2:
+                fighter.pop(field_name, None)
+            else:
+                fighter[field_name] = rng.choice(ODD_VALUES)
+    return fighters
+
+
+def per_fighter_errors(fighters):
+    return [
+        (i, error.path, error.message, repr(error.value))
+        for i, fighter in enumerate(fighters)
+        for error in BusinessRuleValidator().validate_fighter(fighter).errors
+    ]
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bulk_validator_matches_per_fighter_validation(fighters, seed):
+    fighters = broken_fighters(fighters, seed)
+
+    result = BulkFighterValidator().validate(fighters)
+
+    assert [(e.index, e.path, e.message, repr(e.value)) for e in result.errors] == per_fighter_errors(fighters)
+    assert result.is_valid == (not per_fighter_errors(fighters))
+    assert result.items_validated == len(fighters)
+
+
+def test_bulk_validator_applies_added_rules(fighters):
+    validator = BulkFighterValidator(rules=[])
+    validator.add_rule(RangeRule('points', 0, 100))
+
+    result = validator.validate(fighters)
+
+    assert [e.index for e in result.errors] == [i for i, f in enumerate(fighters) if f['points'] > 100]
+
+
+def test_composite_validator_reports_indexed_paths(fighters):
+    fighters[3]['movement'] = 0
+
+    errors = CompositeValidator().validate_fighters(fighters).errors
+
+    movement = [e for e in errors if e.path.endswith('movement')]
+    assert [(e.path, e.index) for e in movement] == [('[3].movement', None)]
+
+
+def test_composite_validator_counts_each_fighter_once(fighters):
+    result = CompositeValidator().validate_fighters(fighters)
+
+    assert result.items_validated == len(fighters)
@@ -1,30 +1,157 @@
 import argparse
+import itertools
 import json
 import logging
 import sys
+from collections import Counter
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Iterator, NamedTuple, Optional, Tuple
 
 import jsonschema
 
-from data_parsing.abilities import ABILITY_SCHEMA
-from data_parsing.factions import FACTION_SCHEMA
-from data_parsing.fighters import FIGHTER_SCHEMA
-from data_parsing.models import PROJECT_DATA
-from data_parsing.warband_pipeline import WarbandDataPipeline
+from data_parsing.bundle import open_bundle
+from data_parsing.constants import DataTypes, SchemaFiles
+from data_parsing.data_loading import DATA_TYPE_SUFFIXES, DataFilter
+from data_parsing.incremental_validation import GitError, IncrementalValidator
+from data_parsing.models import LOCALISATION_DATA, PROJECT_DATA
+from data_parsing.schema_registry import registry
+from data_parsing.validation_system import ParallelFileValidator, ValidationResult, entity_label
+
+if TYPE_CHECKING:
+    from data_parsing.warband_pipeline import WarbandDataPipeline
+
+ENTITY_SCHEMAS = {
+    DataTypes.ABILITIES: SchemaFiles.ABILITY,
+    DataTypes.FIGHTERS: SchemaFiles.FIGHTER,
+    DataTypes.FACTIONS: SchemaFiles.FACTION,
+}
+# Entity types checked for duplicate _id values
+UNIQUE_ID_TYPES = (DataTypes.ABILITIES, DataTypes.FIGHTERS)
+
+
+class EntityError(NamedTuple):
+    """One validation failure of one entity."""
+    source: str
+    entity: str
+    message: str
+
+    def __str__(self) -> str:
+        return ': '.join(part for part in (self.source, self.entity, self.message) if part)
 
 
 def get_duplicate_ids(to_check: list[dict]) -> list[str]:
-    all_ids = [i["_id"] for i in to_check]
-    return [i for i in all_ids if all_ids.count(i) != 1]
+    counts = Counter(i["_id"] for i in to_check)
+    return [i["_id"] for i in to_check if counts[i["_id"]] != 1]
 
 
 def validate_data(data: list[dict], schemafile: Optional[Path] = None, schemadata: Optional[dict] = None):
     if not schemafile and not schemadata:
         raise RuntimeError('Must provide either schema file or schema data for validation')
     if schemafile:
-        schemadata = json.loads(schemafile.read_text())
-    jsonschema.validate(data, schemadata)
+        registry.validate(data, schemafile)
+    else:
+        jsonschema.validate(data, schemadata)
+
+
+def with_location(message: str, path: str) -> str:
+    return f'{message} (at {path})' if path else message
+
+
+def pipeline(src: Path, data_filter: DataFilter, **kwargs) -> 'WarbandDataPipeline':
+    # Imported when needed, so --changed runs without loading pandas
+    from data_parsing.warband_pipeline import WarbandDataPipeline
+
+    return WarbandDataPipeline(src=src, data_filter=data_filter, **kwargs)
+
+
+def partition_sources(pipeline: 'WarbandDataPipeline', datatype: str) -> Iterator[Tuple[str, list[dict]]]:
+    """(source file names, entities) of one type for each warband folder, in load order."""
+    suffix = DATA_TYPE_SUFFIXES[datatype]
+    for partition in pipeline.stage_load().partitions.values():
+        source = ', '.join(f for f in partition.files if f.endswith(suffix)) or partition.key
+        yield source, partition.data[datatype]
+
+
+def iter_duplicate_errors(pipeline: 'WarbandDataPipeline') -> Iterator[EntityError]:
+    for datatype in UNIQUE_ID_TYPES:
+        duplicates = set(get_duplicate_ids(pipeline.data[datatype]))
+        if not duplicates:
+            continue
+        for source, entities in partition_sources(pipeline, datatype):
+            for entity in entities:
+                if entity.get('_id') in duplicates:
+                    yield EntityError(source, entity_label(entity), f'duplicate id: {entity["_id"]}')
+
+
+def iter_schema_errors(pipeline: 'WarbandDataPipeline') -> Iterator[EntityError]:
+    """Check every loaded entity against its schema, yielding failures as they are found."""
+    for datatype, schema in ENTITY_SCHEMAS.items():
+        logging.info(f'validating {len(pipeline.data[datatype])} {datatype}')
+        for source, entities in partition_sources(pipeline, datatype):
+            for entity in entities:
+                for error in registry.errors(entity, schema):
+                    path = '.'.join(str(p) for p in error.absolute_path)
+                    yield EntityError(source, entity_label(entity), with_location(error.message, path))
+
+
+def iter_file_errors(pipeline: 'WarbandDataPipeline', jobs: int) -> Iterator[EntityError]:
+    """Check each source file against its schema in a pool of ``jobs`` processes."""
+    files = list(pipeline.loader.iter_data_files())
+    logging.info(f'validating {len(files)} files across {jobs} processes')
+    yield from result_errors(ParallelFileValidator(pipeline.src, jobs).validate_files(files))
+
+
+def iter_integrity_errors(pipeline: 'WarbandDataPipeline') -> Iterator[EntityError]:
+    """Check references between files, e.g. fighter subfactions and ability runemarks; needs schema-valid data."""
+    from data_parsing.integrity import IntegrityChecker
+
+    logging.info('checking cross-references')
+    checker = IntegrityChecker.from_pipeline(pipeline, sorted(LOCALISATION_DATA.glob('*.json')))
+    yield from result_errors(checker.check())
+
+
+def iter_differential_cases(pipeline: 'WarbandDataPipeline') -> Iterator[Tuple[Path, Any]]:
+    """Every loaded entity, data file and warband with its schema, for ``schema_codegen.differential_check``."""
+    warbands = []
+    for partition in pipeline.stage_load().partitions.values():
+        for datatype, schema in ENTITY_SCHEMAS.items():
+            for entity in partition.data[datatype]:
+                yield schema, entity
+        fighters, abilities = partition.data[DataTypes.FIGHTERS], partition.data[DataTypes.ABILITIES]
+        yield SchemaFiles.FIGHTERS_AGGREGATE, fighters
+        yield SchemaFiles.ABILITIES_AGGREGATE, abilities
+        warbands.append({'fighters': fighters, 'abilities': abilities})
+        yield SchemaFiles.WARBAND, warbands[-1]
+    yield SchemaFiles.WARBANDS_AGGREGATE, warbands
+
+
+def check_generated_validators(pipeline: 'WarbandDataPipeline', mutants: int) -> int:
+    """Compare the generated schema validators with jsonschema, returning how many instances they disagree on."""
+    from data_parsing.schema_codegen import differential_check
+
+    checked, disagreements = differential_check(iter_differential_cases(pipeline), registry, mutations=mutants)
+    for d in disagreements:
+        logging.error(f'{d.schema}: generated validator says {d.generated}, jsonschema says {d.expected}: '
+                      f'{json.dumps(d.instance)[:200]}')
+    logging.info(f'compared generated validators with jsonschema on {checked} instances')
+    return len(disagreements)
+
+
+def report(errors: Iterator[EntityError], fail_fast: bool) -> int:
+    """Log failures, returning how many there were."""
+    failures = 0
+    for failure in errors:
+        logging.error(f'validation failure: {failure}')
+        failures += 1
+        if fail_fast:
+            break
+    return failures
+
+
+def result_errors(result: ValidationResult) -> Iterator[EntityError]:
+    for error in result.errors:
+        source = error.source if error.index is None else f'{error.source}[{error.index}]'
+        yield EntityError(source, error.entity, with_location(error.message, error.path))
 
 
 if __name__ == '__main__':
@@ -41,36 +168,94 @@ if __name__ == '__main__':
         default=PROJECT_DATA,
         help="path to project data folder"
     )
+    parser.add_argument(
+        "--grand-alliance",
+        nargs='+',
+        help="only validate these grand alliances"
+    )
+    parser.add_argument(
+        "--warband",
+        nargs='+',
+        help="only validate these warbands"
+    )
+    parser.add_argument(
+        "--no-snapshot",
+        action='store_true',
+        help="always process the data from scratch instead of restoring a matching snapshot"
+    )
+    parser.add_argument(
+        "--bundle",
+        action='store_true',
+        help="read the data from a packed bundle, rebuilding it when the data files change"
+    )
+    parser.add_argument(
+        "--overlay",
+        type=Path,
+        nargs='+',
+        help="data folders layered over --data, lowest first, overriding entities by _id"
+    )
+    parser.add_argument(
+        "--fail-fast",
+        action='store_true',
+        help="stop at the first error instead of reporting every broken entity"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="validate the data files across this many processes"
+    )
+    parser.add_argument(
+        "--changed",
+        metavar="REVISIONS",
+        help="only validate data and localisation files changed in this git range (e.g. origin/main...HEAD), "
+             "or since this revision including uncommitted changes"
+    )
+    parser.add_argument(
+        "--differential",
+        type=int,
+        nargs='?',
+        const=20,
+        metavar="MUTANTS",
+        help="instead of validating, check that the generated schema validators agree with jsonschema on the data "
+             "and on this many mutated copies of each entity, file and warband (default 20)"
+    )
     args = parser.parse_args()
+    if args.jobs and args.overlay:
+        parser.error('--jobs validates files one by one and cannot check data resolved from --overlay')
+    if args.changed and (args.overlay or args.bundle or args.grand_alliance or args.warband):
+        parser.error('--changed cannot be combined with --overlay, --bundle, --grand-alliance or --warband')
 
-    warband_data = WarbandDataPipeline()
-    ability_schema = json.loads(ABILITY_SCHEMA.read_text())
-    fighter_schema = json.loads(FIGHTER_SCHEMA.read_text())
-    faction_schema = json.loads(FACTION_SCHEMA.read_text())
-
-    validation_pass = True
-
-    logging.info(f'validating {len(warband_data.data["abilities"])} abilities')
-    ability_dupes = get_duplicate_ids(warband_data.data['abilities'])
-    for ability in warband_data.data['abilities']:
-        if ability["_id"] in ability_dupes:
-            logging.error(f'validation failure: duplicate id: {ability["warband"]}/{ability["name"]}: {ability["_id"]}')
-            validation_pass = False
-        validate_data(data=ability, schemadata=ability_schema)
-
-    logging.info(f'validating {len(warband_data.data["fighters"])} fighters')
-    fighter_dupes = get_duplicate_ids(warband_data.data['fighters'])
-    for fighter in warband_data.data['fighters']:
-        if fighter["_id"] in fighter_dupes:
-            logging.error(f'validation failure: duplicate id: {fighter["grand_alliance"]}/{fighter["warband"]}/{fighter["name"]}: {fighter["_id"]}')
-            validation_pass = False
-        validate_data(data=fighter, schemadata=fighter_schema)
-
-    logging.info(f'validating {len(warband_data.data["factions"])} factions')
-    for faction in warband_data.data['factions']:
-        validate_data(data=faction, schemadata=faction_schema)
-
-    if validation_pass:
-        logging.info('validation passed')
+    if args.differential is not None:
+        data_filter = DataFilter(grand_alliances=args.grand_alliance, warbands=args.warband)
+        if check_generated_validators(pipeline(args.data, data_filter), args.differential):
+            sys.exit('generated validators disagree with jsonschema')
+        sys.exit()
+
+    if args.changed:
+        try:
+            errors = result_errors(IncrementalValidator(args.changed, args.data, LOCALISATION_DATA).run())
+        except GitError as e:
+            sys.exit(f'could not find changed files: {e}')
     else:
+        data_filter = DataFilter(grand_alliances=args.grand_alliance, warbands=args.warband)
+        bundle = open_bundle(args.data) if args.bundle else None
+        warband_data = pipeline(args.data, data_filter, bundle=bundle, overlays=args.overlay or ())
+        schema_errors = iter_file_errors(warband_data, args.jobs) if args.jobs else iter_schema_errors(warband_data)
+        errors = itertools.chain(iter_duplicate_errors(warband_data), schema_errors)
+
+    failures = report(errors, args.fail_fast)
+    if not failures and not args.changed:
+        # Saving a snapshot runs the validate stage, which raises on the first invalid entity,
+        # so snapshots are only restored or saved once every error has been reported
+        if not args.no_snapshot:
+            warband_data.use_snapshot()
+        # Partial data would report references to everything filtered out
+        if not (args.grand_alliance or args.warband):
+            failures = report(iter_integrity_errors(warband_data), args.fail_fast)
+
+    if not failures:
+        logging.info('validation passed')
+    elif args.fail_fast:
         sys.exit('validation failed')
+    else:
+        sys.exit(f'validation failed: {failures} errors')